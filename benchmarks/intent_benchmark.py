@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Intent Benchmark - Latency and accuracy of command parsing and response matching
+Expands the labelled corpus (benchmarks/intent_corpus.json), runs every
+utterance through AdvancedCommandInterpreter.parse_intents (nothing is
+executed; SystemControl is replaced by an inert stub) and ResponseEngine.match,
+and reports latency percentiles, throughput, accuracy and confusion. Results
+are written as JSON so two runs can be compared with --baseline.
+
+Usage:
+    python benchmarks/intent_benchmark.py [--scoring bm25] [--typos] [--baseline old.json]
+"""
+
+import os
+import sys
+import json
+import time
+import types
+import random
+import argparse
+import platform
+import itertools
+import tempfile
+from collections import Counter, defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from config.settings import COMMANDS_PATH, RESPONSE_CONFIG_PATH, RESPONSE_SCORING, RESPONSE_BACKEND
+
+DEFAULT_CORPUS = ROOT / 'benchmarks' / 'intent_corpus.json'
+DEFAULT_OUTPUT = ROOT / 'benchmarks' / 'results' / 'intent_benchmark.json'
+
+# Label for "no command" / "default response"
+NONE_LABEL = 'none'
+
+
+def stub_system_control():
+    """
+    Install an inert src.system_control so no benchmark step can touch the machine
+    
+    Parsing never resolves handlers, so this only guards against accidental
+    execution; every SystemControl method returns an empty result.
+    """
+    module = types.ModuleType('src.system_control')
+    
+    class SystemControl:
+        def __getattr__(self, name: str) -> Callable[..., Dict[str, Any]]:
+            return lambda *args, **kwargs: {}
+    
+    module.SystemControl = SystemControl
+    sys.modules['src.system_control'] = module
+
+
+def expand_corpus(corpus: dict, typos: bool = False, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Expand templates over their slots into labelled utterances
+    
+    Args:
+        corpus: Parsed corpus JSON
+        typos: Also add one single-typo copy of every utterance
+        seed: Seed for the typo positions
+    
+    Returns:
+        List of {"text", "command", "response", "variant"}
+    """
+    slots = corpus.get('slots', {})
+    rng = random.Random(seed)
+    items = []
+    for intent in corpus['intents']:
+        for template in intent['templates']:
+            names = [name for name in slots if '{' + name + '}' in template]
+            for values in itertools.product(*(slots[name] for name in names)):
+                text = template.format(**dict(zip(names, values)))
+                item = {
+                    'text': text,
+                    'command': intent.get('command') or NONE_LABEL,
+                    'response': intent.get('response') or NONE_LABEL,
+                    'variant': 'clean',
+                }
+                items.append(item)
+                if typos:
+                    items.append(dict(item, text=add_typo(text, rng), variant='typo'))
+    return items
+
+
+def add_typo(text: str, rng: random.Random) -> str:
+    """Apply one random character deletion, substitution, insertion or swap inside a word"""
+    positions = [index for index, char in enumerate(text) if char.isalpha()]
+    if len(positions) < 2:
+        return text
+    index = rng.choice(positions[:-1])
+    edit = rng.choice(('delete', 'substitute', 'insert', 'swap'))
+    letter = rng.choice('abcdefghijklmnopqrstuvwxyz')
+    if edit == 'delete':
+        return text[:index] + text[index + 1:]
+    if edit == 'substitute':
+        return text[:index] + letter + text[index + 1:]
+    if edit == 'insert':
+        return text[:index] + letter + text[index:]
+    return text[:index] + text[index + 1] + text[index] + text[index + 2:]
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+def run_suite(name: str, items: List[Dict[str, Any]], label_key: str,
+              predict: Callable[[str], str], reset: Callable[[], None], passes: int) -> Dict[str, Any]:
+    """
+    Time and score one predictor over the corpus
+    
+    Args:
+        name: Suite name
+        items: Utterances with their expected labels
+        label_key: Which label the predictor is checked against
+        predict: Text -> predicted label
+        reset: Clears the component's caches before each pass (cold lookups)
+        passes: Timed passes over the corpus (predictions come from the first)
+    
+    Returns:
+        Suite report
+    """
+    latencies_us = []
+    predictions = []
+    elapsed = 0.0
+    for pass_index in range(passes):
+        reset()
+        for item in items:
+            start = time.perf_counter()
+            predicted = predict(item['text'])
+            duration = time.perf_counter() - start
+            elapsed += duration
+            latencies_us.append(duration * 1e6)
+            if pass_index == 0:
+                predictions.append(predicted)
+    
+    latencies_us.sort()
+    confusion: Dict[str, Counter] = defaultdict(Counter)
+    per_label: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+    per_variant: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+    errors = []
+    for item, predicted in zip(items, predictions):
+        expected = item[label_key]
+        correct = predicted == expected
+        confusion[expected][predicted] += 1
+        for totals, key in ((per_label, expected), (per_variant, item['variant'])):
+            totals[key][0] += correct
+            totals[key][1] += 1
+        if not correct and len(errors) < 50:
+            errors.append({'text': item['text'], 'expected': expected, 'predicted': predicted})
+    
+    correct_total = sum(correct for correct, _ in per_label.values())
+    return {
+        'suite': name,
+        'utterances': len(items),
+        'passes': passes,
+        'accuracy': correct_total / len(items) if items else 0.0,
+        'latency_us': {
+            'p50': percentile(latencies_us, 0.50),
+            'p95': percentile(latencies_us, 0.95),
+            'p99': percentile(latencies_us, 0.99),
+            'max': latencies_us[-1] if latencies_us else 0.0,
+            'mean': sum(latencies_us) / len(latencies_us) if latencies_us else 0.0,
+        },
+        'throughput_per_s': len(latencies_us) / elapsed if elapsed else 0.0,
+        'accuracy_by_label': {label: correct / total for label, (correct, total) in sorted(per_label.items())},
+        'accuracy_by_variant': {variant: correct / total for variant, (correct, total) in sorted(per_variant.items())},
+        'confusion': {expected: dict(predicted) for expected, predicted in sorted(confusion.items())},
+        'errors': errors,
+    }
+
+
+def build_suites(items: List[Dict[str, Any]], scoring: str, backend: str) -> List[Callable[[int], Dict[str, Any]]]:
+    """Create the components and return one runner per suite"""
+    from src.advanced_command_interpreter import AdvancedCommandInterpreter
+    from src.response_engine import ResponseEngine
+    from src.hit_stats import HitStats
+    
+    # Fresh statistics so the pattern order is the spec order and nothing is recorded
+    stats_dir = tempfile.mkdtemp(prefix='intent_benchmark_')
+    hit_stats = HitStats(os.path.join(stats_dir, 'hit_stats.json'))
+    
+    interpreter = AdvancedCommandInterpreter(str(ROOT / COMMANDS_PATH), hit_stats=hit_stats)
+    engine = ResponseEngine(str(ROOT / RESPONSE_CONFIG_PATH), scoring=scoring, backend=backend,
+                            hit_stats=hit_stats, store_path=os.path.join(stats_dir, 'responses.db'))
+    
+    def predict_command(text: str) -> str:
+        intents = interpreter.parse_intents(text)
+        return '+'.join(cmd_name for cmd_name, _ in intents) if intents else NONE_LABEL
+    
+    def predict_response(text: str) -> str:
+        category, confidence = engine.match(text)
+        if category is None or confidence < engine._threshold(engine.snapshot):
+            return NONE_LABEL
+        return category
+    
+    def reset_engine():
+        engine.snapshot.cache.clear()
+        if engine.store is not None:
+            engine.store.match_cache.clear()
+    
+    # Responses are only judged on utterances that are not commands
+    conversational = [item for item in items if item['command'] == NONE_LABEL]
+    return [
+        lambda passes: run_suite('commands', items, 'command', predict_command,
+                                 interpreter.parse_cache.clear, passes),
+        lambda passes: run_suite('responses', conversational, 'response', predict_response,
+                                 reset_engine, passes),
+    ]
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any]):
+    """Print how the headline numbers moved against an earlier run"""
+    previous = {suite['suite']: suite for suite in baseline.get('suites', [])}
+    print(f"\nAgainst {baseline.get('timestamp', 'baseline')}:")
+    for suite in report['suites']:
+        old = previous.get(suite['suite'])
+        if old is None:
+            continue
+        print(f"  {suite['suite']}:")
+        print(f"    accuracy   {old['accuracy']:.2%} -> {suite['accuracy']:.2%}")
+        for key in ('p50', 'p95', 'p99'):
+            before, after = old['latency_us'][key], suite['latency_us'][key]
+            change = (after - before) / before if before else 0.0
+            print(f'    {key:<10} {before:9.1f} -> {after:9.1f} us ({change:+.1%})')
+        print(f"    throughput {old['throughput_per_s']:9.0f} -> {suite['throughput_per_s']:9.0f} /s")
+        
+        for label, accuracy in suite['accuracy_by_label'].items():
+            before = old['accuracy_by_label'].get(label)
+            if before is not None and abs(accuracy - before) > 1e-9:
+                print(f'    label {label}: {before:.2%} -> {accuracy:.2%}')
+
+
+def print_report(report: Dict[str, Any]):
+    """Human-readable summary of a run"""
+    print(f"Intent benchmark ({report['config']['scoring']} scoring, {report['config']['backend']} backend)")
+    for suite in report['suites']:
+        latency = suite['latency_us']
+        print(f"\n{suite['suite']}: {suite['utterances']} utterances x {suite['passes']} passes")
+        print(f"  accuracy    {suite['accuracy']:.2%}  " + '  '.join(
+            f'{variant} {accuracy:.2%}' for variant, accuracy in suite['accuracy_by_variant'].items()))
+        print(f"  latency     p50 {latency['p50']:.1f} us  p95 {latency['p95']:.1f} us  "
+              f"p99 {latency['p99']:.1f} us  max {latency['max']:.1f} us")
+        print(f"  throughput  {suite['throughput_per_s']:.0f} utterances/s")
+        
+        worst = sorted((accuracy, label) for label, accuracy in suite['accuracy_by_label'].items() if accuracy < 1.0)
+        for accuracy, label in worst[:10]:
+            confused = Counter({predicted: count for predicted, count in suite['confusion'][label].items()
+                                if predicted != label})
+            top = ', '.join(f'{predicted} x{count}' for predicted, count in confused.most_common(3))
+            print(f'    {label:<18} {accuracy:7.2%}  -> {top}')
+
+
+def main(argv: Optional[list] = None):
+    """Run the benchmark and save the results"""
+    parser = argparse.ArgumentParser(description='Intent matching latency and accuracy benchmark')
+    parser.add_argument('--corpus', default=str(DEFAULT_CORPUS), help='Labelled corpus JSON')
+    parser.add_argument('--output', default=str(DEFAULT_OUTPUT), help='Where to write the JSON results')
+    parser.add_argument('--baseline', help='Earlier results JSON to compare against')
+    parser.add_argument('--scoring', default=RESPONSE_SCORING, choices=['overlap', 'bm25', 'fuzzy', 'lsh'],
+                        help='Response engine scoring mode')
+    parser.add_argument('--backend', default=RESPONSE_BACKEND, choices=['json', 'sqlite'],
+                        help='Response engine backend')
+    parser.add_argument('--passes', type=int, default=3, help='Timed passes over the corpus')
+    parser.add_argument('--typos', action='store_true', help='Add a misspelled copy of every utterance')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the typo variants')
+    args = parser.parse_args(argv)
+    
+    stub_system_control()
+    with open(args.corpus, 'r', encoding='utf-8') as f:
+        items = expand_corpus(json.load(f), typos=args.typos, seed=args.seed)
+    
+    report = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'config': {
+            'corpus': args.corpus,
+            'scoring': args.scoring,
+            'backend': args.backend,
+            'passes': args.passes,
+            'typos': args.typos,
+            'seed': args.seed,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+        },
+        'suites': [run(args.passes) for run in build_suites(items, args.scoring, args.backend)],
+    }
+    
+    print_report(report)
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            compare(report, json.load(f))
+    
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f'\n[SYSTEM] Results written to {output}')
+
+
+if __name__ == '__main__':
+    main()
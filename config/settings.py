@@ -17,6 +17,65 @@ ANIMATION_SPEED = 0.05  # Seconds between frames
 # Response Settings
 RESPONSE_CONFIG_PATH = "data/responses.json"
 CONFIDENCE_THRESHOLD = 0.5  # Minimum confidence for recognition
+RESPONSE_INDEX_CACHE = True  # Load/write the compiled index next to the responses file (.idx)
+RESPONSE_HOT_RELOAD = True  # Watch the responses file and swap in edits without a restart
+RESPONSE_WATCH_POLL_INTERVAL = 1.0  # Seconds between checks when inotify is unavailable
+RESPONSE_SCORING = "overlap"  # Options: "overlap" (substring/word rules), "bm25" (graded, needs NumPy), "fuzzy" (typo-tolerant), "lsh" (hashed n-gram vectors, needs NumPy)
+FUZZY_MAX_EDITS = 2  # Most character edits the fuzzy matcher tolerates in long patterns
+RESPONSE_BACKEND = "json"  # Options: "json" (whole file in memory), "sqlite" (lazy categories, overlap scoring only)
+RESPONSE_STORE_PATH = "data/responses.db"  # SQLite response store, imported from the JSON file on first use
+RESPONSE_STORE_WORKING_SET = 256  # Categories the SQLite backend keeps in memory
+MATCH_CACHE_SIZE = 1024  # Normalized inputs remembered by the response/command matchers (0 disables)
+
+# Command Settings
+COMMANDS_PATH = "data/commands.json"  # Declarative command specs (patterns, handler, response template)
+COMMAND_WORKERS = 4  # Threads running command handlers
+COMMAND_MAX_PENDING = 16  # Commands queued or running at once before new ones are refused
+COMMAND_TIMEOUT = 10.0  # Default deadline (seconds) before a command is abandoned; specs may set "timeout"
+COMMAND_RESPONSE_WAIT = 2.0  # Seconds a turn waits for a result before answering "still working"
+COMMAND_HELPER_BACKEND = "shell"  # "shell" (persistent helper shells), "subprocess" (a process per command) or "stub"
+COMMAND_HELPER_SHELL = "/bin/sh"  # Shell run by each helper
+COMMAND_HELPER_POOL_SIZE = 2  # Helper shells running at once
+
+# System Query Cache Settings
+LOCATION_CACHE_TTL = 4 * 3600  # Seconds an IP location lookup stays fresh
+WEATHER_CACHE_TTL = 10 * 60  # Seconds a weather report stays fresh
+STATUS_CACHE_TTL = 15  # Seconds battery, disk and network readings stay fresh
+CACHE_STALE_TTL_FACTOR = 6  # Expired results are served (and refreshed in the background) until this many TTLs old
+
+# Telemetry Settings
+TELEMETRY_ENABLED = True  # Sample battery, disk, network, CPU and memory in the background
+TELEMETRY_CAPACITY = 720  # Samples kept in memory (oldest are overwritten)
+TELEMETRY_INTERVAL = 30.0  # Seconds between samples
+TELEMETRY_ACTIVE_INTERVAL = 10.0  # Seconds between samples while system queries are being asked
+TELEMETRY_ACTIVE_WINDOW = 300.0  # Seconds after a query that sampling stays at the active interval
+TELEMETRY_IDLE_AFTER = 1800.0  # Seconds without queries before sampling slows to the idle interval
+TELEMETRY_IDLE_INTERVAL = 120.0  # Seconds between samples when idle
+TELEMETRY_BATTERY_FACTOR = 2.0  # Interval multiplier while running on battery
+TELEMETRY_TREND_WINDOW = 1800.0  # Seconds of samples a battery drain estimate is fitted to
+
+# HTTP Settings
+LOCATION_API_URL = "https://ipapi.co/json/"  # IP geolocation endpoint (point at a local stand-in for tests or offline sites)
+WEATHER_API_URL = "https://api.open-meteo.com/v1/forecast"  # Open-Meteo compatible forecast endpoint
+HTTP_TIMEOUT = 5.0  # Seconds per request
+HTTP_POOL_SIZE = 4  # Idle keep-alive connections kept per host
+HTTP_IDLE_TIMEOUT = 30.0  # Seconds before an idle connection is dropped instead of reused
+HTTP_DNS_TTL = 300  # Seconds a resolved host address is reused
+HTTP_WORKERS = 4  # Threads running concurrent fetches
+
+# Hit Statistics Settings
+HIT_STATS_PATH = "~/.local/state/voicebot/hit_stats.json"  # Per-user match counts; commands are tried most-hit first ("" disables)
+HIT_STATS_FLUSH_EVERY = 50  # Hits between saves (also saved at exit)
+
+# Knowledge Base Settings
+KNOWLEDGE_BASE_PATH = "data/knowledge.db"  # SQLite FTS5 passages for offline general questions (used if present)
+KNOWLEDGE_MIN_COVERAGE = 0.5  # Fraction of a question's topic words the best passage must contain to answer
 
 # Debug Mode
 DEBUG = False
+
+# Pre-fork Worker Settings
+PREFORK_WORKERS = 4  # Number of forked VoiceBot workers
+PREFORK_HOST = "127.0.0.1"
+PREFORK_PORT = 8765
+PREFORK_RESTART_DELAY = 1.0  # Seconds to wait before restarting a crashed worker
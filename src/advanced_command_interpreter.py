@@ -4,259 +4,228 @@ Understands natural language and executes actual system operations
 """
 
 import re
-from typing import Dict, Any, Tuple, Optional
-from src.system_control import SystemControl
+import threading
+from concurrent.futures import Future, wait
+from typing import Dict, Any, List, Tuple, Optional
+from src.command_executor import CommandExecutor, CommandTimeout, ExecutorBusy
+from src.command_matcher import CommandMatcher
+from src.command_registry import HandlerResolver, load_command_specs, order_commands, render_response
+from src.hit_stats import COMMANDS, HitStats, open_hit_stats
+from src.lru_cache import LRUCache, MISSING
+from src.param_extractors import extractor_path
+from src.text_normalizer import normalize_text, split_clauses
+from config.settings import MATCH_CACHE_SIZE, COMMANDS_PATH, COMMAND_TIMEOUT, COMMAND_RESPONSE_WAIT
+
+# Handler class behind the built-in system commands
+SYSTEM_CONTROL_CLASS = "src.system_control:SystemControl"
+
+# Where a clause may divide into separate commands (clauses themselves
+# come from split_clauses, which splits at commas)
+_CONJUNCTIONS = re.compile(r'\s*&\s*|\s+(?:and then|and also|and|then|also|plus)\s+', re.IGNORECASE)
+
+# Courtesy words around a normalized command that no pattern depends on;
+# stripped before matching so "please battery" meets the bare "^battery$"
+_FILLER = re.compile(
+    r'^(?:(?:please|ok|okay|so|hey|could you|can you|would you) )+'
+    r'|(?: (?:please|now|thanks|thank you))+$'
+)
 
 
 class AdvancedCommandInterpreter:
     """Interprets voice commands and executes system operations"""
     
-    def __init__(self):
-        """Initialize command interpreter"""
-        self.system_control = SystemControl()
-        self.command_patterns = self._build_command_patterns()
+    def __init__(self, commands_path: str = COMMANDS_PATH, executor: Optional[CommandExecutor] = None,
+                 response_wait: float = COMMAND_RESPONSE_WAIT, hit_stats: Optional[HitStats] = None):
+        """
+        Initialize command interpreter
+        
+        Only the command specs are read and their patterns compiled here;
+        handler modules are imported the first time one of their commands runs.
+        
+        Args:
+            commands_path: Path to the declarative command specs (JSON)
+            executor: Executor running the handlers (default: a new CommandExecutor)
+            response_wait: Seconds interpret_command waits before reporting a command as pending
+            hit_stats: Match counts that order the patterns and record new matches
+                (default: the shared statistics at HIT_STATS_PATH, if enabled)
+        """
+        self.handlers = HandlerResolver()
+        self.executor = executor or CommandExecutor()
+        self.response_wait = response_wait
+        self.hit_stats = hit_stats or open_hit_stats()
+        self.command_patterns = load_command_specs(commands_path)
+        self.command_matcher, self.pattern_commands = self._compile_patterns()
+        
+        # Normalized text -> (command name, parameters) or None; parse results only,
+        # never executed results, so live system data stays fresh
+        self.parse_cache = LRUCache(MATCH_CACHE_SIZE)
     
-    def _build_command_patterns(self) -> Dict[str, Dict[str, Any]]:
-        """Build regex patterns for command recognition"""
-        return {
-            # Location & Maps
-            'location': {
-                'patterns': [
-                    r'where am i',
-                    r'current location',
-                    r'my location',
-                    r'what is my location'
-                ],
-                'action': 'get_location',
-                'description': 'Get your current location'
-            },
-            
-            # Restaurants & Nearby
-            'restaurants': {
-                'patterns': [
-                    r'find (me )?nearby restaurants',
-                    r'restaurants near( by| here)?',
-                    r'find (me )?a restaurant',
-                    r'where are restaurants',
-                    r'any restaurants nearby'
-                ],
-                'action': 'find_restaurants_nearby',
-                'description': 'Find nearby restaurants'
-            },
-            'coffee': {
-                'patterns': [
-                    r'find coffee',
-                    r'coffee shops',
-                    r'where is.*coffee',
-                    r'nearest coffee'
-                ],
-                'action': 'find_coffee_shops',
-                'description': 'Find nearby coffee shops'
-            },
-            
-            # Weather
-            'weather': {
-                'patterns': [
-                    r"what's the weather",
-                    r'weather here',
-                    r'current weather',
-                    r'is it raining',
-                    r'temperature outside',
-                    r'how is the weather'
-                ],
-                'action': 'get_weather',
-                'description': 'Get current weather'
-            },
-            
-            # System Information
-            'system_info': {
-                'patterns': [
-                    r'system (information|info|details)',
-                    r'tell me about (my )?system',
-                    r'system status',
-                    r'computer info'
-                ],
-                'action': 'get_system_info',
-                'description': 'Get system information'
-            },
-            'battery': {
-                'patterns': [
-                    r'battery (status|level|percentage)',
-                    r'how much battery',
-                    r'battery (left|remaining)',
-                    r'battery percentage'
-                ],
-                'action': 'get_battery_status',
-                'description': 'Check battery status'
-            },
-            'disk': {
-                'patterns': [
-                    r'disk (usage|space|information)',
-                    r'how much storage',
-                    r'storage (used|available)',
-                    r'disk space'
-                ],
-                'action': 'get_disk_usage',
-                'description': 'Check disk usage'
-            },
-            'network': {
-                'patterns': [
-                    r'network (status|information)',
-                    r'internet (status|connection)',
-                    r'wifi (status|connection)',
-                    r'network info'
-                ],
-                'action': 'get_network_status',
-                'description': 'Check network status'
-            },
-            
-            # Brightness Control
-            'brightness': {
-                'patterns': [
-                    r'(get|check|what is) (the )?brightness',
-                    r'how (bright|dim)',
-                    r'current brightness'
-                ],
-                'action': 'get_brightness',
-                'description': 'Get brightness level'
-            },
-            'set_brightness': {
-                'patterns': [
-                    r'(set|change|adjust) brightness (to )?(\d+)',
-                    r'brightness (\d+)',
-                    r'(brighten|dim) (to )?(\d+)'
-                ],
-                'action': 'set_brightness',
-                'extract_param': 'last_number',
-                'description': 'Set brightness level'
-            },
-            
-            # Volume Control
-            'volume': {
-                'patterns': [
-                    r'(get|check|what is) (the )?volume',
-                    r'volume level',
-                    r'current volume'
-                ],
-                'action': 'get_volume',
-                'description': 'Get volume level'
-            },
-            'set_volume': {
-                'patterns': [
-                    r'(set|change|adjust) volume (to )?(\d+)',
-                    r'volume (\d+)',
-                    r'(louder|quieter|increase|decrease) volume',
-                    r'volume (up|down)'
-                ],
-                'action': 'set_volume',
-                'extract_param': 'last_number',
-                'description': 'Set volume level'
-            },
-            'mute': {
-                'patterns': [
-                    r'(mute|silence)',
-                    r'mute (the )?sound',
-                    r'mute audio'
-                ],
-                'action': 'mute_volume',
-                'description': 'Mute volume'
-            },
-            'unmute': {
-                'patterns': [
-                    r'unmute',
-                    r'unmute (the )?sound'
-                ],
-                'action': 'unmute_volume',
-                'description': 'Unmute volume'
-            },
-            
-            # Applications
-            'open_app': {
-                'patterns': [
-                    r'(open|launch|start) (\w+)',
-                    r'open (\w+) (application|app)',
-                    r'start (\w+)'
-                ],
-                'action': 'open_application',
-                'extract_param': 'app_name',
-                'description': 'Open an application'
-            },
-            'close_app': {
-                'patterns': [
-                    r'(close|quit|exit) (\w+)',
-                    r'close (\w+) (application|app)',
-                    r'exit (\w+)'
-                ],
-                'action': 'quit_application',
-                'extract_param': 'app_name',
-                'description': 'Close an application'
-            },
-            'list_apps': {
-                'patterns': [
-                    r'(list|show|what are) (open )?applications',
-                    r'(list|show) running (apps|applications)',
-                    r'what apps are open'
-                ],
-                'action': 'list_open_applications',
-                'description': 'List open applications'
-            },
+    @property
+    def system_control(self):
+        """Shared SystemControl instance (created on first access)"""
+        return self.handlers.instance(SYSTEM_CONTROL_CLASS)
+    
+    def _compile_patterns(self) -> Tuple[CommandMatcher, List[str]]:
+        """
+        Compile every command pattern once, in evaluation order
+        
+        Commands are ordered by the hit counts saved so far (see
+        order_commands); the order is fixed until the next start.
+        
+        Returns:
+            Tuple of (matcher over all patterns, command name per pattern id)
+        """
+        hits = self.hit_stats.hits(COMMANDS) if self.hit_stats else None
+        patterns = []
+        pattern_commands = []
+        for cmd_name in order_commands(self.command_patterns, hits):
+            for pattern in self.command_patterns[cmd_name]['patterns']:
+                patterns.append(pattern)
+                pattern_commands.append(cmd_name)
+        return CommandMatcher(patterns), pattern_commands
+    
+    def parse_command(self, text: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Match a command and extract its parameters without executing it
+        
+        Args:
+            text: User input text
+        
+        Returns:
+            Tuple of (command name, parameters), or None if no command matched
+        """
+        return self._parse_cached(text, normalize_text(text))
+    
+    def _parse_cached(self, text: str, text_normalized: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        parse_command for text whose normalized form is known
+        
+        The parse cache keeps only the match (command name and groups) by
+        normalized text; parameters are extracted from the original text on
+        every call, so they keep the case and punctuation normalization drops.
+        """
+        matched = self.parse_cache.get(text_normalized)
+        if matched is MISSING:
+            matched = self._match_normalized(text_normalized)
+            self.parse_cache.put(text_normalized, matched)
+        return self._with_params(text, matched)
+    
+    def parse_intents(self, text: str) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Match every command in a possibly compound utterance
+        
+        The input is split at commas and joining words ("and", "then", ...);
+        the split is kept only if every part is a command on its own, so
+        "search for salt and pepper" stays one search.
+        
+        Args:
+            text: User input text
+        
+        Returns:
+            List of (command name, parameters) in spoken order; empty if no
+            command matched
+        """
+        return self.parse_clauses(split_clauses(text))
+    
+    def parse_clauses(self, clauses: List[Tuple[str, str]]) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        parse_intents for input already split with split_clauses
+        
+        Callers that need the normalized text too (the intent router) split
+        and normalize once and pass the (raw, normalized) clauses here.
+        """
+        segments = []
+        for raw_clause, _ in clauses:
+            for segment in _CONJUNCTIONS.split(raw_clause):
+                segment_normalized = normalize_text(segment)
+                if segment_normalized:
+                    segments.append((segment.strip(), segment_normalized))
+        
+        if len(segments) > 1:
+            intents = [self._parse_cached(segment, segment_normalized) for segment, segment_normalized in segments]
+            if all(intents):
+                return intents
+        
+        parsed = self._parse_cached(' '.join(raw for raw, _ in clauses),
+                                    ' '.join(normalized for _, normalized in clauses))
+        return [parsed] if parsed else []
+    
+    def parse_commands(self, texts: List[str]) -> List[Optional[Tuple[str, Dict[str, Any]]]]:
+        """
+        Parse many inputs at once without executing anything
+        
+        Inputs are normalized once and each distinct normalized text is matched
+        once (parameters still come from each input's own text). The parse
+        cache is bypassed so a large batch does not evict the
+        entries interactive use relies on.
+        
+        Args:
+            texts: User input texts
+        
+        Returns:
+            List of (command name, parameters) or None, in input order
+        """
+        normalized_by_text = {}
+        matched_by_normalized = {}
+        results = []
+        for text in texts:
+            text_normalized = normalized_by_text.get(text)
+            if text_normalized is None:
+                text_normalized = normalized_by_text[text] = normalize_text(text)
             
-            # URLs & Search
-            'open_url': {
-                'patterns': [
-                    r'(open|go to|visit) (.+\..+)',
-                    r'open (.+\.com)',
-                    r'go to (.+)'
-                ],
-                'action': 'open_url',
-                'extract_param': 'url',
-                'description': 'Open a URL'
-            },
-            'search': {
-                'patterns': [
-                    r'(search for|search|google) (.+)',
-                    r'(find|look for|look up) (.+)',
-                    r'search (.+) on google'
-                ],
-                'action': 'search_web',
-                'extract_param': 'search_query',
-                'description': 'Search the web'
-            },
+            if text_normalized not in matched_by_normalized:
+                matched_by_normalized[text_normalized] = self._match_normalized(text_normalized)
             
-            # System Control
-            'sleep': {
-                'patterns': [
-                    r'(sleep|go to sleep)',
-                    r'put mac to sleep',
-                    r'mac sleep'
-                ],
-                'action': 'sleep_mac',
-                'description': 'Put Mac to sleep'
-            },
-            'lock': {
-                'patterns': [
-                    r'(lock|lock screen)',
-                    r'lock (the )?screen',
-                    r'lock mac'
-                ],
-                'action': 'lock_screen',
-                'description': 'Lock the screen'
-            }
-        }
+            results.append(self._with_params(text, matched_by_normalized[text_normalized]))
+        
+        return results
+    
+    def _match_normalized(self, text_normalized: str) -> Optional[Tuple[str, Tuple[Optional[str], ...]]]:
+        """Run the patterns in priority order over normalized text: (command name, groups) or None"""
+        found = self.command_matcher.match(_FILLER.sub('', text_normalized))
+        if found is None:
+            return None
+        
+        pattern_id, match = found
+        return self.pattern_commands[pattern_id], match.groups()
+    
+    def _with_params(self, text: str, matched: Optional[Tuple[str, Tuple[Optional[str], ...]]]
+                     ) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """(command name, parameters) for a match, extracting from the original text"""
+        if matched is None:
+            return None
+        
+        cmd_name, groups = matched
+        return cmd_name, self._extract_params(self.command_patterns[cmd_name], text, groups)
     
     def interpret_command(self, text: str) -> Dict[str, Any]:
         """
         Interpret voice command and execute corresponding action
-        Returns: {action, result, status, response}
+        Returns: {action, result, status, response}; status is 'pending' (with
+        a 'future') when the command is still running, see complete_command.
+        Compound utterances run every command, see _execute_commands
+        """
+        return self.execute_intents(self.parse_intents(text))
+    
+    def execute_intents(self, intents: List[Tuple[str, Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        Execute already-parsed commands (see parse_intents)
+        
+        Args:
+            intents: (command name, parameters) in spoken order
+        
+        Returns:
+            Same as interpret_command; 'unmatched' if intents is empty
         """
-        text_lower = text.lower().strip()
+        if self.hit_stats:
+            for cmd_name, _ in intents:
+                self.hit_stats.record(COMMANDS, cmd_name)
         
-        # Try to match command patterns
-        for cmd_name, cmd_config in self.command_patterns.items():
-            for pattern in cmd_config['patterns']:
-                match = re.search(pattern, text_lower, re.IGNORECASE)
-                if match:
-                    return self._execute_command(cmd_name, cmd_config, text, match)
+        if len(intents) > 1:
+            return self._execute_commands(intents)
+        if intents:
+            cmd_name, params = intents[0]
+            return self._execute_command(cmd_name, self.command_patterns[cmd_name], params)
         
         # No command matched
         return {
@@ -272,135 +241,230 @@ class AdvancedCommandInterpreter:
             ]
         }
     
-    def _execute_command(self, cmd_name: str, cmd_config: Dict, text: str, match) -> Dict[str, Any]:
-        """Execute a matched command"""
-        try:
-            action_name = cmd_config['action']
-            
-            # Get the action method from system_control
-            if not hasattr(self.system_control, action_name):
-                return {
-                    'action': cmd_name,
-                    'status': 'error',
-                    'response': f'Command {action_name} not implemented'
-                }
-            
-            action_method = getattr(self.system_control, action_name)
-            
-            # Extract parameters if needed
-            params = {}
-            if 'extract_param' in cmd_config:
-                param_name = cmd_config['extract_param']
-                
-                if param_name == 'last_number':
-                    # Extract last number from command
-                    numbers = re.findall(r'\d+', text_lower)
-                    if numbers:
-                        params['level'] = int(numbers[-1])
-                
-                elif param_name == 'app_name':
-                    # Extract application name
-                    for group in match.groups():
-                        if group and group not in ['open', 'launch', 'start', 'close', 'quit', 'exit', 'application', 'app']:
-                            params['app_name'] = group
-                            break
-                
-                elif param_name == 'url':
-                    # Extract URL
-                    urls = re.findall(r'https?://\S+|[\w\-.]+\.\w{2,}', text)
-                    if urls:
-                        params['url'] = urls[0]
-                
-                elif param_name == 'search_query':
-                    # Extract search query
-                    # Remove the command words
-                    query = text_lower
-                    for pattern in cmd_config['patterns']:
-                        query = re.sub(pattern, '', query, flags=re.IGNORECASE)
-                    query = query.strip()
-                    if query:
-                        params['query'] = query
-                    else:
-                        params['query'] = user_input  # Use original text if extraction failed
-            
-            # Execute the action
-            result = action_method(**params) if params else action_method()
-            
-            # Format response
-            response = self._format_response(cmd_name, result)
+    def _extract_params(self, cmd_config: Dict, text: str, groups: Tuple[Optional[str], ...]) -> Dict[str, Any]:
+        """
+        Extract command parameters from the original text and the matched pattern's groups
+        
+        The spec's "extract_param" names a built-in extractor or a
+        "module:function" path (see param_extractors), imported on first use.
+        """
+        if 'extract_param' not in cmd_config:
+            return {}
+        
+        extractor = self.handlers.resolve(extractor_path(cmd_config['extract_param']))
+        return extractor(text, groups)
+    
+    def _execute_command(self, cmd_name: str, cmd_config: Dict, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run a matched command on the executor and wait briefly for its result
+        
+        Returns the finished result, or a 'pending' result carrying the
+        command's future if it is still running after COMMAND_RESPONSE_WAIT
+        seconds; pass that to complete_command once the future is done.
+        """
+        started = self._start_command(cmd_name, cmd_config, params)
+        if started['status'] != 'pending':
+            return started
+        
+        done, _ = wait([started['future']], timeout=self.response_wait)
+        return self._command_result(cmd_name, started['future']) if done else started
+    
+    def _execute_commands(self, intents: List[Tuple[str, Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        Run several commands from one utterance and combine their responses
+        
+        Read-only commands run in parallel. A command with side effects starts
+        once every command before it is done, and commands after it start once
+        it is done, so side effects happen in the order they were asked for.
+        The ordering is chained on the commands' futures (see _start_after),
+        so the turn itself waits at most response_wait seconds, like a single
+        command, and reports whatever is still queued as pending.
+        
+        Args:
+            intents: (command name, parameters) in spoken order
+        
+        Returns:
+            {action: 'multiple', status, results, response}; results holds each
+            command's own result, in order (pending ones as from interpret_command)
+        """
+        started = []
+        # The latest command with side effects, which every later command waits for
+        barrier: List[Future] = []
+        for cmd_name, params in intents:
+            cmd_config = self.command_patterns[cmd_name]
+            if cmd_config.get('read_only'):
+                started.append(self._start_after(barrier, cmd_name, cmd_config, params))
+                continue
             
+            earlier = [result['future'] for result in started if 'future' in result]
+            result = self._start_after(earlier, cmd_name, cmd_config, params)
+            barrier = [result['future']] if 'future' in result else []
+            started.append(result)
+        
+        # All commands share one response wait
+        running = [result['future'] for result in started if 'future' in result]
+        wait(running, timeout=self.response_wait)
+        results = [
+            self._command_result(result['action'], result['future'])
+            if 'future' in result and result['future'].done() else result
+            for result in started
+        ]
+        
+        responses = [result['response'] for result in results if result['status'] != 'pending']
+        statuses = {result['status'] for result in results}
+        if 'pending' in statuses:
+            responses.append("Still working on the rest. I'll let you know when it's done.")
+            status = 'pending'
+        elif statuses == {'success'}:
+            status = 'success'
+        else:
+            status = 'error'
+        
+        return {
+            'action': 'multiple',
+            'status': status,
+            'results': results,
+            'response': ' '.join(responses)
+        }
+    
+    def _start_command(self, cmd_name: str, cmd_config: Dict, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Submit a command to the executor: a 'pending' result with its future, or an error result"""
+        try:
+            handler = self.handlers.resolve(cmd_config['handler'])
+        except (ImportError, AttributeError, ValueError):
             return {
                 'action': cmd_name,
-                'status': 'success',
-                'result': result,
-                'response': response
+                'status': 'error',
+                'response': f"Command {cmd_config['handler']} not implemented"
             }
         
-        except Exception as e:
+        try:
+            future = self.executor.submit(handler, params, timeout=cmd_config.get('timeout', COMMAND_TIMEOUT))
+        except ExecutorBusy as e:
             return {
                 'action': cmd_name,
                 'status': 'error',
-                'response': f'Error executing command: {str(e)}',
+                'response': "I'm still busy with earlier commands. Please try again in a moment.",
                 'error': str(e)
             }
+        
+        return {
+            'action': cmd_name,
+            'status': 'pending',
+            'future': future,
+            'response': "Still working on that. I'll let you know when it's done."
+        }
     
-    def _format_response(self, cmd_name: str, result: Any) -> str:
-        """Format system control result into a natural language response"""
+    def _start_after(self, prerequisites: List[Future], cmd_name: str, cmd_config: Dict,
+                     params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Submit a command once every prerequisite future is done, without blocking
         
-        if isinstance(result, dict):
-            if 'error' in result:
-                return f"Error: {result['error']}"
-            
-            if cmd_name == 'location':
-                return f"You are in {result.get('city', 'unknown')}, {result.get('region', 'unknown')}. Coordinates: {result.get('latitude', 'N/A')}, {result.get('longitude', 'N/A')}"
-            
-            elif cmd_name == 'weather':
-                temp = result.get('temperature')
-                condition = result.get('condition')
-                location = result.get('location', 'your area')
-                return f"In {location}, it's {temp}°C and {condition}. Wind speed: {result.get('wind_speed')} km/h. Humidity: {result.get('humidity')}%"
-            
-            elif cmd_name == 'battery':
-                return f"Battery: {result.get('percentage')}%, Status: {result.get('status')}"
-            
-            elif cmd_name == 'disk':
-                return f"Disk usage - Used: {result.get('used')}, Available: {result.get('available')}, Total: {result.get('total')}"
-            
-            elif cmd_name == 'network':
-                return f"Network status: Connected to {result.get('SSID', 'unknown network')}"
-            
-            elif cmd_name == 'list_apps':
-                count = result.get('count', 0)
-                return f"You have {count} applications open"
-            
-            elif 'status' in result and result['status'] == 'success':
-                return result.get('message', 'Command executed successfully')
-            
+        Returns:
+            As _start_command; when prerequisites are still running, the
+            'pending' result carries a future that settles with the command's
+            own future (a command that cannot be started fails it)
+        """
+        waiting = [future for future in prerequisites if not future.done()]
+        if not waiting:
+            return self._start_command(cmd_name, cmd_config, params)
+        
+        chained = Future()
+        remaining = [len(waiting)]
+        lock = threading.Lock()
+        
+        def settle(future: Future):
+            if future.cancelled():
+                chained.cancel()
+            elif future.exception() is not None:
+                chained.set_exception(future.exception())
+            else:
+                chained.set_result(future.result())
+        
+        def prerequisite_done(_):
+            with lock:
+                remaining[0] -= 1
+                if remaining[0]:
+                    return
+            result = self._start_command(cmd_name, cmd_config, params)
+            if 'future' in result:
+                result['future'].add_done_callback(settle)
             else:
-                return str(result)
+                chained.set_exception(RuntimeError(result['response']))
+        
+        for future in waiting:
+            future.add_done_callback(prerequisite_done)
+        
+        return {
+            'action': cmd_name,
+            'status': 'pending',
+            'future': chained,
+            'response': "Still working on that. I'll let you know when it's done."
+        }
+    
+    def complete_command(self, pending: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Final result of a command that was reported as pending
+        
+        Args:
+            pending: Result returned by interpret_command with status 'pending'
+        
+        Returns:
+            The command result, waiting for the future if it is not done yet
+            (its deadline bounds the wait)
+        """
+        future = pending['future']
+        wait([future])
+        return self._command_result(pending['action'], future)
+    
+    def _command_result(self, cmd_name: str, future: Future) -> Dict[str, Any]:
+        """Build the result dict of a command whose future is done"""
+        if future.cancelled():
+            error = CommandTimeout("Command was cancelled before it started")
+        else:
+            error = future.exception()
+        
+        if isinstance(error, CommandTimeout):
+            return {
+                'action': cmd_name,
+                'status': 'timeout',
+                'response': f"Sorry, {self.command_patterns[cmd_name]['description'].lower()} took too long.",
+                'error': str(error)
+            }
+        
+        if error is not None:
+            return {
+                'action': cmd_name,
+                'status': 'error',
+                'response': f'Error executing command: {str(error)}',
+                'error': str(error)
+            }
         
-        return str(result)
+        result = future.result()
+        return {
+            'action': cmd_name,
+            'status': 'success',
+            'result': result,
+            'response': self._format_response(cmd_name, result)
+        }
+    
+    def _format_response(self, cmd_name: str, result: Any) -> str:
+        """Format a handler result with the command's response template"""
+        return render_response(self.command_patterns[cmd_name], result)
     
     def get_help(self) -> str:
         """Get all available commands"""
         help_text = "Available commands:\n\n"
         
-        categories = {
-            'Location & Maps': ['location', 'restaurants', 'coffee'],
-            'Weather': ['weather'],
-            'System Info': ['system_info', 'battery', 'disk', 'network'],
-            'Controls': ['brightness', 'set_brightness', 'volume', 'set_volume', 'mute', 'unmute'],
-            'Applications': ['open_app', 'close_app', 'list_apps'],
-            'Web': ['open_url', 'search'],
-            'System': ['sleep', 'lock']
-        }
+        # Groups in the order they first appear in the spec file
+        categories: Dict[str, List[str]] = {}
+        for cmd_config in self.command_patterns.values():
+            categories.setdefault(cmd_config.get('group', 'Other'), []).append(cmd_config['description'])
         
-        for category, cmds in categories.items():
+        for category, descriptions in categories.items():
             help_text += f"\n{category}:\n"
-            for cmd in cmds:
-                if cmd in self.command_patterns:
-                    desc = self.command_patterns[cmd]['description']
-                    help_text += f"  • {desc}\n"
+            for desc in descriptions:
+                help_text += f"  • {desc}\n"
         
         return help_text
 
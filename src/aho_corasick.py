@@ -0,0 +1,132 @@
+"""
+Aho-Corasick Automaton - Multi-pattern substring matching
+Finds every occurrence of a set of strings in one linear scan of the input,
+independent of how many strings are registered
+"""
+
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+
+class AhoCorasick:
+    """Trie of keys with failure links for single-pass substring search"""
+    
+    def __init__(self, keys: Iterable[str] = ()):
+        """
+        Build the automaton
+        
+        Args:
+            keys: Strings to search for
+        """
+        self.keys: List[str] = []
+        self.key_ids: Dict[str, int] = {}
+        
+        # Node tables: transitions, failure link, key ids ending at the node
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.outputs: List[List[int]] = [[]]
+        
+        for key in keys:
+            self.add(key)
+        self.build()
+    
+    def add(self, key: str) -> int:
+        """
+        Insert a key into the trie (call build() before searching)
+        
+        Args:
+            key: String to search for
+        
+        Returns:
+            The key id
+        """
+        if key in self.key_ids:
+            return self.key_ids[key]
+        
+        key_id = len(self.keys)
+        self.keys.append(key)
+        self.key_ids[key] = key_id
+        
+        node = 0
+        for char in key:
+            next_node = self.goto[node].get(char)
+            if next_node is None:
+                next_node = len(self.goto)
+                self.goto[node][char] = next_node
+                self.goto.append({})
+                self.fail.append(0)
+                self.outputs.append([])
+            node = next_node
+        
+        self.outputs[node].append(key_id)
+        return key_id
+    
+    def build(self):
+        """Compute failure links and merge outputs along them"""
+        queue = deque()
+        for child in self.goto[0].values():
+            self.fail[child] = 0
+            queue.append(child)
+        
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                
+                fallback = self.fail[node]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                
+                # BFS order guarantees the failure target is already complete
+                if self.fail[child]:
+                    self.outputs[child] = self.outputs[child] + self.outputs[self.fail[child]]
+    
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, str]]:
+        """
+        Yield every non-empty key occurrence in the text
+        
+        Args:
+            text: Text to scan
+        
+        Yields:
+            Tuples of (end index, key)
+        """
+        goto = self.goto
+        fail = self.fail
+        outputs = self.outputs
+        keys = self.keys
+        
+        node = 0
+        for index, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if node:
+                for key_id in outputs[node]:
+                    yield index, keys[key_id]
+    
+    def find_all(self, text: str) -> Set[str]:
+        """
+        Return the distinct keys that occur anywhere in the text
+        
+        Args:
+            text: Text to scan
+        
+        Returns:
+            Set of keys found as substrings
+        """
+        goto = self.goto
+        fail = self.fail
+        outputs = self.outputs
+        
+        found = set(outputs[0])  # the empty key matches everywhere
+        node = 0
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if outputs[node]:
+                found.update(outputs[node])
+        
+        return {self.keys[key_id] for key_id in found}
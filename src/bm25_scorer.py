@@ -0,0 +1,206 @@
+"""
+BM25 Scorer - Vectorized graded confidence for response matching
+Precomputes a sparse BM25 term-weight matrix over every response pattern and
+scores the input against all categories in one NumPy pass
+"""
+
+import math
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from src.response_index import ResponseIndex
+
+
+class BM25Scorer:
+    """Scores user input against every pattern with BM25 term weights"""
+    
+    def __init__(self, index: ResponseIndex, k1: float = 1.2, b: float = 0.75):
+        """
+        Build the term-weight matrix from a response index
+        
+        Args:
+            index: Response index holding the patterns to score against
+            k1: BM25 term-frequency saturation
+            b: BM25 pattern-length normalization
+        """
+        self.k1 = k1
+        self.b = b
+        self.categories: List[str] = list(index.categories)
+        self.vocabulary: Dict[str, int] = {}
+        
+        # Rows are patterns ordered by (category, position) so every
+        # category owns a contiguous run of rows
+        rows = sorted(
+            (entry[0], entry[1], entry[2].split())
+            for entry in index.patterns if entry is not None
+        )
+        self.row_count = len(rows)
+        
+        document_frequency: Dict[str, int] = {}
+        for _, _, tokens in rows:
+            for token in set(tokens):
+                document_frequency[token] = document_frequency.get(token, 0) + 1
+        
+        average_length = (sum(len(tokens) for _, _, tokens in rows) / self.row_count) if rows else 1.0
+        idf = {
+            token: math.log(1 + (self.row_count - df + 0.5) / (df + 0.5))
+            for token, df in document_frequency.items()
+        }
+        self.max_idf = max(idf.values(), default=1.0)
+        
+        # Collect (term, row, weight, idf) entries, then lay them out by term
+        # (CSC order) so a query gathers one contiguous slice per token
+        entries = []
+        row_categories = []
+        for row, (category_id, _, tokens) in enumerate(rows):
+            row_categories.append(category_id)
+            length_norm = 1 - b + b * len(tokens) / average_length
+            for token in set(tokens):
+                tf = tokens.count(token)
+                weight = idf[token] * tf * (k1 + 1) / (tf + k1 * length_norm)
+                term_id = self.vocabulary.setdefault(token, len(self.vocabulary))
+                entries.append((term_id, row, weight, idf[token]))
+        entries.sort()
+        
+        term_count = len(self.vocabulary)
+        entry_terms = np.array([entry[0] for entry in entries], dtype=np.int64)
+        self.entry_rows = np.array([entry[1] for entry in entries], dtype=np.int64)
+        self.entry_weights = np.array([entry[2] for entry in entries], dtype=np.float64)
+        
+        self.term_idf = np.zeros(term_count, dtype=np.float64)
+        self.term_idf[entry_terms] = [entry[3] for entry in entries]
+        self.term_ptr = np.zeros(term_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(entry_terms, minlength=term_count), out=self.term_ptr[1:])
+        
+        # Maximum attainable score per row (the pattern scored against itself)
+        self.row_norms = np.bincount(self.entry_rows, weights=self.entry_weights, minlength=self.row_count)
+        self.row_norms[self.row_norms == 0] = np.inf  # wordless patterns never score
+        
+        self.row_categories = np.array(row_categories, dtype=np.int64)
+    
+    def match(self, user_text: str) -> Tuple[Optional[str], float]:
+        """
+        Find the best matching category with a real-valued confidence
+        
+        Confidence is the share of the pattern's BM25 mass found in the
+        input, damped by how much of the input the pattern explains:
+        pattern_coverage * (0.5 + 0.5 * input_coverage), in [0, 1].
+        
+        Args:
+            user_text: Normalized user input (see normalize_text)
+        
+        Returns:
+            Tuple of (category name or None, confidence_score)
+        """
+        tokens = set(user_text.split())
+        if not tokens or not self.row_count:
+            return None, 0.0
+        
+        term_ids = [self.vocabulary[token] for token in tokens if token in self.vocabulary]
+        if not term_ids:
+            return None, 0.0
+        
+        # Unknown input words count as maximally informative
+        query_mass = float(self.term_idf[term_ids].sum()) + self.max_idf * (len(tokens) - len(term_ids))
+        
+        slices = [slice(self.term_ptr[term_id], self.term_ptr[term_id + 1]) for term_id in term_ids]
+        rows = np.concatenate([self.entry_rows[s] for s in slices])
+        weights = np.concatenate([self.entry_weights[s] for s in slices])
+        idfs = np.concatenate([np.full(s.stop - s.start, self.term_idf[term_id])
+                               for s, term_id in zip(slices, term_ids)])
+        
+        # Accumulate only over rows that share a term with the input; a
+        # category's score is the best of its rows, so the best row decides
+        touched, inverse = np.unique(rows, return_inverse=True)
+        matched = np.bincount(inverse, weights=weights)
+        explained = np.bincount(inverse, weights=idfs)
+        confidence = (matched / self.row_norms[touched]) * (0.5 + 0.5 * explained / query_mass)
+        
+        # Rows are sorted by category and argmax returns the first maximum,
+        # so ties resolve in database order
+        best = int(np.argmax(confidence))
+        best_confidence = float(confidence[best])
+        if best_confidence <= 0.0:
+            return None, 0.0
+        
+        return self.categories[self.row_categories[touched[best]]], best_confidence
+    
+    def match_batch(self, user_texts: List[str], chunk_size: int = 4096) -> List[Tuple[Optional[str], float]]:
+        """
+        Score many inputs at once, with the same confidences as match()
+        
+        Each chunk of inputs is scored in one vectorized pass: every
+        (input, term) pair gathers its posting slice, and the per-(input, row)
+        sums are accumulated with a single bincount.
+        
+        Args:
+            user_texts: Normalized user inputs (see normalize_text)
+            chunk_size: Inputs scored per pass (bounds peak memory)
+        
+        Returns:
+            List of (category name or None, confidence_score), in input order
+        """
+        results: List[Tuple[Optional[str], float]] = [(None, 0.0)] * len(user_texts)
+        if not self.row_count:
+            return results
+        
+        for start in range(0, len(user_texts), chunk_size):
+            self._match_chunk(user_texts[start:start + chunk_size], results, start)
+        return results
+    
+    def _match_chunk(self, user_texts: List[str], results: list, offset: int):
+        """Score one chunk of inputs into results[offset:]"""
+        query_ids = []
+        term_ids = []
+        unknown_counts = np.zeros(len(user_texts), dtype=np.float64)
+        for query, user_text in enumerate(user_texts):
+            tokens = set(user_text.split())
+            known = [self.vocabulary[token] for token in tokens if token in self.vocabulary]
+            if not known:
+                continue
+            query_ids.extend([query] * len(known))
+            term_ids.extend(known)
+            unknown_counts[query] = len(tokens) - len(known)
+        
+        if not term_ids:
+            return
+        
+        query_ids = np.array(query_ids, dtype=np.int64)
+        term_ids = np.array(term_ids, dtype=np.int64)
+        pair_idfs = self.term_idf[term_ids]
+        query_mass = np.bincount(query_ids, weights=pair_idfs, minlength=len(user_texts))
+        query_mass += self.max_idf * unknown_counts
+        
+        # Expand every (input, term) pair into its posting slice positions
+        starts = self.term_ptr[term_ids]
+        lengths = self.term_ptr[term_ids + 1] - starts
+        pair_of_entry = np.repeat(np.arange(len(term_ids)), lengths)
+        positions = np.arange(int(lengths.sum())) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        positions += np.repeat(starts, lengths)
+        
+        rows = self.entry_rows[positions]
+        queries = query_ids[pair_of_entry]
+        
+        touched, inverse = np.unique(queries * self.row_count + rows, return_inverse=True)
+        matched = np.bincount(inverse, weights=self.entry_weights[positions])
+        explained = np.bincount(inverse, weights=pair_idfs[pair_of_entry])
+        touched_queries = touched // self.row_count
+        touched_rows = touched % self.row_count
+        confidence = (matched / self.row_norms[touched_rows]) * (0.5 + 0.5 * explained / query_mass[touched_queries])
+        
+        # Best row per input: highest confidence, lowest row (database order) on ties
+        order = np.lexsort((touched_rows, -confidence, touched_queries))
+        ordered_queries = touched_queries[order]
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = ordered_queries[1:] != ordered_queries[:-1]
+        
+        for best in order[first]:
+            best_confidence = float(confidence[best])
+            if best_confidence > 0.0:
+                category = self.categories[self.row_categories[touched_rows[best]]]
+                results[offset + int(touched_queries[best])] = (category, best_confidence)
@@ -0,0 +1,188 @@
+"""
+Command Executor - Runs command handlers off the conversation thread
+Handlers run on a fixed number of daemon worker threads and hand back
+futures. Every command has a deadline: a turn waits only briefly for its
+result, and a command that is still queued or running when its deadline
+passes is cancelled or abandoned. A worker stuck in an abandoned handler is
+replaced, so hung handlers never starve later commands (or block exit)
+"""
+
+import os
+import queue
+import threading
+from concurrent.futures import Future, InvalidStateError, wait as wait_for
+from typing import Any, Callable, Dict, Optional, Set
+
+from config.settings import COMMAND_WORKERS, COMMAND_MAX_PENDING, COMMAND_TIMEOUT
+
+
+class CommandTimeout(TimeoutError):
+    """Raised on a command future whose handler missed its deadline"""
+
+
+class ExecutorBusy(RuntimeError):
+    """Raised by submit when too many commands are already queued or running"""
+
+
+class CommandExecutor:
+    """Bounded worker threads that enforce a deadline on every command"""
+    
+    def __init__(self, max_workers: int = COMMAND_WORKERS, max_pending: int = COMMAND_MAX_PENDING):
+        """
+        Initialize the executor
+        
+        Args:
+            max_workers: Handler threads
+            max_pending: Commands that may be queued or running at once,
+                including abandoned stragglers that have not returned yet
+        """
+        self.max_workers = max_workers
+        self._slots = threading.BoundedSemaphore(max(max_pending, max_workers))
+        self._timers: Dict[Future, threading.Timer] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+        self._reset()
+    
+    def _reset(self):
+        """Start with no workers (after a fork they belong to the parent)"""
+        self._pid = os.getpid()
+        self._queue: 'queue.SimpleQueue' = queue.SimpleQueue()
+        self._workers = 0
+        self._running: Set[Future] = set()
+        self._abandoned: Set[Future] = set()
+    
+    def submit(self, handler: Callable, kwargs: Optional[Dict[str, Any]] = None,
+               timeout: float = COMMAND_TIMEOUT) -> Future:
+        """
+        Schedule a handler call
+        
+        The returned future fails with CommandTimeout if the handler has not
+        returned within timeout seconds. A handler still waiting for a thread
+        then never starts; one already running cannot be interrupted, so its
+        result is discarded when it finally returns and a new worker takes
+        its thread's place in the meantime.
+        
+        Args:
+            handler: Callable to run
+            kwargs: Keyword arguments for the handler
+            timeout: Deadline in seconds, counted from submission
+        
+        Returns:
+            Future for the handler's return value
+        
+        Raises:
+            ExecutorBusy: if max_pending commands are already outstanding
+            RuntimeError: after shutdown
+        """
+        if not self._slots.acquire(blocking=False):
+            raise ExecutorBusy("Too many commands are still running")
+        
+        future = Future()
+        timer = threading.Timer(timeout, self._expire, (future, timeout))
+        timer.daemon = True
+        with self._lock:
+            if self._closed:
+                self._slots.release()
+                raise RuntimeError("Cannot run commands after shutdown")
+            if self._pid != os.getpid():
+                self._reset()
+            while self._workers < self.max_workers:
+                self._start_worker()
+            self._timers[future] = timer
+            self._queue.put((future, handler, kwargs or {}))
+        future.add_done_callback(self._cancel_timer)
+        
+        timer.start()
+        return future
+    
+    def _start_worker(self):
+        """Start one worker thread (called with the lock held)"""
+        self._workers += 1
+        threading.Thread(target=self._work, args=(self._queue,), name='command', daemon=True).start()
+    
+    def _work(self, commands: 'queue.SimpleQueue'):
+        """Worker loop: run queued commands until shutdown or until abandoned"""
+        while True:
+            item = commands.get()
+            if item is None:
+                return
+            future, handler, kwargs = item
+            if not self._run(future, handler, kwargs):
+                return
+    
+    def _run(self, future: Future, handler: Callable, kwargs: Dict[str, Any]) -> bool:
+        """
+        Worker side of a command: skip it if it expired while queued
+        
+        Returns:
+            False if the command was abandoned while running (the worker was
+            replaced and must exit)
+        """
+        try:
+            # Under the lock, so a deadline that finds the command running also finds it here
+            with self._lock:
+                if not future.set_running_or_notify_cancel():
+                    return True
+                self._running.add(future)
+            try:
+                result = handler(**kwargs)
+            except BaseException as e:
+                self._settle(future.set_exception, e)
+            else:
+                self._settle(future.set_result, result)
+            
+            with self._lock:
+                self._running.discard(future)
+                if future in self._abandoned:
+                    self._abandoned.discard(future)
+                    return False
+            return True
+        finally:
+            self._slots.release()
+    
+    @staticmethod
+    def _settle(setter: Callable, value: Any):
+        """Complete a future unless its deadline already did"""
+        try:
+            setter(value)
+        except InvalidStateError:
+            pass
+    
+    def _expire(self, future: Future, timeout: float):
+        """Deadline reached: cancel a queued command, abandon a running one and replace its worker"""
+        if future.cancel():
+            return
+        with self._lock:
+            if future in self._running and not self._closed:
+                self._running.discard(future)
+                self._abandoned.add(future)
+                self._workers -= 1
+                self._start_worker()
+        self._settle(future.set_exception, CommandTimeout(f"Command did not finish within {timeout:g} seconds"))
+    
+    def _cancel_timer(self, future: Future):
+        """Stop a finished command's deadline timer"""
+        with self._lock:
+            timer = self._timers.pop(future, None)
+        if timer is not None:
+            timer.cancel()
+    
+    def shutdown(self, wait: bool = False):
+        """
+        Stop accepting commands and cancel those not yet started
+        
+        Args:
+            wait: Block until running handlers return (abandoned ones excepted)
+        """
+        with self._lock:
+            self._closed = True
+            futures = list(self._timers)
+            owned = self._pid == os.getpid()
+            workers, running = self._workers, set(self._running)
+            # One stop marker per worker, queued behind the cancelled commands
+            for _ in range(workers if owned else 0):
+                self._queue.put(None)
+        for future in futures:
+            future.cancel()
+        if wait and owned:
+            wait_for(running)
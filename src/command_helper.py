@@ -0,0 +1,272 @@
+"""
+Command Helper - Runs shell-backed system commands in persistent helper shells
+Starting a process per command (fork/exec plus interpreter start-up) is the
+main cost of most system queries. A helper is a long-lived shell fed one
+command line per request over a pipe; a random sentinel line marks the end of
+each command's output and carries its exit status. Backends are pluggable:
+persistent shells, a plain process per command, or canned results for tests
+"""
+
+import os
+import errno
+import queue
+import shlex
+import signal
+import selectors
+import tempfile
+import threading
+import subprocess
+import time
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+from config.settings import COMMAND_HELPER_BACKEND, COMMAND_HELPER_SHELL, COMMAND_HELPER_POOL_SIZE
+
+# Exit status a POSIX shell reports when it cannot find the program
+COMMAND_NOT_FOUND = 127
+
+
+def _completed(args: List[str], returncode: int, stdout: str, stderr: str, check: bool) -> subprocess.CompletedProcess:
+    """
+    Result of a command run through a shell, failing the way subprocess.run would
+    
+    Raises:
+        FileNotFoundError: if the shell could not find the program
+        subprocess.CalledProcessError: if check is set and the command failed
+    """
+    if returncode == COMMAND_NOT_FOUND:
+        raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), args[0])
+    if check and returncode != 0:
+        raise subprocess.CalledProcessError(returncode, args, stdout, stderr)
+    return subprocess.CompletedProcess(args, returncode, stdout, stderr)
+
+
+class ShellHelper:
+    """One persistent shell process running commands one at a time"""
+    
+    def __init__(self, shell: str = COMMAND_HELPER_SHELL):
+        """
+        Start the shell
+        
+        Args:
+            shell: Path of a POSIX shell
+        """
+        self.shell = shell
+        self.sentinel = f"__helper_done_{uuid.uuid4().hex}__"
+        
+        # Each command's stderr is redirected to this file and read back afterwards
+        fd, self.stderr_path = tempfile.mkstemp(prefix='command_helper_', suffix='.err')
+        os.close(fd)
+        
+        # Own session, so a timed-out command can be killed with its shell
+        self.process = subprocess.Popen(
+            [shell], stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            start_new_session=True
+        )
+        self._buffer = b''
+    
+    @property
+    def alive(self) -> bool:
+        return self.process.poll() is None
+    
+    def run(self, args: List[str], timeout: float, check: bool = False) -> subprocess.CompletedProcess:
+        """
+        Run one command in the shell
+        
+        Args:
+            args: Program and arguments (quoted for the shell here)
+            timeout: Seconds to wait for the command to finish
+            check: Raise CalledProcessError for a non-zero exit status
+        
+        Returns:
+            CompletedProcess with text stdout and stderr
+        
+        Raises:
+            FileNotFoundError: if the program does not exist (as subprocess.run)
+            subprocess.CalledProcessError: if check is set and the command failed
+            subprocess.TimeoutExpired: if the command did not finish in time
+                (the helper is killed and must be replaced)
+            OSError: if the shell exited
+        """
+        command = ' '.join(shlex.quote(arg) for arg in args)
+        script = (
+            f"{command} </dev/null 2>{shlex.quote(self.stderr_path)}; "
+            f"printf '\\n%s %d\\n' {self.sentinel} $?\n"
+        )
+        try:
+            self.process.stdin.write(script.encode('utf-8'))
+            self.process.stdin.flush()
+        except (BrokenPipeError, ValueError) as e:
+            raise OSError(f"Command helper exited: {e}")
+        
+        stdout, returncode = self._read_result(args, timeout)
+        with open(self.stderr_path, 'r', encoding='utf-8', errors='replace') as f:
+            stderr = f.read()
+        return _completed(args, returncode, stdout, stderr, check)
+    
+    def _read_result(self, args: List[str], timeout: float) -> Tuple[str, int]:
+        """Read output up to the sentinel line: (stdout, exit status)"""
+        marker = f"\n{self.sentinel} ".encode('utf-8')
+        fd = self.process.stdout.fileno()
+        deadline = time.monotonic() + timeout
+        
+        with selectors.DefaultSelector() as selector:
+            selector.register(fd, selectors.EVENT_READ)
+            while True:
+                start = self._buffer.find(marker)
+                if start >= 0:
+                    end = self._buffer.find(b'\n', start + len(marker))
+                    if end >= 0:
+                        stdout = self._buffer[:start].decode('utf-8', errors='replace')
+                        returncode = int(self._buffer[start + len(marker):end])
+                        self._buffer = self._buffer[end + 1:]
+                        return stdout, returncode
+                
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not selector.select(remaining):
+                    self.close()
+                    raise subprocess.TimeoutExpired(args, timeout)
+                
+                chunk = os.read(fd, 65536)
+                if not chunk:
+                    self.close()
+                    raise OSError("Command helper exited")
+                self._buffer += chunk
+    
+    def close(self):
+        """Kill the shell and anything it is running"""
+        if self.alive:
+            try:
+                os.killpg(self.process.pid, signal.SIGKILL)
+            except (ProcessLookupError, PermissionError):
+                pass
+        self.process.wait()
+        for stream in (self.process.stdin, self.process.stdout):
+            try:
+                stream.close()
+            except OSError:
+                pass
+        if os.path.exists(self.stderr_path):
+            os.unlink(self.stderr_path)
+
+
+class ShellBackend:
+    """Pool of persistent helper shells, started on demand"""
+    
+    def __init__(self, size: int = COMMAND_HELPER_POOL_SIZE, shell: str = COMMAND_HELPER_SHELL):
+        """
+        Initialize the pool (no shell starts until the first command)
+        
+        Args:
+            size: Most helpers running at once; commands beyond that wait for one
+            shell: Path of a POSIX shell
+        """
+        self.size = size
+        self.shell = shell
+        self._lock = threading.Lock()
+        self._reset()
+    
+    def _reset(self):
+        """Forget the helpers (after a fork they belong to the parent)"""
+        self._pid = os.getpid()
+        self._idle: 'queue.LifoQueue[ShellHelper]' = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._helpers: List[ShellHelper] = []
+    
+    def run(self, args: List[str], timeout: float, check: bool = False) -> subprocess.CompletedProcess:
+        """Run a command on an idle helper, starting one if the pool has room (see ShellHelper.run)"""
+        with self._lock:
+            if self._pid != os.getpid():
+                self._reset()
+            idle, slots = self._idle, self._slots
+        
+        slots.acquire()
+        try:
+            try:
+                helper = idle.get_nowait()
+            except queue.Empty:
+                helper = self._start()
+            
+            try:
+                return helper.run(args, timeout, check)
+            finally:
+                if helper.alive:
+                    idle.put(helper)
+                else:
+                    self._discard(helper)
+        finally:
+            slots.release()
+    
+    def _start(self) -> ShellHelper:
+        helper = ShellHelper(self.shell)
+        with self._lock:
+            self._helpers.append(helper)
+        return helper
+    
+    def _discard(self, helper: ShellHelper):
+        helper.close()
+        with self._lock:
+            if helper in self._helpers:
+                self._helpers.remove(helper)
+    
+    def close(self):
+        """Stop every helper started by this process"""
+        with self._lock:
+            helpers = self._helpers if self._pid == os.getpid() else []
+            self._helpers = []
+        for helper in helpers:
+            helper.close()
+
+
+class SubprocessBackend:
+    """A new process per command (no helpers)"""
+    
+    def run(self, args: List[str], timeout: float, check: bool = False) -> subprocess.CompletedProcess:
+        return subprocess.run(args, capture_output=True, text=True, timeout=timeout, check=check)
+    
+    def close(self):
+        pass
+
+
+class StubBackend:
+    """Canned results by program name, for tests; records every command"""
+    
+    def __init__(self, results: Optional[Dict[str, Tuple[int, str]]] = None):
+        """
+        Args:
+            results: Program name -> (exit status, stdout); others succeed silently.
+                Status 127 stands for a missing program, as in a shell
+        """
+        self.results = results or {}
+        self.calls: List[List[str]] = []
+    
+    def run(self, args: List[str], timeout: float, check: bool = False) -> subprocess.CompletedProcess:
+        self.calls.append(list(args))
+        returncode, stdout = self.results.get(args[0], (0, ''))
+        return _completed(args, returncode, stdout, '', check)
+    
+    def close(self):
+        pass
+
+
+def create_backend(name: str = COMMAND_HELPER_BACKEND):
+    """
+    Build a command backend by name
+    
+    Args:
+        name: "shell" (persistent helper shells), "subprocess" (a process per
+            command) or "stub" (canned results)
+    
+    Raises:
+        ValueError: for an unknown name
+    """
+    if name == 'shell':
+        if not os.path.exists(COMMAND_HELPER_SHELL):
+            print(f"Warning: {COMMAND_HELPER_SHELL} not found, starting a process per command")
+            return SubprocessBackend()
+        return ShellBackend()
+    if name == 'subprocess':
+        return SubprocessBackend()
+    if name == 'stub':
+        return StubBackend()
+    raise ValueError(f"Unknown command helper backend '{name}'")
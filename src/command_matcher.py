@@ -0,0 +1,133 @@
+"""
+Command Matcher - First-match-wins search over many regex patterns
+Extracts from every pattern the literal strings one of which any match must
+contain, finds the literals present in the input with one Aho-Corasick scan,
+and runs only the patterns that can possibly match, in priority order
+"""
+
+import re
+from typing import Dict, List, Match, Optional, Set, Tuple
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:
+    import sre_parse
+
+from src.aho_corasick import AhoCorasick
+
+_REPEATS = {sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT}
+if hasattr(sre_parse, 'POSSESSIVE_REPEAT'):
+    _REPEATS.add(sre_parse.POSSESSIVE_REPEAT)
+
+
+def required_literals(pattern: str, flags: int = 0) -> Optional[Set[str]]:
+    """
+    Literal strings one of which every match of the pattern contains
+    
+    Args:
+        pattern: Regular expression
+        flags: re flags the pattern is compiled with
+    
+    Returns:
+        Set of literals (lowercased under re.IGNORECASE), or None when the
+        pattern has no required literal and must always be tried
+    """
+    literals = _sequence_literals(sre_parse.parse(pattern, flags))
+    if literals and flags & re.IGNORECASE:
+        literals = {literal.lower() for literal in literals}
+    return literals
+
+
+def _sequence_literals(sequence) -> Optional[Set[str]]:
+    """Pick the most selective required literal set among a sequence's items"""
+    options = []
+    run = []
+    for op, av in sequence:
+        if op is sre_parse.LITERAL:
+            run.append(chr(av))
+            continue
+        if run:
+            options.append({''.join(run)})
+            run = []
+        option = _item_literals(op, av)
+        if option:
+            options.append(option)
+    if run:
+        options.append({''.join(run)})
+    
+    # The longest shortest literal rules out the most inputs
+    return max(options, key=lambda option: min(len(literal) for literal in option), default=None)
+
+
+def _item_literals(op, av) -> Optional[Set[str]]:
+    """Required literal set of one non-literal item, if it has one"""
+    if op is sre_parse.SUBPATTERN:
+        return _sequence_literals(av[-1])
+    if op is getattr(sre_parse, 'ATOMIC_GROUP', None):
+        return _sequence_literals(av)
+    if op is sre_parse.BRANCH:
+        # Any one branch may match, so each must contribute a literal
+        union = set()
+        for branch in av[1]:
+            literals = _sequence_literals(branch)
+            if not literals:
+                return None
+            union |= literals
+        return union
+    if op in _REPEATS and av[0] >= 1:
+        return _sequence_literals(av[2])
+    return None
+
+
+class CommandMatcher:
+    """Finds the first pattern, in priority order, that matches anywhere in a text"""
+    
+    def __init__(self, patterns: List[str], flags: int = re.IGNORECASE):
+        """
+        Compile the patterns and index their required literals
+        
+        Args:
+            patterns: Regular expressions in priority order
+            flags: re flags for every pattern
+        """
+        self.flags = flags
+        self.regexes = [re.compile(pattern, flags) for pattern in patterns]
+        
+        # Patterns without a required literal are tried on every input
+        self.unfiltered: List[int] = []
+        self.literal_patterns: Dict[str, List[int]] = {}
+        for pattern_id, pattern in enumerate(patterns):
+            literals = required_literals(pattern, flags)
+            if literals is None:
+                self.unfiltered.append(pattern_id)
+                continue
+            for literal in literals:
+                self.literal_patterns.setdefault(literal, []).append(pattern_id)
+        
+        self.automaton = AhoCorasick(self.literal_patterns)
+    
+    def candidates(self, text: str) -> List[int]:
+        """Ids of the patterns that can match the text, in priority order"""
+        if self.flags & re.IGNORECASE:
+            text = text.lower()
+        
+        pattern_ids = set(self.unfiltered)
+        for literal in self.automaton.find_all(text):
+            pattern_ids.update(self.literal_patterns[literal])
+        return sorted(pattern_ids)
+    
+    def match(self, text: str) -> Optional[Tuple[int, Match]]:
+        """
+        Search the text with each candidate pattern until one matches
+        
+        Args:
+            text: Text to search
+        
+        Returns:
+            Tuple of (pattern id, match object), or None if no pattern matches
+        """
+        for pattern_id in self.candidates(text):
+            match = self.regexes[pattern_id].search(text)
+            if match:
+                return pattern_id, match
+        return None
@@ -0,0 +1,222 @@
+"""
+Command Registry - Declarative command specs with lazily imported handlers
+Commands are declared in JSON (patterns, parameter extractor, handler path,
+response template). Loading the registry only reads the spec; a handler's
+module is imported, and its class instantiated, the first time it runs.
+"""
+
+import json
+import heapq
+import string
+import importlib
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from src.param_extractors import BUILTIN_EXTRACTORS, extractor_path
+
+
+class HandlerResolver:
+    """Resolves "module:function" and "module:Class.method" handler paths on first use"""
+    
+    def __init__(self):
+        """Initialize empty caches"""
+        self._handlers: Dict[str, Callable] = {}
+        self._instances: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+    
+    def resolve(self, handler_path: str) -> Callable:
+        """
+        Import and bind a handler
+        
+        Args:
+            handler_path: "package.module:function" or "package.module:Class.method";
+                one instance per class is shared by all of its methods
+        
+        Returns:
+            The callable handler
+        
+        Raises:
+            ImportError, AttributeError, ValueError: if the path cannot be resolved
+        """
+        handler = self._handlers.get(handler_path)
+        if handler is not None:
+            return handler
+        
+        with self._lock:
+            if handler_path in self._handlers:
+                return self._handlers[handler_path]
+            
+            module_name, _, attribute_path = handler_path.partition(':')
+            if not module_name or not attribute_path:
+                raise ValueError(f"Invalid handler path '{handler_path}' (expected module:attribute)")
+            
+            owner_path, _, function_name = attribute_path.rpartition('.')
+            if owner_path:
+                owner = self.instance(f"{module_name}:{owner_path}")
+            else:
+                owner = importlib.import_module(module_name)
+            
+            handler = getattr(owner, function_name)
+            self._handlers[handler_path] = handler
+            return handler
+    
+    def instance(self, class_path: str) -> Any:
+        """
+        Shared instance of a handler class, created on first use
+        
+        Args:
+            class_path: "package.module:Class"
+        """
+        with self._lock:
+            if class_path not in self._instances:
+                module_name, _, class_name = class_path.partition(':')
+                handler_class = getattr(importlib.import_module(module_name), class_name)
+                self._instances[class_path] = handler_class()
+            return self._instances[class_path]
+
+
+class _TemplateValues(dict):
+    """Result fields for str.format_map: spec defaults first, then None"""
+    
+    def __init__(self, result: dict, defaults: dict):
+        super().__init__(result)
+        self.defaults = defaults
+    
+    def __missing__(self, key: str) -> Any:
+        return self.defaults.get(key)
+
+
+def load_command_specs(path) -> Dict[str, Dict[str, Any]]:
+    """
+    Load command specs in priority order (the order of the JSON object)
+    
+    Args:
+        path: Path to the commands JSON file
+    
+    Returns:
+        Command name -> spec, or {} if the file is missing or invalid
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            specs = json.load(f)
+    except FileNotFoundError:
+        print(f"Warning: Command spec file not found at {path}")
+        return {}
+    except json.JSONDecodeError as e:
+        print(f"Error: Invalid JSON in {path}: {e}")
+        return {}
+    
+    for cmd_name, spec in specs.items():
+        missing = [key for key in ('patterns', 'handler') if key not in spec]
+        if missing:
+            raise ValueError(f"Command '{cmd_name}' in {Path(path)} is missing {', '.join(missing)}")
+        spec.setdefault('description', cmd_name.replace('_', ' ').capitalize())
+        unknown = [name for name in spec.get('before', []) if name not in specs]
+        if unknown:
+            raise ValueError(f"Command '{cmd_name}' in {Path(path)} must come before unknown {', '.join(unknown)}")
+        extractor = spec.get('extract_param')
+        if extractor is not None and ':' not in extractor_path(extractor):
+            raise ValueError(f"Command '{cmd_name}' in {Path(path)} has unknown extract_param '{extractor}' "
+                             f"(expected {', '.join(BUILTIN_EXTRACTORS)} or module:function)")
+        if 'response' in spec:
+            # Fail at startup, not on first use, if a template is malformed
+            list(string.Formatter().parse(spec['response']))
+    
+    return specs
+
+
+def order_commands(specs: Dict[str, Dict[str, Any]], hits: Optional[Dict[str, int]] = None) -> List[str]:
+    """
+    Order in which command patterns are tried
+    
+    Commands are tried most-hit first, except that a command always comes
+    before the ones its spec lists under "before" (e.g. unmute before mute,
+    whose pattern also matches "unmute"), and "fallback" commands, whose
+    patterns catch broad phrasings, come after all others in spec order.
+    Remaining ties keep spec order.
+    
+    Args:
+        specs: Command specs in spec order
+        hits: Command name -> hit count (see HitStats)
+    
+    Returns:
+        Command names in evaluation order
+    
+    Raises:
+        ValueError: if the "before" constraints form a cycle
+    """
+    hits = hits or {}
+    position = {cmd_name: index for index, cmd_name in enumerate(specs)}
+    
+    def key(cmd_name: str):
+        if specs[cmd_name].get('fallback'):
+            return 1, 0, position[cmd_name]
+        return 0, -hits.get(cmd_name, 0), position[cmd_name]
+    
+    blockers = {cmd_name: 0 for cmd_name in specs}
+    for spec in specs.values():
+        for later in spec.get('before', []):
+            blockers[later] += 1
+    
+    # Topological sort that always takes the best-ranked unblocked command
+    ready = [(key(cmd_name), cmd_name) for cmd_name, count in blockers.items() if not count]
+    heapq.heapify(ready)
+    order = []
+    while ready:
+        _, cmd_name = heapq.heappop(ready)
+        order.append(cmd_name)
+        for later in specs[cmd_name].get('before', []):
+            blockers[later] -= 1
+            if not blockers[later]:
+                heapq.heappush(ready, (key(later), later))
+    
+    if len(order) < len(specs):
+        cycle = sorted(cmd_name for cmd_name, count in blockers.items() if count)
+        raise ValueError(f"Command ordering constraints form a cycle among {', '.join(cycle)}")
+    return order
+
+
+def render_response(spec: Dict[str, Any], result: Any) -> str:
+    """
+    Turn a handler result into a natural language response
+    
+    Dict results fill the spec's "response" template, with missing fields
+    taken from its "defaults" (or None). Errors and template-less commands
+    fall back to the handler's message or the result itself. Cached results
+    at least a minute old (see "cache_age") say how old they are.
+    
+    Args:
+        spec: Command spec
+        result: Handler return value
+    
+    Returns:
+        Response text
+    """
+    if not isinstance(result, dict):
+        return str(result)
+    
+    if 'error' in result:
+        return f"Error: {result['error']}"
+    
+    template: Optional[str] = spec.get('response')
+    if template:
+        return _with_age(template.format_map(_TemplateValues(result, spec.get('defaults', {}))), result)
+    
+    if result.get('status') == 'success':
+        return _with_age(result.get('message', 'Command executed successfully'), result)
+    
+    return str(result)
+
+
+def _with_age(response: str, result: dict) -> str:
+    """Append how old a cached result is, once that is a minute or more"""
+    age = result.get('cache_age')
+    if age is None or age < 60:
+        return response
+    
+    minutes = int(age // 60)
+    if minutes < 60:
+        return f"{response} (as of {minutes} minute{'s' if minutes != 1 else ''} ago)"
+    hours = minutes // 60
+    return f"{response} (as of {hours} hour{'s' if hours != 1 else ''} ago)"
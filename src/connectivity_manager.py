@@ -10,6 +10,15 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config.settings import DEBUG
 
+# Phrases that mark a general question (needs internet or the knowledge base)
+GENERAL_QUESTION_KEYWORDS = (
+    "weather", "news", "stock", "convert", "translate",
+    "how does", "why", "explain", "tell me about",
+    "what is", "who is", "define", "search", "google",
+    "calculate", "math", "currency", "bitcoin", "crypto",
+    "covid", "disease", "medical", "recipe", "how to make"
+)
+
 
 class ConnectivityManager:
     """Manages online/offline mode and provides smart responses"""
@@ -59,16 +68,8 @@ class ConnectivityManager:
         Returns:
             True if it's a general question, False if system-specific
         """
-        general_keywords = [
-            "weather", "news", "stock", "convert", "translate",
-            "how does", "why", "explain", "tell me about",
-            "what is", "who is", "define", "search", "google",
-            "calculate", "math", "currency", "bitcoin", "crypto",
-            "covid", "disease", "medical", "recipe", "how to make"
-        ]
-        
         user_lower = user_input.lower()
-        return any(keyword in user_lower for keyword in general_keywords)
+        return any(keyword in user_lower for keyword in GENERAL_QUESTION_KEYWORDS)
     
     def is_system_command(self, user_input: str) -> bool:
         """
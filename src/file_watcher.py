@@ -0,0 +1,174 @@
+"""
+File Watcher - Detects edits to a file and notifies a callback
+Uses inotify on Linux (via ctypes, no extra dependency) and falls back to
+polling the file's stat signature everywhere else
+"""
+
+import os
+import sys
+import time
+import select
+import struct
+import ctypes
+import ctypes.util
+import threading
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+
+# inotify event masks (see inotify(7))
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+EVENT_HEADER = struct.Struct('iIII')
+
+
+def _load_inotify():
+    """Return libc if it provides inotify, otherwise None"""
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        libc.inotify_init1
+        libc.inotify_add_watch
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class FileWatcher:
+    """Watches a single file and calls back (debounced) when it changes"""
+    
+    def __init__(self, path: str, callback: Callable[[], None],
+                 poll_interval: float = 1.0, debounce: float = 0.2):
+        """
+        Initialize the watcher
+        
+        Args:
+            path: File to watch (its directory is watched so atomic renames are seen)
+            callback: Called from the watcher thread after the file changes
+            poll_interval: Seconds between stat checks in polling mode
+            debounce: Quiet period to wait after an event before calling back
+        """
+        self.path = Path(path).resolve()
+        self.callback = callback
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        
+        self.mode = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._signature = self._stat_signature()
+    
+    def start(self):
+        """Start watching in a background thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        
+        self._stop.clear()
+        inotify_fd = self._open_inotify()
+        if inotify_fd is not None:
+            self.mode = "inotify"
+            target, args = self._inotify_loop, (inotify_fd,)
+        else:
+            self.mode = "polling"
+            target, args = self._poll_loop, ()
+        
+        self._thread = threading.Thread(target=target, args=args, daemon=True, name="file-watcher")
+        self._thread.start()
+    
+    def stop(self):
+        """Stop watching"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+            self._thread = None
+    
+    def _stat_signature(self) -> Optional[Tuple[int, int, int]]:
+        """Identify the file's current version (None if missing)"""
+        try:
+            stat = self.path.stat()
+            return stat.st_mtime_ns, stat.st_size, stat.st_ino
+        except OSError:
+            return None
+    
+    def _notify_if_changed(self):
+        """Call back once per distinct file version"""
+        signature = self._stat_signature()
+        if signature is None or signature == self._signature:
+            return
+        
+        self._signature = signature
+        try:
+            self.callback()
+        except Exception as e:
+            print(f"Error: File watcher callback failed: {e}")
+    
+    def _open_inotify(self) -> Optional[int]:
+        """Create an inotify watch on the file's directory, or None if unavailable"""
+        libc = _load_inotify()
+        if libc is None:
+            return None
+        
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            return None
+        
+        directory = str(self.path.parent).encode()
+        if libc.inotify_add_watch(fd, directory, WATCH_MASK) < 0:
+            os.close(fd)
+            return None
+        
+        return fd
+    
+    def _inotify_loop(self, fd: int):
+        """Wait for directory events that name the watched file"""
+        name = self.path.name.encode()
+        try:
+            while not self._stop.is_set():
+                if not self._wait_for_event(fd, name, timeout=0.5):
+                    continue
+                
+                # Let bursts of writes settle before reloading
+                while self._wait_for_event(fd, name, timeout=self.debounce):
+                    pass
+                self._notify_if_changed()
+        finally:
+            os.close(fd)
+    
+    def _wait_for_event(self, fd: int, name: bytes, timeout: float) -> bool:
+        """Drain pending events; True if any concerned the watched file"""
+        readable, _, _ = select.select([fd], [], [], timeout)
+        if not readable:
+            return False
+        
+        relevant = False
+        while True:
+            try:
+                data = os.read(fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+            
+            offset = 0
+            while offset + EVENT_HEADER.size <= len(data):
+                _, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                event_name = data[offset:offset + length].rstrip(b'\0')
+                offset += length
+                if event_name == name or mask & IN_Q_OVERFLOW:
+                    relevant = True
+        
+        return relevant
+    
+    def _poll_loop(self):
+        """Compare the stat signature every poll interval"""
+        while not self._stop.wait(self.poll_interval):
+            if self._stat_signature() != self._signature:
+                time.sleep(self.debounce)
+                self._notify_if_changed()
@@ -0,0 +1,141 @@
+"""
+Hit Statistics - Persisted counts of which commands and categories match
+Counts are kept in memory, merged into a small JSON file every few hits and
+at exit, and read back at startup to order command patterns by traffic
+"""
+
+import os
+import sys
+import json
+import atexit
+import argparse
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import HIT_STATS_PATH, HIT_STATS_FLUSH_EVERY
+
+COMMANDS = 'commands'
+CATEGORIES = 'categories'
+
+
+class HitStats:
+    """Match counters per kind ("commands", "categories"), persisted as JSON"""
+    
+    def __init__(self, path: str = HIT_STATS_PATH, flush_every: int = HIT_STATS_FLUSH_EVERY):
+        """
+        Load the saved counts
+        
+        Args:
+            path: JSON file holding the counts ("~" is expanded)
+            flush_every: Save after this many new hits (and always at exit)
+        """
+        self.path = Path(path).expanduser()
+        self.flush_every = flush_every
+        self._lock = threading.Lock()
+        self.counts: Dict[str, Dict[str, int]] = self._read()
+        
+        # Hits not yet written; merged into whatever the file holds at save time
+        # so processes sharing the file (pre-fork workers) add up their counts
+        self._unsaved: Dict[str, Dict[str, int]] = {}
+        self._unsaved_total = 0
+        atexit.register(self.save)
+    
+    def _read(self) -> Dict[str, Dict[str, int]]:
+        """Counts from the file, or empty if it is missing or unreadable"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"Warning: Ignoring unreadable hit statistics at {self.path}: {e}")
+            return {}
+    
+    def hits(self, kind: str) -> Dict[str, int]:
+        """Name -> hit count for one kind"""
+        with self._lock:
+            return dict(self.counts.get(kind, {}))
+    
+    def record(self, kind: str, name: str):
+        """
+        Count one match
+        
+        Args:
+            kind: COMMANDS or CATEGORIES
+            name: Command or category name
+        """
+        with self._lock:
+            counts = self.counts.setdefault(kind, {})
+            counts[name] = counts.get(name, 0) + 1
+            unsaved = self._unsaved.setdefault(kind, {})
+            unsaved[name] = unsaved.get(name, 0) + 1
+            self._unsaved_total += 1
+            due = self._unsaved_total >= self.flush_every
+        
+        if due:
+            self.save()
+    
+    def save(self):
+        """Merge the unsaved hits into the file (counts are approximate under concurrent writers)"""
+        with self._lock:
+            if not self._unsaved_total:
+                return
+            unsaved, self._unsaved, self._unsaved_total = self._unsaved, {}, 0
+            
+            saved = self._read()
+            for kind, counts in unsaved.items():
+                merged = saved.setdefault(kind, {})
+                for name, count in counts.items():
+                    merged[name] = merged.get(name, 0) + count
+            self.counts = saved
+            
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=str(self.path.parent), prefix=self.path.name, suffix='.tmp')
+                try:
+                    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                        json.dump(saved, f, indent=2, sort_keys=True)
+                    os.replace(tmp_path, self.path)
+                except BaseException:
+                    if os.path.exists(tmp_path):
+                        os.unlink(tmp_path)
+                    raise
+            except OSError as e:
+                print(f"Warning: Could not save hit statistics to {self.path}: {e}")
+
+
+_shared: Dict[str, HitStats] = {}
+_shared_lock = threading.Lock()
+
+
+def open_hit_stats(path: Optional[str] = HIT_STATS_PATH) -> Optional[HitStats]:
+    """Shared HitStats for a path (one per process), or None if statistics are disabled"""
+    if not path:
+        return None
+    with _shared_lock:
+        if path not in _shared:
+            _shared[path] = HitStats(path)
+        return _shared[path]
+
+
+def main(argv: Optional[list] = None):
+    """Print the most frequent commands and categories"""
+    parser = argparse.ArgumentParser(description="Show persisted match statistics")
+    parser.add_argument('--path', default=HIT_STATS_PATH, help="Statistics file")
+    parser.add_argument('--top', type=int, default=10, help="Entries per kind")
+    args = parser.parse_args(argv)
+    
+    stats = HitStats(args.path)
+    for kind in (COMMANDS, CATEGORIES):
+        ranked = sorted(stats.hits(kind).items(), key=lambda item: -item[1])[:args.top]
+        print(f"{kind}:")
+        for name, count in ranked:
+            print(f"  {count:8d}  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+"""
+HTTP Client - Pooled keep-alive HTTP(S) with a DNS cache and concurrent fetches
+Location and weather lookups are small JSON GETs whose latency is mostly DNS,
+TCP and TLS setup. Connections are kept open per host and reused, resolved
+addresses are cached, and independent requests run side by side (with thread
+and async/await entry points)
+"""
+
+import os
+import json
+import time
+import socket
+import asyncio
+import threading
+import http.client
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+from config.settings import HTTP_TIMEOUT, HTTP_POOL_SIZE, HTTP_IDLE_TIMEOUT, HTTP_DNS_TTL, HTTP_WORKERS
+
+USER_AGENT = "VoiceBot/1.0"
+
+# Errors that mean a reused keep-alive connection was closed by the server
+_STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, http.client.BadStatusLine,
+                            ConnectionResetError, BrokenPipeError)
+
+
+class HTTPError(OSError):
+    """Non-2xx response"""
+    
+    def __init__(self, url: str, status: int, reason: str):
+        super().__init__(f"HTTP {status} {reason} from {url}")
+        self.url = url
+        self.status = status
+
+
+class DNSCache:
+    """Resolved addresses per host, reused for a fixed time"""
+    
+    def __init__(self, ttl: float = HTTP_DNS_TTL):
+        self.ttl = ttl
+        self._addresses: Dict[Tuple[str, int], Tuple[List[Tuple[int, tuple]], float]] = {}
+        self._lock = threading.Lock()
+    
+    def resolve(self, host: str, port: int) -> List[Tuple[int, tuple]]:
+        """
+        Every address for host, in resolver order (cached)
+        
+        Returns:
+            (family, sockaddr) pairs
+        
+        Raises:
+            socket.gaierror: if the host does not resolve
+        """
+        key = (host, port)
+        now = time.monotonic()
+        with self._lock:
+            cached = self._addresses.get(key)
+            if cached and now - cached[1] < self.ttl:
+                return cached[0]
+        
+        addresses = [(family, sockaddr) for family, _, _, _, sockaddr
+                     in socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)]
+        with self._lock:
+            self._addresses[key] = (addresses, now)
+        return addresses
+    
+    def connect(self, host: str, port: int, timeout: Optional[float],
+                source_address: Optional[Tuple[str, int]] = None) -> socket.socket:
+        """
+        Connect to the first reachable address of host, like socket.create_connection
+        
+        Raises:
+            OSError: from the last address tried, if none accepted (the host's
+                addresses are then forgotten so the next attempt re-resolves)
+        """
+        error: Optional[OSError] = None
+        for family, sockaddr in self.resolve(host, port):
+            sock = socket.socket(family, socket.SOCK_STREAM)
+            try:
+                # http.client passes a sentinel object when no timeout was given
+                if isinstance(timeout, (int, float)):
+                    sock.settimeout(timeout)
+                if source_address:
+                    sock.bind(source_address)
+                sock.connect(sockaddr)
+                return sock
+            except OSError as e:
+                sock.close()
+                error = e
+        
+        self.forget(host, port)
+        raise error or OSError(f"No addresses for {host}")
+    
+    def forget(self, host: str, port: int):
+        """Drop a host's address (e.g. after it refused a connection)"""
+        with self._lock:
+            self._addresses.pop((host, port), None)
+
+
+class HTTPClient:
+    """Thread-safe pooled HTTP client for small JSON requests"""
+    
+    def __init__(self, timeout: float = HTTP_TIMEOUT, pool_size: int = HTTP_POOL_SIZE,
+                 idle_timeout: float = HTTP_IDLE_TIMEOUT, dns_ttl: float = HTTP_DNS_TTL,
+                 workers: int = HTTP_WORKERS):
+        """
+        Initialize the client (no connection opens until the first request)
+        
+        Args:
+            timeout: Seconds per request
+            pool_size: Idle connections kept per host
+            idle_timeout: Seconds an idle connection may be reused
+            dns_ttl: Seconds a resolved address is reused
+            workers: Threads running concurrent fetches
+        """
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.idle_timeout = idle_timeout
+        self.dns = DNSCache(dns_ttl)
+        self.workers = workers
+        self._lock = threading.Lock()
+        self._reset()
+    
+    def _reset(self):
+        """Start with no connections or threads (after a fork they belong to the parent)"""
+        self._pid = os.getpid()
+        self._idle: Dict[Tuple[str, str, int], List[Tuple[http.client.HTTPConnection, float]]] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+    
+    @staticmethod
+    def _origin(url: str) -> Tuple[Tuple[str, str, int], str]:
+        """((scheme, host, port), path with query) for a URL"""
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise ValueError(f"Unsupported URL '{url}'")
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        path = parts.path or '/'
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        return (parts.scheme, parts.hostname, port), path
+    
+    def _connect(self, origin: Tuple[str, str, int]) -> http.client.HTTPConnection:
+        """New connection to an origin, dialled through the DNS cache"""
+        scheme, host, port = origin
+        connection_class = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+        connection = connection_class(host, port, timeout=self.timeout)
+        
+        # The connection still sends Host and (for TLS) the server name for the host itself
+        def create_connection(address, timeout, source_address=None):
+            return self.dns.connect(host, port, timeout, source_address)
+        
+        connection._create_connection = create_connection
+        return connection
+    
+    def _checkout(self, origin: Tuple[str, str, int]) -> Tuple[http.client.HTTPConnection, bool]:
+        """An idle connection to the origin, or a new one; the flag says whether it was reused"""
+        with self._lock:
+            if self._pid != os.getpid():
+                self._reset()
+            idle = self._idle.get(origin, [])
+            now = time.monotonic()
+            while idle:
+                connection, idle_since = idle.pop()
+                if now - idle_since < self.idle_timeout:
+                    return connection, True
+                connection.close()
+        return self._connect(origin), False
+    
+    def _checkin(self, origin: Tuple[str, str, int], connection: http.client.HTTPConnection):
+        """Return a connection to the pool, or close it if the pool is full"""
+        with self._lock:
+            idle = self._idle.setdefault(origin, [])
+            if self._pid == os.getpid() and len(idle) < self.pool_size:
+                idle.append((connection, time.monotonic()))
+                return
+        connection.close()
+    
+    def request(self, url: str, params: Optional[Dict[str, Any]] = None) -> bytes:
+        """
+        GET a URL over a pooled connection
+        
+        Args:
+            url: http or https URL
+            params: Query parameters appended to the URL
+        
+        Returns:
+            Response body
+        
+        Raises:
+            HTTPError: for a non-2xx status
+            OSError, http.client.HTTPException: if the request fails
+        """
+        if params:
+            url = f"{url}{'&' if '?' in url else '?'}{urlencode(params)}"
+        origin, path = self._origin(url)
+        headers = {'User-Agent': USER_AGENT, 'Accept': 'application/json', 'Connection': 'keep-alive'}
+        
+        while True:
+            connection, reused = self._checkout(origin)
+            try:
+                connection.request('GET', path, headers=headers)
+                response = connection.getresponse()
+                body = response.read()
+            except _STALE_CONNECTION_ERRORS:
+                connection.close()
+                # The server dropped an idle connection; retry on another (or a new) one
+                if reused:
+                    continue
+                raise
+            except BaseException:
+                connection.close()
+                raise
+            
+            if response.will_close:
+                connection.close()
+            else:
+                self._checkin(origin, connection)
+            
+            if not 200 <= response.status < 300:
+                raise HTTPError(url, response.status, response.reason)
+            return body
+    
+    def get_json(self, url: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """GET a URL and decode its JSON body (see request)"""
+        return json.loads(self.request(url, params).decode('utf-8'))
+    
+    def preconnect(self, url: str):
+        """Open a pooled connection to a URL's host ahead of a request (errors are ignored)"""
+        origin, _ = self._origin(url)
+        with self._lock:
+            if self._pid == os.getpid() and self._idle.get(origin):
+                return
+        connection = self._connect(origin)
+        try:
+            connection.connect()
+        except OSError:
+            connection.close()
+            return
+        self._checkin(origin, connection)
+    
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Threads for concurrent fetches (started on first use)"""
+        with self._lock:
+            if self._pid != os.getpid():
+                self._reset()
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='http')
+            return self._executor
+    
+    def submit(self, url: str, params: Optional[Dict[str, Any]] = None) -> Future:
+        """Start get_json in the background"""
+        return self.executor.submit(self.get_json, url, params)
+    
+    def fetch_many(self, requests: List[Tuple[str, Optional[Dict[str, Any]]]]) -> List[Any]:
+        """
+        Fetch several JSON documents concurrently
+        
+        Args:
+            requests: (url, params) pairs
+        
+        Returns:
+            Decoded body or the raised exception, per request in order
+        """
+        futures = [self.submit(url, params) for url, params in requests]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(e)
+        return results
+    
+    async def get_json_async(self, url: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """get_json for async callers (runs on the client's threads)"""
+        return await asyncio.wrap_future(self.submit(url, params))
+    
+    async def fetch_many_async(self, requests: List[Tuple[str, Optional[Dict[str, Any]]]]) -> List[Any]:
+        """fetch_many for async callers"""
+        return await asyncio.gather(*(self.get_json_async(url, params) for url, params in requests),
+                                    return_exceptions=True)
+    
+    def close(self):
+        """Close idle connections and stop the fetch threads"""
+        with self._lock:
+            idle, executor = self._idle, self._executor
+            owned = self._pid == os.getpid()
+            self._reset()
+        if not owned:
+            return
+        for connections in idle.values():
+            for connection, _ in connections:
+                connection.close()
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+_shared: Optional[HTTPClient] = None
+_shared_lock = threading.Lock()
+
+
+def shared_client() -> HTTPClient:
+    """Process-wide HTTPClient, so every caller shares one connection pool"""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = HTTPClient()
+        return _shared
@@ -0,0 +1,158 @@
+"""
+Intent Router - Resolves one utterance across every intent source at once
+Normalizes the input once, finds the special, exit and general-question
+phrases it contains with one Aho-Corasick scan, consults the command
+interpreter, knowledge base and response engine only as far as needed, and
+returns one ranked decision that records where it came from
+"""
+
+from collections import namedtuple
+from typing import Dict, List, Optional, Tuple
+
+from src.aho_corasick import AhoCorasick
+from src.advanced_command_interpreter import AdvancedCommandInterpreter
+from src.connectivity_manager import GENERAL_QUESTION_KEYWORDS
+from src.knowledge_base import KnowledgeBase
+from src.response_engine import ResponseEngine
+from src.text_normalizer import normalize_text, split_clauses
+
+# Phrases that bring up a terminal panel alongside the spoken response
+SPECIAL_PHRASES = {
+    'system_info': ("system info", "system details", "computer info"),
+    'time': ("what time", "tell me time", "current time"),
+    'date': ("what date", "what is today", "tell me date"),
+    'help': ("help", "what can you do", "capabilities"),
+}
+
+EXIT_PHRASES = ("goodbye", "bye", "exit", "quit")
+
+# One source's claim on an utterance
+Candidate = namedtuple('Candidate', ['source', 'intent', 'confidence'])
+
+# The routing result: the winning candidate's fields, what to act on
+# (the parsed intents for a command, the response text otherwise), the
+# panel to show, whether the session ends, and every candidate considered
+RouteDecision = namedtuple('RouteDecision', [
+    'source', 'intent', 'confidence', 'detail', 'panel', 'exit', 'candidates'
+])
+
+
+class IntentRouter:
+    """Ranks command, exit, special, knowledge base and response matches for one input"""
+    
+    def __init__(self, command_interpreter: AdvancedCommandInterpreter, response_engine: ResponseEngine,
+                 knowledge_base: Optional[KnowledgeBase] = None):
+        """
+        Build the phrase automaton shared by the rule-based sources
+        
+        Args:
+            command_interpreter: Parses system commands
+            response_engine: Conversational responses (also the text for exit and special intents)
+            knowledge_base: Offline answers to general questions, if available
+        """
+        self.command_interpreter = command_interpreter
+        self.response_engine = response_engine
+        self.knowledge_base = knowledge_base
+        
+        # Padded with spaces so phrases match whole words only ("help" but not "helpful")
+        self.phrase_intents: Dict[str, List[Tuple[str, str]]] = {}
+        for intent, phrases in SPECIAL_PHRASES.items():
+            for phrase in phrases:
+                self._add_phrase(phrase, 'special', intent)
+        for phrase in EXIT_PHRASES:
+            self._add_phrase(phrase, 'exit', 'goodbye')
+        for phrase in GENERAL_QUESTION_KEYWORDS:
+            self._add_phrase(phrase, 'general', phrase)
+        self.automaton = AhoCorasick(self.phrase_intents)
+    
+    def _add_phrase(self, phrase: str, source: str, intent: str):
+        """Register a phrase under its source and intent"""
+        self.phrase_intents.setdefault(f" {normalize_text(phrase)} ", []).append((source, intent))
+    
+    def scan(self, user_text: str) -> Dict[str, List[str]]:
+        """
+        Rule-based intents in normalized text
+        
+        Returns:
+            Source ('special', 'exit', 'general') -> intents, in order of first occurrence
+        """
+        found: Dict[str, List[str]] = {}
+        for _, phrase in self.automaton.iter_matches(f" {user_text} "):
+            for source, intent in self.phrase_intents[phrase]:
+                intents = found.setdefault(source, [])
+                if intent not in intents:
+                    intents.append(intent)
+        return found
+    
+    def is_exit(self, user_input: str) -> bool:
+        """True if the input contains a goodbye phrase (without checking for commands)"""
+        return 'exit' in self.scan(normalize_text(user_input))
+    
+    def route(self, user_input: str) -> RouteDecision:
+        """
+        Decide how to handle an utterance
+        
+        Commands win over everything (they act on the system, so "quit
+        chrome" closes an app rather than ending the session), then exit
+        phrases, special phrases, the response engine and finally knowledge
+        base answers to general questions no response category matched with
+        confidence. Weaker sources are consulted only when no stronger one
+        matched, apart from the shared phrase scan; the response engine
+        supplies the text for exit and special decisions.
+        
+        Args:
+            user_input: Text recognized from speech
+        
+        Returns:
+            RouteDecision; candidates lists every source that matched, strongest first
+        """
+        # Normalized once; the interpreter parses the clauses, everything else the joined text
+        clauses = split_clauses(user_input)
+        user_text = ' '.join(normalized for _, normalized in clauses)
+        phrases = self.scan(user_text)
+        
+        candidates = []
+        intents = self.command_interpreter.parse_clauses(clauses)
+        if intents:
+            candidates.append(Candidate('command', '+'.join(cmd_name for cmd_name, _ in intents), 1.0))
+        for source in ('exit', 'special'):
+            candidates.extend(Candidate(source, intent, 1.0) for intent in phrases.get(source, []))
+        
+        if intents:
+            return self._decision(candidates, intents, phrases)
+        
+        # Exit and special intents speak the response engine's text too
+        category, response, confidence = self.response_engine.answer(user_text)
+        if category is not None:
+            candidates.append(Candidate('response', category, confidence))
+            return self._decision(candidates, response, phrases)
+        
+        # The knowledge base answers general questions no category matched confidently
+        if not candidates and self.knowledge_base and 'general' in phrases:
+            answer = self.knowledge_base.answer(user_text)
+            if answer is not None:
+                candidates.append(Candidate('knowledge', phrases['general'][0], 1.0))
+                return self._decision(candidates, answer, phrases)
+        
+        if not candidates:
+            candidates.append(Candidate('response', category, confidence))
+        return self._decision(candidates, response, phrases)
+    
+    @staticmethod
+    def _decision(candidates: List[Candidate], detail, phrases: Dict[str, List[str]]) -> RouteDecision:
+        """Build the decision for the strongest candidate"""
+        best = candidates[0]
+        
+        # Panels accompany a spoken answer but never a command's result
+        special = phrases.get('special')
+        panel = special[0] if special and best.source != 'command' else None
+        
+        return RouteDecision(
+            source=best.source,
+            intent=best.intent,
+            confidence=best.confidence,
+            detail=detail,
+            panel=panel,
+            exit=best.source == 'exit',
+            candidates=candidates
+        )
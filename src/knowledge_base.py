@@ -0,0 +1,282 @@
+"""
+Knowledge Base - Offline answers to general questions from a local corpus
+Documents are split into passages and bulk-loaded into an SQLite FTS5 index;
+questions are answered with the best passage by BM25 rank, without network
+"""
+
+import os
+import re
+import sys
+import json
+import sqlite3
+import argparse
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.text_normalizer import normalize_text
+from config.settings import KNOWLEDGE_BASE_PATH, KNOWLEDGE_MIN_COVERAGE
+
+SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS passages USING fts5(
+    title,
+    body,
+    source UNINDEXED,
+    tokenize = 'porter unicode61'
+);
+"""
+
+# Question phrasing that says nothing about the topic
+STOP_WORDS = frozenset("""
+a an the is are was were be been of to in on for and or what whats who whos which how why when where
+does do did can could would should tell me about explain define definition meaning please you your i my
+it its this that there their give some more know describe
+""".split())
+
+# Column weights for bm25(): a hit in the title counts for more than one in the body
+TITLE_WEIGHT = 5.0
+BODY_WEIGHT = 1.0
+
+DOCUMENT_SUFFIXES = ('.txt', '.md')
+
+
+class KnowledgeBase:
+    """Full-text passage index over a local document corpus"""
+    
+    def __init__(self, db_path: str = KNOWLEDGE_BASE_PATH, passage_words: int = 120):
+        """
+        Open (and create if needed) the knowledge base
+        
+        Args:
+            db_path: SQLite database file
+            passage_words: Approximate passage length used when importing
+        """
+        self.db_path = Path(db_path)
+        self.passage_words = passage_words
+        self._local = threading.local()
+        
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+    
+    def _connection(self) -> sqlite3.Connection:
+        """Per-thread connection (sqlite3 connections must not be shared across threads)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+    
+    def close(self):
+        """Close this thread's connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+    
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT count(*) FROM passages").fetchone()[0]
+    
+    def import_documents(self, documents: Iterable[Tuple[str, str, str]], replace: bool = False) -> int:
+        """
+        Split documents into passages and load them in one transaction
+        
+        Args:
+            documents: (title, text, source) tuples
+            replace: Drop the existing passages first
+        
+        Returns:
+            Number of passages imported
+        """
+        conn = self._connection()
+        count = 0
+        with conn:
+            if replace:
+                conn.execute("DELETE FROM passages")
+            for title, text, source in documents:
+                rows = [(title, passage, source) for passage in self._split_passages(text)]
+                conn.executemany("INSERT INTO passages (title, body, source) VALUES (?, ?, ?)", rows)
+                count += len(rows)
+            
+            # Merge the index segments written by the bulk load
+            conn.execute("INSERT INTO passages (passages) VALUES ('optimize')")
+        return count
+    
+    def import_path(self, path: str, replace: bool = False) -> int:
+        """
+        Import a document file or a directory of them
+        
+        Plain-text and Markdown files become one document each, titled by their
+        first heading or file name. JSON Lines files hold one {"title", "text"}
+        object per line.
+        
+        Args:
+            path: File or directory
+            replace: Drop the existing passages first
+        
+        Returns:
+            Number of passages imported
+        """
+        return self.import_documents(self._read_documents(Path(path)), replace=replace)
+    
+    def _read_documents(self, path: Path) -> Iterator[Tuple[str, str, str]]:
+        """Yield (title, text, source) for every document under path"""
+        files = sorted(path.rglob('*')) if path.is_dir() else [path]
+        for file in files:
+            if file.suffix == '.jsonl':
+                with open(file, 'r', encoding='utf-8') as f:
+                    for line_number, line in enumerate(f, 1):
+                        if line.strip():
+                            record = json.loads(line)
+                            yield record.get('title', ''), record.get('text', ''), f"{file}:{line_number}"
+            elif file.suffix in DOCUMENT_SUFFIXES:
+                text = file.read_text(encoding='utf-8', errors='replace')
+                first_line = text.lstrip().split('\n', 1)[0]
+                title = first_line.lstrip('#').strip() if first_line.startswith('#') else file.stem
+                yield title, text, str(file)
+    
+    def _split_passages(self, text: str) -> List[str]:
+        """Group paragraphs into passages of roughly passage_words words"""
+        passages = []
+        current: List[str] = []
+        current_words = 0
+        for paragraph in re.split(r'\n\s*\n', text):
+            paragraph = ' '.join(paragraph.split())
+            if not paragraph or paragraph.startswith('#'):
+                continue
+            words = len(paragraph.split())
+            if current and current_words + words > self.passage_words:
+                passages.append(' '.join(current))
+                current, current_words = [], 0
+            current.append(paragraph)
+            current_words += words
+        if current:
+            passages.append(' '.join(current))
+        return passages
+    
+    @staticmethod
+    def _topic_terms(text: str) -> List[str]:
+        """Distinct words of a text that say something about its topic, in order"""
+        words = re.findall(r"[a-z0-9]+", normalize_text(text))
+        return list(dict.fromkeys(word for word in words if word not in STOP_WORDS))
+    
+    @classmethod
+    def _build_query(cls, question: str) -> Optional[str]:
+        """Turn a spoken question into an FTS5 query over its topic words"""
+        terms = cls._topic_terms(question)
+        if not terms:
+            return None
+        
+        # Quoted terms can't be parsed as FTS5 operators; OR lets bm25 rank
+        # passages by how many topic words they share
+        return ' OR '.join(f'"{term}"' for term in terms)
+    
+    @classmethod
+    def coverage(cls, question: str, result: Dict[str, object]) -> float:
+        """Fraction of the question's topic words found in a result's title or passage"""
+        terms = cls._topic_terms(question)
+        if not terms:
+            return 0.0
+        # Plurals count as their singular, as the porter tokenizer treats them in the search
+        def stem(word: str) -> str:
+            return word[:-1] if len(word) > 3 and word.endswith('s') else word
+        
+        found = {stem(word) for word in re.findall(r"[a-z0-9]+", normalize_text(f"{result['title']} {result['passage']}"))}
+        return sum(1 for term in terms if stem(term) in found) / len(terms)
+    
+    def search(self, question: str, limit: int = 3) -> List[Dict[str, object]]:
+        """
+        Find the best passages for a question
+        
+        Args:
+            question: User question
+            limit: Maximum number of passages
+        
+        Returns:
+            List of {"title", "passage", "source", "score"}, best first
+            (score is bm25(), lower is better)
+        """
+        query = self._build_query(question)
+        if query is None:
+            return []
+        
+        try:
+            rows = self._connection().execute(
+                "SELECT title, body, source, bm25(passages, ?, ?) AS score FROM passages "
+                "WHERE passages MATCH ? ORDER BY score LIMIT ?",
+                (TITLE_WEIGHT, BODY_WEIGHT, query, limit)
+            ).fetchall()
+        except sqlite3.OperationalError as e:
+            print(f"Error: Knowledge base query failed: {e}")
+            return []
+        
+        return [
+            {'title': title, 'passage': body, 'source': source, 'score': score}
+            for title, body, source, score in rows
+        ]
+    
+    def answer(self, question: str, max_chars: int = 300,
+               min_coverage: float = KNOWLEDGE_MIN_COVERAGE) -> Optional[str]:
+        """
+        Answer a question with the top passage, trimmed for speech
+        
+        Args:
+            question: User question
+            max_chars: Cut the passage at the last sentence end before this length
+            min_coverage: Fraction of the question's topic words the passage
+                must contain (the search matches passages sharing any one)
+        
+        Returns:
+            Answer text, or None if nothing relevant enough is indexed
+        """
+        results = self.search(question, limit=1)
+        if not results or self.coverage(question, results[0]) < min_coverage:
+            return None
+        
+        passage = results[0]['passage']
+        if len(passage) <= max_chars:
+            return passage
+        
+        cut = passage[:max_chars]
+        sentence_end = max(cut.rfind('. '), cut.rfind('! '), cut.rfind('? '))
+        return cut[:sentence_end + 1] if sentence_end > 0 else cut.rsplit(' ', 1)[0] + '...'
+
+
+def open_knowledge_base(db_path: str = KNOWLEDGE_BASE_PATH) -> Optional[KnowledgeBase]:
+    """Open the knowledge base if one has been imported, otherwise None"""
+    if not Path(db_path).exists():
+        return None
+    return KnowledgeBase(db_path)
+
+
+def main(argv: Optional[list] = None):
+    """Command-line import and query"""
+    parser = argparse.ArgumentParser(description="Offline knowledge base (SQLite FTS5)")
+    parser.add_argument('--db', default=KNOWLEDGE_BASE_PATH, help="Knowledge base database path")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    import_parser = commands.add_parser('import', help="Import documents (.txt, .md, .jsonl)")
+    import_parser.add_argument('paths', nargs='+', help="Files or directories")
+    import_parser.add_argument('--replace', action='store_true', help="Drop existing passages first")
+    
+    query_parser = commands.add_parser('query', help="Answer a question")
+    query_parser.add_argument('question', help="Question text")
+    
+    args = parser.parse_args(argv)
+    knowledge_base = KnowledgeBase(args.db)
+    
+    if args.command == 'import':
+        total = 0
+        for index, path in enumerate(args.paths):
+            total += knowledge_base.import_path(path, replace=args.replace and index == 0)
+        print(f"[SYSTEM] Imported {total} passages into {args.db}")
+    else:
+        for result in knowledge_base.search(args.question):
+            print(f"[{result['score']:.2f}] {result['title']} ({result['source']})")
+            print(f"  {result['passage'][:200]}")
+
+
+if __name__ == "__main__":
+    main()
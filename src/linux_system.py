@@ -0,0 +1,268 @@
+"""
+Linux System - Answers system queries from /proc, /sys and syscalls
+Used by SystemControl on Linux instead of external tools: each query is a
+few small file reads (microseconds) rather than a process start. Results
+have the same shape as SystemControl's macOS results
+"""
+
+import os
+import socket
+import struct
+import platform
+from typing import Any, Dict, List, Optional, Tuple
+
+# ioctl request for an interface's IPv4 address (linux/sockios.h)
+SIOCGIFADDR = 0x8915
+
+
+def _read(path: str) -> Optional[str]:
+    """Stripped file contents, or None if the file cannot be read"""
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def human_size(num_bytes: float) -> str:
+    """Size in powers of 1024 the way `df -h` prints it (e.g. 9.5G, 120G)"""
+    for unit in ('B', 'K', 'M', 'G', 'T', 'P'):
+        if num_bytes < 1024 or unit == 'P':
+            break
+        num_bytes /= 1024
+    if unit == 'B':
+        return f"{int(num_bytes)}B"
+    return f"{num_bytes:.1f}{unit}" if num_bytes < 10 else f"{num_bytes:.0f}{unit}"
+
+
+class LinuxSystem:
+    """In-process readers for disk, battery, network, hardware and process information"""
+    
+    def __init__(self, proc_root: str = '/proc', sys_root: str = '/sys'):
+        """
+        Args:
+            proc_root: Mount point of procfs
+            sys_root: Mount point of sysfs
+        """
+        self.proc_root = proc_root
+        self.sys_root = sys_root
+    
+    def disk_usage(self, path: str = '/') -> Dict[str, Any]:
+        """Space on the filesystem holding path, as `df -h` reports it"""
+        try:
+            stats = os.statvfs(path)
+        except OSError as e:
+            return {'error': f"Disk error: {e}"}
+        
+        total = stats.f_blocks * stats.f_frsize
+        used = (stats.f_blocks - stats.f_bfree) * stats.f_frsize
+        available = stats.f_bavail * stats.f_frsize
+        # Like df, relative to the space usable by unprivileged users
+        usable = used + available
+        percentage = -(-used * 100 // usable) if usable else 0
+        
+        return {
+            'total': human_size(total),
+            'used': human_size(used),
+            'available': human_size(available),
+            'percentage': f"{percentage}%",
+        }
+    
+    def battery_status(self) -> Dict[str, Any]:
+        """Charge and state of the first battery under power_supply"""
+        supply_dir = os.path.join(self.sys_root, 'class', 'power_supply')
+        try:
+            supplies = sorted(os.listdir(supply_dir))
+        except OSError:
+            supplies = []
+        
+        for name in supplies:
+            base = os.path.join(supply_dir, name)
+            if _read(os.path.join(base, 'type')) != 'Battery':
+                continue
+            
+            capacity = _read(os.path.join(base, 'capacity'))
+            state = _read(os.path.join(base, 'status')) or 'Unknown'
+            return {
+                'percentage': int(capacity) if capacity and capacity.isdigit() else None,
+                'status': {'Full': 'charged'}.get(state, state.lower()),
+                'raw': f"{name}: {capacity}% {state}"
+            }
+        
+        return {'error': "No battery found"}
+    
+    def network_status(self) -> Dict[str, Any]:
+        """Interfaces that are up, their IPv4 addresses and the default gateway"""
+        net_dir = os.path.join(self.sys_root, 'class', 'net')
+        try:
+            names = sorted(os.listdir(net_dir))
+        except OSError as e:
+            return {'error': f"Network error: {e}"}
+        
+        wireless = set(self._wireless_interfaces())
+        interfaces = {}
+        for name in names:
+            base = os.path.join(net_dir, name)
+            if name == 'lo' or _read(os.path.join(base, 'operstate')) != 'up':
+                continue
+            interfaces[name] = {
+                'ip': self._ipv4_address(name),
+                'mac': _read(os.path.join(base, 'address')),
+                'wireless': name in wireless,
+            }
+        
+        if not interfaces:
+            return {'error': "No network connection"}
+        
+        gateways = self._default_gateways()
+        # Prefer the interface carrying the default route, then a wireless one
+        primary = next((name for name in gateways if name in interfaces), None)
+        primary = primary or next((name for name in interfaces if name in wireless), None) or next(iter(interfaces))
+        
+        return {
+            'Interface': primary,
+            'IP address': interfaces[primary]['ip'],
+            'Router': gateways.get(primary),
+            'Wi-Fi': 'On' if interfaces[primary]['wireless'] else 'Off',
+            'interfaces': interfaces,
+        }
+    
+    def _wireless_interfaces(self) -> List[str]:
+        """Interfaces listed in /proc/net/wireless"""
+        content = _read(os.path.join(self.proc_root, 'net', 'wireless')) or ''
+        # Two header lines, then "  wlan0: 0000 ..."
+        return [line.split(':', 1)[0].strip() for line in content.splitlines()[2:] if ':' in line]
+    
+    def _default_gateways(self) -> Dict[str, str]:
+        """Interface -> default gateway address, from /proc/net/route"""
+        content = _read(os.path.join(self.proc_root, 'net', 'route')) or ''
+        gateways = {}
+        for line in content.splitlines()[1:]:
+            fields = line.split()
+            # Iface Destination Gateway ... (addresses are little-endian hex)
+            if len(fields) > 2 and fields[1] == '00000000':
+                gateways.setdefault(fields[0], socket.inet_ntoa(struct.pack('<L', int(fields[2], 16))))
+        return gateways
+    
+    @staticmethod
+    def _ipv4_address(interface: str) -> Optional[str]:
+        """IPv4 address of an interface (SIOCGIFADDR ioctl), or None if it has none"""
+        import fcntl
+        
+        try:
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+                request = struct.pack('256s', interface.encode('utf-8')[:15])
+                return socket.inet_ntoa(fcntl.ioctl(sock.fileno(), SIOCGIFADDR, request)[20:24])
+        except OSError:
+            return None
+    
+    def system_info(self) -> Dict[str, Any]:
+        """Kernel, distribution, CPU and memory details"""
+        info = {
+            'os': platform.system(),
+            'version': platform.release(),
+            'machine': platform.machine(),
+            # platform.processor() would run `uname -p`; the model name comes from cpuinfo
+            'processor': platform.machine(),
+            'python_version': platform.python_version(),
+            'hostname': socket.gethostname(),
+        }
+        
+        os_release = _read('/etc/os-release') or ''
+        for line in os_release.splitlines():
+            if line.startswith('PRETTY_NAME='):
+                info['distribution'] = line.split('=', 1)[1].strip('"')
+        
+        cpuinfo = _read(os.path.join(self.proc_root, 'cpuinfo')) or ''
+        models = [line.split(':', 1)[1].strip() for line in cpuinfo.splitlines() if line.startswith('model name')]
+        if models:
+            info['processor'] = models[0]
+        info['cpu_cores'] = len(models) or os.cpu_count()
+        
+        meminfo = self._meminfo()
+        if 'MemTotal' in meminfo:
+            info['memory_total'] = human_size(meminfo['MemTotal'] * 1024)
+        if 'MemAvailable' in meminfo:
+            info['memory_available'] = human_size(meminfo['MemAvailable'] * 1024)
+        
+        return info
+    
+    def _meminfo(self) -> Dict[str, int]:
+        """Fields of /proc/meminfo in kB"""
+        content = _read(os.path.join(self.proc_root, 'meminfo')) or ''
+        values = {}
+        for line in content.splitlines():
+            key, _, rest = line.partition(':')
+            parts = rest.split()
+            if parts and parts[0].isdigit():
+                values[key] = int(parts[0])
+        return values
+    
+    def memory_usage(self) -> Optional[float]:
+        """Percent of memory in use (not available), or None if unknown"""
+        meminfo = self._meminfo()
+        total = meminfo.get('MemTotal')
+        if not total or 'MemAvailable' not in meminfo:
+            return None
+        return 100.0 * (total - meminfo['MemAvailable']) / total
+    
+    def cpu_times(self) -> Optional[Tuple[int, int]]:
+        """
+        Aggregate CPU time from /proc/stat, in clock ticks
+        
+        Returns:
+            (busy, total), or None if unknown; busy percent over an interval
+            is the difference in busy over the difference in total
+        """
+        content = _read(os.path.join(self.proc_root, 'stat')) or ''
+        first = content.split('\n', 1)[0].split()
+        if not first or first[0] != 'cpu':
+            return None
+        # user nice system idle iowait irq softirq steal (guest time is already in user)
+        ticks = [int(value) for value in first[1:9]]
+        total = sum(ticks)
+        return total - ticks[3] - ticks[4], total
+    
+    def running_processes(self, uid: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Running processes (kernel threads excluded)
+        
+        Args:
+            uid: Only processes owned by this user (None for all users)
+        
+        Returns:
+            List of {pid, name, uid}, by pid
+        """
+        processes = []
+        try:
+            entries = os.listdir(self.proc_root)
+        except OSError:
+            return processes
+        
+        for entry in entries:
+            if not entry.isdigit():
+                continue
+            base = os.path.join(self.proc_root, entry)
+            try:
+                owner = os.stat(base).st_uid
+                if uid is not None and owner != uid:
+                    continue
+                # Kernel threads have an empty command line
+                with open(os.path.join(base, 'cmdline'), 'rb') as f:
+                    if not f.read(1):
+                        continue
+            except OSError:
+                # The process exited while we looked
+                continue
+            
+            name = _read(os.path.join(base, 'comm'))
+            if name:
+                processes.append({'pid': int(entry), 'name': name, 'uid': owner})
+        
+        processes.sort(key=lambda process: process['pid'])
+        return processes
+    
+    def user_applications(self) -> Dict[str, Any]:
+        """Distinct names of the current user's processes, as list_open_applications reports them"""
+        names = sorted({process['name'] for process in self.running_processes(os.getuid())})
+        return {'status': 'success', 'applications': names, 'count': len(names)}
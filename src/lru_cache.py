@@ -0,0 +1,73 @@
+"""
+LRU Cache - Bounded, thread-safe least-recently-used cache
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable
+
+# Returned by get() on a miss, since None is a valid cached value
+MISSING = object()
+
+
+class LRUCache:
+    """Bounded mapping that evicts the least recently used entry"""
+    
+    def __init__(self, maxsize: int = 1024):
+        """
+        Initialize the cache
+        
+        Args:
+            maxsize: Maximum number of entries (0 disables caching)
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        """
+        Look up a key and mark it as recently used
+        
+        Args:
+            key: Cache key
+            default: Returned when the key is absent
+            
+        Returns:
+            The cached value, or default
+        """
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def put(self, key: Hashable, value: Any):
+        """
+        Store a value, evicting the least recently used entry when full
+        
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        if self.maxsize <= 0:
+            return
+        
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._data.clear()
+    
+    def __len__(self) -> int:
+        return len(self._data)
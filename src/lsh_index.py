@@ -0,0 +1,241 @@
+"""
+LSH Index - Approximate nearest-pattern matching over hashed n-gram vectors
+Embeds patterns with a dependency-free hashed bag of words, word bigrams and
+character n-grams, and buckets them with random-projection (SimHash)
+signatures so a lookup only re-ranks the patterns in a few buckets
+"""
+
+import math
+import zlib
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from src.response_index import ResponseIndex
+
+
+@lru_cache(maxsize=2 ** 18)
+def _feature_hash(feature: str) -> int:
+    # crc32 is stable across processes, unlike the salted built-in hash();
+    # n-grams repeat across patterns, so memoizing pays off during builds
+    return zlib.crc32(feature.encode('utf-8'))
+
+
+class HashedVectorizer:
+    """Maps text to sparse, L2-normalized vectors via the hashing trick"""
+    
+    def __init__(self, dimensions: int = 2 ** 16, ngram_range: Tuple[int, int] = (3, 5),
+                 char_weight: float = 0.5):
+        """
+        Initialize the vectorizer
+        
+        Args:
+            dimensions: Size of the hashed feature space
+            ngram_range: Smallest and largest character n-gram length
+            char_weight: Weight of a character n-gram relative to a word
+        """
+        self.dimensions = dimensions
+        self.ngram_range = ngram_range
+        self.char_weight = char_weight
+        self.idf = None
+    
+    def counts(self, text: str) -> Dict[int, float]:
+        """Raw hashed feature counts of a normalized text"""
+        counts: Dict[int, float] = {}
+        words = text.split()
+        
+        features = [(f"w:{word}", 1.0) for word in words]
+        features += [(f"b:{first} {second}", 1.0) for first, second in zip(words, words[1:])]
+        
+        # Character n-grams of space-padded words tolerate inflections and typos
+        low, high = self.ngram_range
+        for word in words:
+            padded = f" {word} "
+            for n in range(low, high + 1):
+                for start in range(len(padded) - n + 1):
+                    features.append((f"c:{padded[start:start + n]}", self.char_weight))
+        
+        for feature, weight in features:
+            bucket = _feature_hash(feature) % self.dimensions
+            counts[bucket] = counts.get(bucket, 0.0) + weight
+        return counts
+    
+    def fit(self, all_counts: List[Dict[int, float]]):
+        """Learn inverse document frequencies from the patterns' feature counts"""
+        document_frequency = np.zeros(self.dimensions, dtype=np.float64)
+        for counts in all_counts:
+            document_frequency[list(counts)] += 1
+        self.idf = (np.log((1 + len(all_counts)) / (1 + document_frequency)) + 1).astype(np.float32)
+    
+    def transform(self, text: str) -> Tuple['np.ndarray', 'np.ndarray']:
+        """
+        Vectorize one text
+        
+        Returns:
+            Tuple of (sorted feature indices, L2-normalized weights)
+        """
+        return self.weigh(self.counts(text))
+    
+    def weigh(self, counts: Dict[int, float]) -> Tuple['np.ndarray', 'np.ndarray']:
+        """Turn raw feature counts into (sorted indices, L2-normalized weights)"""
+        indices = np.fromiter(sorted(counts), dtype=np.int64, count=len(counts))
+        # Sublinear term frequency so repeated n-grams do not dominate
+        values = np.log1p(np.array([counts[index] for index in indices], dtype=np.float32))
+        if self.idf is not None:
+            values *= self.idf[indices]
+        
+        norm = float(np.sqrt(np.dot(values, values)))
+        if norm > 0:
+            values /= norm
+        return indices, values
+
+
+class LSHIndex:
+    """Random-projection LSH over hashed pattern vectors with cosine re-ranking"""
+    
+    def __init__(self, index: ResponseIndex, tables: int = 16, bits: Optional[int] = None,
+                 probes: int = 3, bucket_size: int = 32, seed: int = 0):
+        """
+        Embed every pattern and build the hash tables
+        
+        Args:
+            index: Response index holding the (normalized) patterns
+            tables: Number of independent hash tables
+            bits: Signature bits per table (default: chosen so buckets hold
+                about bucket_size patterns, at most 16)
+            probes: Extra buckets probed per table, flipping the least certain bits
+            bucket_size: Target patterns per bucket when bits is chosen automatically
+            seed: Seed for the random hyperplanes
+        """
+        self.categories: List[str] = list(index.categories)
+        self.probes = probes
+        self.vectorizer = HashedVectorizer()
+        
+        # Rows are patterns ordered by (category, position) so ties resolve in database order
+        rows = sorted(entry[:3] for entry in index.patterns if entry is not None)
+        self.row_count = len(rows)
+        self.row_categories = np.array([category_id for category_id, _, _ in rows], dtype=np.int64)
+        
+        all_counts = [self.vectorizer.counts(pattern) for _, _, pattern in rows]
+        self.vectorizer.fit(all_counts)
+        
+        # Pattern vectors in CSR layout
+        indptr = [0]
+        all_indices = []
+        all_values = []
+        for counts in all_counts:
+            indices, values = self.vectorizer.weigh(counts)
+            all_indices.append(indices)
+            all_values.append(values)
+            indptr.append(indptr[-1] + len(indices))
+        self.indptr = np.array(indptr, dtype=np.int64)
+        self.indices = np.concatenate(all_indices) if all_indices else np.zeros(0, dtype=np.int64)
+        self.values = np.concatenate(all_values) if all_values else np.zeros(0, dtype=np.float32)
+        
+        if bits is None:
+            bits = int(math.ceil(math.log2(max(self.row_count / bucket_size, 2))))
+        self.tables = tables
+        self.bits = max(1, min(bits, 16))
+        
+        # One random +/-1 hyperplane per signature bit
+        rng = np.random.default_rng(seed)
+        self.hyperplanes = rng.choice(np.array([-1, 1], dtype=np.int8),
+                                      size=(self.vectorizer.dimensions, self.tables * self.bits))
+        self.bit_values = (1 << np.arange(self.bits, dtype=np.int64))
+        
+        self.buckets: List[Dict[int, 'np.ndarray']] = [{} for _ in range(self.tables)]
+        if self.row_count:
+            keys = self._row_keys()
+            for table in range(self.tables):
+                order = np.argsort(keys[:, table], kind='stable')
+                sorted_keys = keys[order, table]
+                boundaries = np.flatnonzero(np.diff(sorted_keys)) + 1
+                for members in np.split(order, boundaries):
+                    self.buckets[table][int(keys[members[0], table])] = members
+    
+    def _row_keys(self, chunk_size: int = 4096) -> 'np.ndarray':
+        """
+        Signature key per table of every pattern vector
+        
+        Rows are projected onto the hyperplanes a chunk at a time and only
+        the packed keys are kept, so peak memory is one chunk's projections
+        (plus row_count x tables int64 keys) however many patterns there are.
+        """
+        keys = np.zeros((self.row_count, self.tables), dtype=np.int64)
+        lengths = np.diff(self.indptr)
+        for first in range(0, self.row_count, chunk_size):
+            last = min(first + chunk_size, self.row_count)
+            start, end = self.indptr[first], self.indptr[last]
+            if start == end:
+                continue
+            contributions = self.hyperplanes[self.indices[start:end]] * self.values[start:end, None]
+            
+            # reduceat needs in-range offsets; featureless rows get an all-zero signature
+            offsets = np.minimum(self.indptr[first:last] - start, end - start - 1)
+            signs = np.add.reduceat(contributions, offsets, axis=0) > 0
+            signs[lengths[first:last] == 0] = False
+            keys[first:last] = self._keys(signs)
+        return keys
+    
+    def _keys(self, signs: 'np.ndarray') -> 'np.ndarray':
+        """Pack signature bits into one integer key per table"""
+        signs = signs.reshape(len(signs), self.tables, self.bits)
+        return signs.astype(np.int64) @ self.bit_values
+    
+    def match(self, user_text: str) -> Tuple[Optional[str], float]:
+        """
+        Find the nearest pattern's category
+        
+        Probes each table's bucket for the input signature plus the buckets
+        one flipped bit away for the least certain bits, then re-ranks the
+        candidates by exact cosine similarity, which is the confidence.
+        
+        Args:
+            user_text: Normalized user input (see normalize_text)
+        
+        Returns:
+            Tuple of (category name or None, confidence_score)
+        """
+        if not self.row_count or not user_text:
+            return None, 0.0
+        
+        indices, values = self.vectorizer.transform(user_text)
+        projection = values @ self.hyperplanes[indices]
+        keys = self._keys((projection > 0)[None, :])[0]
+        margins = np.abs(projection).reshape(self.tables, self.bits)
+        
+        candidates = []
+        for table in range(self.tables):
+            key = int(keys[table])
+            probe_keys = [key] + [key ^ (1 << int(bit)) for bit in np.argsort(margins[table])[:self.probes]]
+            for probe_key in probe_keys:
+                members = self.buckets[table].get(probe_key)
+                if members is not None:
+                    candidates.append(members)
+        
+        if not candidates:
+            return None, 0.0
+        rows = np.unique(np.concatenate(candidates))
+        
+        # Exact cosine against the candidates only (both sides are unit length)
+        query = np.zeros(self.vectorizer.dimensions, dtype=np.float32)
+        query[indices] = values
+        starts = self.indptr[rows]
+        lengths = self.indptr[rows + 1] - starts
+        positions = np.arange(int(lengths.sum())) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        positions += np.repeat(starts, lengths)
+        products = self.values[positions] * query[self.indices[positions]]
+        similarity = np.bincount(np.repeat(np.arange(len(rows)), lengths), weights=products, minlength=len(rows))
+        
+        # np.unique sorted the rows, so argmax keeps database order on ties
+        best = int(np.argmax(similarity))
+        best_similarity = float(similarity[best])
+        if best_similarity <= 0.0:
+            return None, 0.0
+        
+        return self.categories[self.row_categories[rows[best]]], min(best_similarity, 1.0)
@@ -6,6 +6,7 @@ import sys
 import os
 import time
 from datetime import datetime
+from typing import Any, Dict, List, Optional
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -16,20 +17,36 @@ from src.response_engine import ResponseEngine
 from src.terminal_ui import TerminalUI
 from src.connectivity_manager import ConnectivityManager
 from src.advanced_command_interpreter import AdvancedCommandInterpreter
-from config.settings import DEBUG
+from src.knowledge_base import KnowledgeBase, open_knowledge_base
+from src.intent_router import IntentRouter, RouteDecision
+from config.settings import DEBUG, RESPONSE_HOT_RELOAD
 
 
 class VoiceBot:
     """Main VoiceBot application"""
     
-    def __init__(self):
-        """Initialize VoiceBot components"""
+    def __init__(self, response_engine: ResponseEngine = None,
+                 command_interpreter: AdvancedCommandInterpreter = None,
+                 speech_recognizer: SpeechRecognizer = None,
+                 knowledge_base: KnowledgeBase = None):
+        """
+        Initialize VoiceBot components
+        
+        Args:
+            response_engine: Preloaded response engine (built here if None)
+            command_interpreter: Preloaded command interpreter (built here if None)
+            speech_recognizer: Preloaded speech recognizer (loaded in initialize() if None)
+            knowledge_base: Preloaded knowledge base (opened here if None and the database exists)
+        """
         self.ui = TerminalUI()
-        self.response_engine = ResponseEngine()
+        self.response_engine = response_engine or ResponseEngine()
         self.speech_synthesizer = SpeechSynthesizer()
-        self.command_interpreter = AdvancedCommandInterpreter()  # NEW: System control
-        self.speech_recognizer = None
+        self.command_interpreter = command_interpreter or AdvancedCommandInterpreter()  # NEW: System control
+        self.speech_recognizer = speech_recognizer
         self.connectivity_manager = ConnectivityManager()
+        self.knowledge_base = knowledge_base or open_knowledge_base()
+        self.router = IntentRouter(self.command_interpreter, self.response_engine, self.knowledge_base)
+        self.pending_commands: List[Dict[str, Any]] = []  # Commands still running after their turn
         self.is_running = False
         self.demo_mode = False
     
@@ -55,8 +72,9 @@ class VoiceBot:
             self.ui.display_status(f"CONNECTIVITY: {mode} - System commands only", "rgb(255,127,0)")
         
         # Initialize speech recognizer with Whisper
-        self.ui.display_status("Initializing Whisper speech recognition...", "rgb(255,127,0)")
-        self.speech_recognizer = SpeechRecognizer(model_size="base")
+        if self.speech_recognizer is None:
+            self.ui.display_status("Initializing Whisper speech recognition...", "rgb(255,127,0)")
+            self.speech_recognizer = SpeechRecognizer(model_size="base")
         
         if self.demo_mode:
             self.ui.display_status("DEMO_MODE: Text input protocol active", "rgb(255,127,0)")
@@ -68,6 +86,9 @@ class VoiceBot:
         self.ui.display_status("Speech Recognition: OPERATIONAL", "rgb(255,127,0)")
         self.ui.display_status("Text-to-Speech Engine: OPERATIONAL", "rgb(255,127,0)")
         self.ui.display_status("Response Protocol: OPERATIONAL", "rgb(255,127,0)")
+        
+        if RESPONSE_HOT_RELOAD:
+            self.response_engine.start_watching()
         print()
         
         self.ui.display_welcome()
@@ -79,7 +100,7 @@ class VoiceBot:
         
         Args:
             user_input: Text recognized from speech
-            
+        
         Returns:
             True if should continue, False if should exit
         """
@@ -90,24 +111,13 @@ class VoiceBot:
         print()
         self.ui.display_user_input(user_input)
         
-        # First, try advanced command interpreter (system control)
-        cmd_result = self.command_interpreter.interpret_command(user_input)
-        
-        if cmd_result['status'] == 'success':
-            # System command was executed
-            response = cmd_result['response']
-        elif cmd_result['action'] != 'unknown':
-            # Command matched but had an error
-            response = cmd_result['response']
-        else:
-            # Use traditional response engine for general conversation
-            response, confidence = self.response_engine.find_response(user_input)
-            if DEBUG:
-                print(f"[DEBUG] Confidence: {confidence:.2f}")
+        decision = self.router.route(user_input)
+        response = self.respond_to(decision)
         
-        # Handle special commands that need additional output
-        if self._handle_special_commands(user_input):
-            pass
+        # Special intents come with a terminal panel
+        if decision.panel:
+            print()
+            self._display_panel(decision.panel)
         
         # Display response
         print()
@@ -116,50 +126,82 @@ class VoiceBot:
         # Speak response
         self.speech_synthesizer.speak(response)
         
-        # Check for exit conditions
-        user_lower = user_input.lower()
-        if any(word in user_lower for word in ["goodbye", "bye", "exit", "quit"]):
-            return False
+        return not decision.exit
+    
+    def respond(self, user_input: str, pending: Optional[List[Dict[str, Any]]] = None) -> str:
+        """
+        Resolve user input to a response without any terminal output
         
-        return True
+        Args:
+            user_input: Text recognized from speech
+            pending: See respond_to
+        
+        Returns:
+            Response text
+        """
+        return self.respond_to(self.router.route(user_input), pending)
     
-    def _handle_special_commands(self, user_input: str) -> bool:
+    def respond_to(self, decision: RouteDecision, pending: Optional[List[Dict[str, Any]]] = None) -> str:
         """
-        Handle special commands that require additional output
+        Carry out a routing decision and return the response text
+        
+        Results of slow commands that finished since the last turn are
+        reported ahead of the response.
         
         Args:
-            user_input: User input text
-            
+            decision: Result of IntentRouter.route
+            pending: Where this conversation's unfinished commands are kept
+                (default: the bot's own list; pass one per session when a bot
+                serves several conversations)
+        
         Returns:
-            True if special command was handled
+            Response text
         """
-        user_lower = user_input.lower()
+        if pending is None:
+            pending = self.pending_commands
+        finished = self._collect_finished_commands(pending)
         
-        # System info command
-        if any(word in user_lower for word in ["system info", "system details", "computer info"]):
-            print()
-            self.ui.display_system_info()
-            return True
+        if decision.source == 'command':
+            # System commands run through the interpreter
+            cmd_result = self.command_interpreter.execute_intents(decision.detail)
+            if cmd_result['status'] == 'pending':
+                # Still running; results are delivered on a later turn
+                results = cmd_result.get('results', [cmd_result])
+                pending.extend(result for result in results if result['status'] == 'pending')
+            response = cmd_result['response']
+        else:
+            # Knowledge base answer or conversational response
+            response = decision.detail
         
-        # Time command
-        if any(word in user_lower for word in ["what time", "tell me time", "current time"]):
-            print()
-            self.ui.display_time()
-            return True
+        if DEBUG:
+            print(f"[DEBUG] Route: {decision.source}/{decision.intent} Confidence: {decision.confidence:.2f}")
         
-        # Date command
-        if any(word in user_lower for word in ["what date", "what is today", "tell me date"]):
-            print()
-            self.ui.display_date()
-            return True
+        if finished:
+            response = ' '.join(finished + [response])
+        return response
+    
+    def _collect_finished_commands(self, pending: List[Dict[str, Any]]) -> List[str]:
+        """Remove the commands that have finished (or timed out) and return their responses"""
+        finished = [cmd_result for cmd_result in pending if cmd_result['future'].done()]
+        for cmd_result in finished:
+            pending.remove(cmd_result)
+        return [self.command_interpreter.complete_command(cmd_result)['response'] for cmd_result in finished]
+    
+    def _display_panel(self, panel: str):
+        """
+        Show the terminal panel of a special intent
         
-        # Help command
-        if any(word in user_lower for word in ["help", "what can you do", "capabilities"]):
-            print()
+        Args:
+            panel: 'system_info', 'time', 'date' or 'help' (see intent_router.SPECIAL_PHRASES)
+        """
+        if panel == 'system_info':
+            self.ui.display_system_info()
+        elif panel == 'time':
+            self.ui.display_time()
+        elif panel == 'date':
+            self.ui.display_date()
+        elif panel == 'help':
             self.ui.display_help()
-            return True
-        
-        return False
     
     def run(self):
         """Run the VoiceBot application"""
@@ -208,6 +250,7 @@ class VoiceBot:
             self.speech_recognizer.cleanup()
         
         self.speech_synthesizer.stop()
+        self.response_engine.stop_watching()
         
         print("\n" + "="*60)
         self.ui.display_status("System shutdown sequence initiated", "cyan")
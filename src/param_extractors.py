@@ -0,0 +1,57 @@
+"""
+Parameter Extractors - Turn a matched command into its handler's keyword arguments
+A command spec names its extractor in "extract_param": one of the built-in
+names below, or a "module:function" path resolved on first use like handlers.
+An extractor is called with the original text (case and punctuation intact)
+and the groups the pattern captured from the normalized text, and returns
+the parameters (an empty dict if there are none)
+"""
+
+import re
+from typing import Any, Dict, Optional, Tuple
+
+# Built-in extractor names and the functions they stand for
+BUILTIN_EXTRACTORS = {
+    'last_number': 'src.param_extractors:last_number',
+    'app_name': 'src.param_extractors:app_name',
+    'url': 'src.param_extractors:url',
+    'search_query': 'src.param_extractors:search_query',
+}
+
+# Sentence punctuation that may follow a spoken URL but is not part of it
+_URL_TRAILING = '.,;:!?)"\''
+
+# Words the app patterns capture that are not part of an app name
+_APP_VERBS = {'open', 'launch', 'start', 'close', 'quit', 'exit', 'application', 'app'}
+
+
+def extractor_path(name: str) -> str:
+    """Handler path of an extractor named in a spec (built-in name or module:function)"""
+    return BUILTIN_EXTRACTORS.get(name, name)
+
+
+def last_number(text: str, groups: Tuple[Optional[str], ...]) -> Dict[str, Any]:
+    """The last number in the text, as level"""
+    numbers = re.findall(r'\d+', text)
+    return {'level': int(numbers[-1])} if numbers else {}
+
+
+def app_name(text: str, groups: Tuple[Optional[str], ...]) -> Dict[str, Any]:
+    """The first captured group that is not a verb, as app_name"""
+    for group in groups:
+        if group and group not in _APP_VERBS:
+            return {'app_name': group}
+    return {}
+
+
+def url(text: str, groups: Tuple[Optional[str], ...]) -> Dict[str, Any]:
+    """The first URL or domain name in the text, as url"""
+    urls = re.findall(r'https?://\S+|[\w\-.]+\.\w{2,}\S*', text)
+    return {'url': urls[0].rstrip(_URL_TRAILING)} if urls else {}
+
+
+def search_query(text: str, groups: Tuple[Optional[str], ...]) -> Dict[str, Any]:
+    """The last captured group (the search patterns capture the query last), as query"""
+    query = next((group for group in reversed(groups) if group), '').strip()
+    # Use the whole text if extraction failed
+    return {'query': query or text}
@@ -0,0 +1,253 @@
+"""
+Pre-fork Launcher - Scales VoiceBot across cores on one host
+Builds the heavy objects (Whisper model, compiled command patterns, parsed
+responses) once in a parent process, then forks worker processes that share
+those memory pages copy-on-write. The parent supervises and restarts workers.
+"""
+
+import gc
+import os
+import sys
+import time
+import socket
+import signal
+import argparse
+import threading
+from typing import Dict, Optional
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.speech_recognition_engine import SpeechRecognizer
+from src.response_engine import ResponseEngine
+from src.advanced_command_interpreter import AdvancedCommandInterpreter
+from src.knowledge_base import open_knowledge_base
+from config.settings import (
+    DEBUG, WHISPER_MODEL_SIZE, PREFORK_WORKERS, PREFORK_HOST, PREFORK_PORT,
+    PREFORK_RESTART_DELAY, RESPONSE_HOT_RELOAD
+)
+
+
+class PreforkLauncher:
+    """Preloads shared state and supervises forked VoiceBot workers"""
+    
+    def __init__(self, workers: int = PREFORK_WORKERS, host: str = PREFORK_HOST,
+                 port: int = PREFORK_PORT, load_whisper: bool = True):
+        """
+        Initialize the launcher
+        
+        Args:
+            workers: Number of worker processes to fork
+            host: Address the shared listening socket binds to
+            port: Port the shared listening socket binds to
+            load_whisper: If False, skip loading the Whisper model (text-only sessions)
+        """
+        self.workers = max(1, workers)
+        self.host = host
+        self.port = port
+        self.load_whisper = load_whisper
+        
+        self.response_engine = None
+        self.command_interpreter = None
+        self.speech_recognizer = None
+        self.knowledge_base = None
+        self.listener = None
+        
+        self.children: Dict[int, int] = {}  # pid -> worker slot
+        self.is_running = False
+    
+    def preload(self):
+        """Build the heavy shared objects and freeze them out of the GC"""
+        print("[SYSTEM] Preloading shared state in parent process...")
+        self.response_engine = ResponseEngine()
+        self.command_interpreter = AdvancedCommandInterpreter()
+        self.knowledge_base = open_knowledge_base()
+        if self.load_whisper:
+            self.speech_recognizer = SpeechRecognizer(model_size=WHISPER_MODEL_SIZE)
+        
+        # Move everything allocated so far into the permanent generation so
+        # collections in the workers never touch (and unshare) these pages
+        gc.collect()
+        gc.freeze()
+        if DEBUG:
+            print(f"[DEBUG] Frozen objects: {gc.get_freeze_count()}")
+    
+    def bind(self):
+        """Open the listening socket shared by all workers"""
+        self.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.listener.bind((self.host, self.port))
+        self.listener.listen(128)
+        self.port = self.listener.getsockname()[1]
+        print(f"[SYSTEM] Listening on {self.host}:{self.port}")
+    
+    def serve_forever(self):
+        """Fork the workers and restart any that exit until shut down"""
+        if not hasattr(os, 'fork'):
+            print("ERROR: Pre-fork mode requires os.fork (POSIX only)")
+            return
+        
+        if self.response_engine is None:
+            self.preload()
+        if self.listener is None:
+            self.bind()
+        
+        self.is_running = True
+        signal.signal(signal.SIGTERM, self._handle_shutdown)
+        signal.signal(signal.SIGINT, self._handle_shutdown)
+        
+        for slot in range(self.workers):
+            self._spawn_worker(slot)
+        
+        try:
+            while self.is_running:
+                try:
+                    pid, status = os.wait()
+                except ChildProcessError:
+                    break
+                except InterruptedError:
+                    continue
+                
+                slot = self.children.pop(pid, None)
+                if slot is None or not self.is_running:
+                    continue
+                
+                print(f"[WARNING] Worker {slot} (pid {pid}) exited with status {status}, restarting")
+                time.sleep(PREFORK_RESTART_DELAY)
+                if self.is_running:
+                    self._spawn_worker(slot)
+        finally:
+            self.shutdown()
+    
+    def shutdown(self):
+        """Stop all workers and close the listening socket"""
+        self.is_running = False
+        
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        
+        for pid in list(self.children):
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+            self.children.pop(pid, None)
+        
+        if self.listener:
+            self.listener.close()
+            self.listener = None
+    
+    def _handle_shutdown(self, signum, frame):
+        """Signal handler for the parent process"""
+        self.is_running = False
+        raise SystemExit(0)
+    
+    def _spawn_worker(self, slot: int) -> int:
+        """Fork a single worker process for the given slot"""
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 0
+            try:
+                self._worker_main(slot)
+            except Exception as e:
+                print(f"ERROR: Worker {slot} crashed: {e}")
+                exit_code = 1
+            finally:
+                # os._exit skips atexit, so unsaved hit counts are written here
+                self._save_hit_stats()
+                os._exit(exit_code)
+        
+        self.children[pid] = slot
+        if DEBUG:
+            print(f"[DEBUG] Started worker {slot} (pid {pid})")
+        return pid
+    
+    def _save_hit_stats(self):
+        """Write the hit counts this worker has not saved yet"""
+        stats = {id(s): s for s in (self.command_interpreter.hit_stats, self.response_engine.hit_stats) if s}
+        for hit_stats in stats.values():
+            hit_stats.save()
+    
+    def _handle_worker_shutdown(self, signum, frame):
+        """SIGTERM in a worker: unwind to _spawn_worker so it can clean up"""
+        raise SystemExit(0)
+    
+    def _worker_main(self, slot: int):
+        """Accept and serve sessions inside a forked worker"""
+        signal.signal(signal.SIGTERM, self._handle_worker_shutdown)
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        
+        from src.main import VoiceBot
+        
+        bot = VoiceBot(
+            response_engine=self.response_engine,
+            command_interpreter=self.command_interpreter,
+            speech_recognizer=self.speech_recognizer,
+            knowledge_base=self.knowledge_base
+        )
+        
+        # Threads do not survive fork, so each worker runs its own watcher
+        if RESPONSE_HOT_RELOAD:
+            self.response_engine.start_watching()
+        
+        while True:
+            conn, address = self.listener.accept()
+            session = threading.Thread(
+                target=self._serve_session, args=(bot, conn, address), daemon=True
+            )
+            session.start()
+    
+    def _serve_session(self, bot, conn: socket.socket, address):
+        """
+        Serve one line-oriented text session
+        
+        Each line received is an utterance; each line sent back is the response.
+        The session ends when the user says goodbye or disconnects.
+        """
+        pending = []  # This session's slow commands, reported on its later turns
+        with conn, conn.makefile('rw', encoding='utf-8', newline='\n') as stream:
+            for line in stream:
+                user_input = line.strip()
+                if not user_input:
+                    continue
+                
+                should_exit = False
+                try:
+                    decision = bot.router.route(user_input)
+                    should_exit = decision.exit
+                    response = bot.respond_to(decision, pending)
+                except Exception as e:
+                    response = f"Error: {e}"
+                
+                stream.write(response.replace('\n', ' ') + '\n')
+                stream.flush()
+                
+                if should_exit:
+                    break
+
+
+def main(argv: Optional[list] = None):
+    """Pre-fork entry point"""
+    parser = argparse.ArgumentParser(description="Run VoiceBot as a pool of pre-forked workers")
+    parser.add_argument('--workers', type=int, default=PREFORK_WORKERS, help="Number of worker processes")
+    parser.add_argument('--host', default=PREFORK_HOST, help="Address to listen on")
+    parser.add_argument('--port', type=int, default=PREFORK_PORT, help="Port to listen on")
+    parser.add_argument('--no-whisper', action='store_true', help="Skip loading the Whisper model")
+    args = parser.parse_args(argv)
+    
+    launcher = PreforkLauncher(
+        workers=args.workers,
+        host=args.host,
+        port=args.port,
+        load_whisper=not args.no_whisper
+    )
+    launcher.preload()
+    launcher.bind()
+    launcher.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Response Compiler - Precompiles responses.json into a fast-load binary index
+The artifact holds the parsed response tables, the normalized patterns with
+their token index and substring automaton, and (when NumPy is available) the
+BM25 term-weight matrix. It is reused while the source file is unchanged.
+"""
+
+import gc
+import os
+import sys
+import json
+import pickle
+import hashlib
+import argparse
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.response_index import ResponseIndex
+from src.bm25_scorer import BM25Scorer, NUMPY_AVAILABLE
+
+# Bump whenever the pickled index layout changes
+ARTIFACT_VERSION = 2
+
+
+def artifact_path_for(source_path) -> Path:
+    """Default artifact location: next to the source with an .idx suffix"""
+    return Path(source_path).with_suffix('.idx')
+
+
+def source_fingerprint(source_path) -> Dict[str, Any]:
+    """
+    Stat and hash the source file
+    
+    Take the fingerprint before parsing the source: if the file changes in
+    between, the artifact merely looks stale on the next load.
+    """
+    source_path = Path(source_path)
+    stat = source_path.stat()
+    with open(source_path, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    return {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'sha256': digest}
+
+
+def save_compiled(source_path, responses_db: dict, index: ResponseIndex,
+                  scorer: Optional[BM25Scorer] = None, artifact_path=None,
+                  fingerprint: Optional[Dict[str, Any]] = None) -> Path:
+    """
+    Write an already-built index to the binary artifact
+    
+    Args:
+        source_path: The responses JSON file the index was built from
+        responses_db: Parsed responses database
+        index: Response index built from responses_db
+        scorer: Optional BM25 scorer built from index
+        artifact_path: Output path (defaults to artifact_path_for(source_path))
+        fingerprint: Source fingerprint taken before parsing (taken now if None)
+    
+    Returns:
+        Path of the written artifact
+    """
+    source_path = Path(source_path)
+    artifact_path = Path(artifact_path) if artifact_path else artifact_path_for(source_path)
+    
+    header = {'version': ARTIFACT_VERSION, 'source': fingerprint or source_fingerprint(source_path)}
+    payload = {'responses_db': responses_db, 'index': index, 'scorer': scorer}
+    
+    # Write to a temporary file and rename so readers never see a partial artifact
+    fd, tmp_path = tempfile.mkstemp(dir=str(artifact_path.parent), prefix=artifact_path.name, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, artifact_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    
+    return artifact_path
+
+
+def compile_responses(source_path, artifact_path=None, with_scorer: bool = True) -> Path:
+    """
+    Parse the responses JSON, build every index and write the artifact
+    
+    Args:
+        source_path: Path to the responses JSON file
+        artifact_path: Output path (defaults to artifact_path_for(source_path))
+        with_scorer: Also precompute the BM25 matrix when NumPy is available
+    
+    Returns:
+        Path of the written artifact
+    """
+    fingerprint = source_fingerprint(source_path)
+    with open(source_path, 'r') as f:
+        responses_db = json.load(f)
+    
+    index = ResponseIndex(responses_db)
+    scorer = BM25Scorer(index) if with_scorer and NUMPY_AVAILABLE else None
+    return save_compiled(source_path, responses_db, index, scorer, artifact_path, fingerprint)
+
+
+def load_compiled(source_path, artifact_path=None) -> Optional[Dict[str, Any]]:
+    """
+    Load the artifact if it is current for the source file
+    
+    The artifact is current when the source mtime and size match, or, if
+    they differ (e.g. after a checkout), when the source content hash does.
+    
+    Args:
+        source_path: Path to the responses JSON file
+        artifact_path: Artifact path (defaults to artifact_path_for(source_path))
+    
+    Returns:
+        Dict with responses_db, index and scorer (possibly None), or None if stale/missing
+    """
+    source_path = Path(source_path)
+    artifact_path = Path(artifact_path) if artifact_path else artifact_path_for(source_path)
+    
+    try:
+        stat = source_path.stat()
+        with open(artifact_path, 'rb') as f:
+            header = pickle.load(f)
+            if header.get('version') != ARTIFACT_VERSION:
+                return None
+            
+            source = header['source']
+            if (source['mtime_ns'], source['size']) != (stat.st_mtime_ns, stat.st_size):
+                if source_fingerprint(source_path)['sha256'] != source['sha256']:
+                    return None
+            
+            # Unpickling allocates many small objects; skip GC passes meanwhile
+            gc_enabled = gc.isenabled()
+            gc.disable()
+            try:
+                return pickle.load(f)
+            finally:
+                if gc_enabled:
+                    gc.enable()
+    except (OSError, EOFError, KeyError, pickle.UnpicklingError, AttributeError, ImportError):
+        return None
+
+
+def main(argv: Optional[list] = None):
+    """Command-line compile step"""
+    parser = argparse.ArgumentParser(description="Compile responses.json into a binary index")
+    parser.add_argument('source', nargs='?', default="data/responses.json", help="Responses JSON file")
+    parser.add_argument('--output', default=None, help="Artifact path (default: <source>.idx)")
+    parser.add_argument('--no-scorer', action='store_true', help="Skip the BM25 matrix")
+    args = parser.parse_args(argv)
+    
+    artifact = compile_responses(args.source, args.output, with_scorer=not args.no_scorer)
+    print(f"[SYSTEM] Compiled {args.source} -> {artifact}")
+
+
+if __name__ == "__main__":
+    main()
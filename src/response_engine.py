@@ -5,105 +5,353 @@ Response Engine - Handles pattern matching and response generation
 import json
 import random
 import re
+import threading
+from collections import namedtuple
 from pathlib import Path
-from typing import Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Union
+
+from src.response_index import ResponseIndex
+from src.response_store import ResponseStore
+from src.bm25_scorer import BM25Scorer, NUMPY_AVAILABLE
+from src.trigram_index import TrigramIndex
+from src.lsh_index import LSHIndex
+from src.response_compiler import load_compiled, save_compiled, source_fingerprint
+from src.file_watcher import FileWatcher
+from src.hit_stats import CATEGORIES, HitStats, open_hit_stats
+from src.lru_cache import LRUCache, MISSING
+from src.text_normalizer import normalize_text
+from config.settings import (
+    CONFIDENCE_THRESHOLD, RESPONSE_SCORING, RESPONSE_INDEX_CACHE, RESPONSE_WATCH_POLL_INTERVAL,
+    MATCH_CACHE_SIZE, FUZZY_MAX_EDITS, RESPONSE_BACKEND, RESPONSE_STORE_PATH
+)
+
+# Minimum confidence for the substring/word-overlap rules (0.9/0.7/0.6)
+OVERLAP_THRESHOLD = 0.3
+
+# Minimum cosine similarity for LSH matches; paraphrases of a short pattern
+# rarely share more than half of its hashed n-gram mass
+LSH_THRESHOLD = 0.35
+
+# Everything a lookup reads, swapped as one reference so a lookup never
+# mixes structures from before and after a reload. Each snapshot carries its
+# own match cache, so swapping in a new snapshot also invalidates the cache.
+ResponseSnapshot = namedtuple('ResponseSnapshot', ['responses_db', 'index', 'scorer', 'cache'])
 
 
 class ResponseEngine:
     """Manages hardcoded responses and pattern matching"""
     
-    def __init__(self, responses_path: str = "data/responses.json"):
+    def __init__(self, responses_path: str = "data/responses.json", scoring: str = RESPONSE_SCORING,
+                 use_cache: bool = RESPONSE_INDEX_CACHE, backend: str = RESPONSE_BACKEND,
+                 store_path: str = RESPONSE_STORE_PATH, hit_stats: Optional[HitStats] = None):
         """
         Initialize the response engine with responses from JSON file
         
         Args:
             responses_path: Path to the responses JSON file
+            scoring: "overlap" for the substring/word rules, "bm25" for graded scoring,
+                "fuzzy" for typo-tolerant trigram/edit-distance matching, "lsh" for
+                nearest-pattern matching over hashed n-gram vectors
+            use_cache: Load the compiled index artifact when it is current (and write it when not)
+            backend: "json" to hold the whole database in memory, "sqlite" to read
+                categories lazily from the store at store_path
+            store_path: SQLite response store (imported from responses_path when empty)
+            hit_stats: Records matched categories; with the SQLite backend the most
+                matched ones are preloaded (default: the shared statistics, if enabled)
         """
         self.responses_path = Path(responses_path)
-        self.responses_db = self._load_responses()
+        self.scoring = scoring
+        self.use_cache = use_cache
+        if self.scoring in ("bm25", "lsh") and not NUMPY_AVAILABLE:
+            print("Warning: NumPy not installed, falling back to overlap scoring")
+            self.scoring = "overlap"
+        
+        self._update_lock = threading.Lock()
+        self.watcher = None
+        self.hit_stats = hit_stats or open_hit_stats()
+        
+        self.store = None
+        if backend == "sqlite":
+            self.snapshot = self._open_store(store_path)
+        else:
+            self.snapshot = self._load_index()
     
-    def _load_responses(self) -> dict:
-        """Load responses from JSON file"""
+    @property
+    def responses_db(self) -> Optional[dict]:
+        """Parsed responses database of the current snapshot (None with the SQLite backend)"""
+        return self.snapshot.responses_db
+    
+    @property
+    def index(self) -> Union[ResponseIndex, ResponseStore]:
+        """Response index of the current snapshot (the store with the SQLite backend)"""
+        return self.snapshot.index
+    
+    @property
+    def scorer(self) -> Optional[Union[BM25Scorer, TrigramIndex, LSHIndex]]:
+        """Graded scorer of the current snapshot (None in overlap mode)"""
+        return self.snapshot.scorer
+    
+    def _load_responses(self, strict: bool = False) -> dict:
+        """
+        Load responses from JSON file
+        
+        Args:
+            strict: Raise on a missing or invalid file instead of returning {}
+        """
         try:
             with open(self.responses_path, 'r') as f:
                 return json.load(f)
         except FileNotFoundError:
+            if strict:
+                raise
             print(f"Warning: Responses file not found at {self.responses_path}")
             return {}
         except json.JSONDecodeError:
+            if strict:
+                raise
             print(f"Error: Invalid JSON in {self.responses_path}")
             return {}
     
+    def _open_store(self, store_path: str) -> ResponseSnapshot:
+        """
+        Open the SQLite response store, importing the JSON file into it when empty
+        
+        The store keeps its own generation-checked caches, so the snapshot's
+        match cache is disabled and edits from other processes show up on the
+        next lookup.
+        """
+        if self.scoring != "overlap":
+            print("Warning: The SQLite response backend supports overlap scoring only")
+            self.scoring = "overlap"
+        
+        self.store = ResponseStore(store_path)
+        if not len(self.store) and self.responses_path.exists():
+            self.store.import_json(self._load_responses())
+        
+        if self.hit_stats:
+            hits = self.hit_stats.hits(CATEGORIES)
+            self.store.preload(sorted(hits, key=lambda category: -hits[category]))
+        
+        return ResponseSnapshot(None, self.store, None, LRUCache(0))
+    
+    def _load_index(self, previous: Optional[ResponseSnapshot] = None, strict: bool = False) -> ResponseSnapshot:
+        """
+        Load the compiled index if current, otherwise build it from JSON
+        
+        Args:
+            previous: Snapshot to update incrementally when only some categories changed
+            strict: Raise on a missing or invalid responses file
+        """
+        if self.use_cache:
+            compiled = load_compiled(self.responses_path)
+            if compiled:
+                index = compiled['index']
+                scorer = compiled['scorer'] if self.scoring == "bm25" else None
+                if scorer is None:
+                    scorer = self._build_scorer(index)
+                return ResponseSnapshot(compiled['responses_db'], index, scorer, LRUCache(MATCH_CACHE_SIZE))
+        
+        fingerprint = None
+        if self.use_cache and self.responses_path.exists():
+            fingerprint = source_fingerprint(self.responses_path)
+        
+        responses_db = self._load_responses(strict=strict)
+        
+        changes = self._diff_categories(previous.responses_db, responses_db) if previous else None
+        if changes is not None:
+            index = previous.index.updated(changes) if changes else previous.index
+        else:
+            index = ResponseIndex(responses_db)
+        scorer = self._build_scorer(index)
+        
+        if fingerprint and responses_db:
+            # The artifact only carries the BM25 matrix; the trigram index is cheap to rebuild
+            bm25 = scorer if self.scoring == "bm25" else None
+            try:
+                save_compiled(self.responses_path, responses_db, index, bm25, fingerprint=fingerprint)
+            except OSError as e:
+                print(f"Warning: Could not write compiled responses index: {e}")
+        
+        return ResponseSnapshot(responses_db, index, scorer, LRUCache(MATCH_CACHE_SIZE))
+    
+    @staticmethod
+    def _diff_categories(old_db: dict, new_db: dict) -> Optional[Dict[str, Optional[dict]]]:
+        """
+        Compute per-category changes between two databases
+        
+        Returns:
+            Category -> new data (None if removed), or None when categories were
+            reordered or inserted mid-file and a full rebuild keeps tie order exact
+        """
+        kept = [category for category in old_db if category in new_db]
+        added = [category for category in new_db if category not in old_db]
+        if list(new_db) != kept + added:
+            return None
+        
+        changes = {category: None for category in old_db if category not in new_db}
+        for category, data in new_db.items():
+            if old_db.get(category) != data:
+                changes[category] = data
+        return changes
+    
     def find_response(self, user_input: str) -> Tuple[str, float]:
         """
         Find a matching response for the user input
         
         Args:
             user_input: The recognized speech text
-            
+        
         Returns:
             Tuple of (response, confidence_score)
         """
-        user_input = user_input.lower().strip()
-        best_match = None
-        best_confidence = 0.0
-        
-        # Search through all categories
-        for category, data in self.responses_db.items():
-            if category == "default":
-                continue
-            
-            patterns = data.get("patterns", [])
-            responses = data.get("responses", [])
-            
-            if not responses:
-                continue
-            
-            # Check each pattern
-            for pattern in patterns:
-                confidence = self._calculate_similarity(user_input, pattern)
-                
-                if confidence > best_confidence:
-                    best_confidence = confidence
-                    best_match = random.choice(responses)
+        _, response, confidence = self.answer(normalize_text(user_input))
+        return response, confidence
+    
+    def answer(self, user_text: str) -> Tuple[Optional[str], str, float]:
+        """
+        Find a response for already-normalized text
+        
+        Args:
+            user_text: Normalized user input (see normalize_text)
+        
+        Returns:
+            Tuple of (answering category, or None when the default response or
+            no response was used; response; confidence_score)
+        """
+        snapshot = self.snapshot
+        best_category, best_confidence = self._match_normalized(snapshot, user_text)
+        response, confidence = self._choose_response(snapshot, best_category, best_confidence)
+        
+        # Count only categories that were confident enough to answer
+        if best_category is None or best_confidence < self._threshold(snapshot):
+            return None, response, confidence
+        
+        if self.hit_stats:
+            self.hit_stats.record(CATEGORIES, best_category)
+        return best_category, response, confidence
+    
+    def find_responses(self, user_inputs: List[str]) -> List[Tuple[str, float]]:
+        """
+        Find responses for many inputs in one pass (e.g. offline evaluation)
+        
+        Args:
+            user_inputs: Recognized speech texts
+        
+        Returns:
+            List of (response, confidence_score), in input order
+        """
+        snapshot = self.snapshot
+        return [
+            self._choose_response(snapshot, category, confidence)
+            for category, confidence in self._match_batch(snapshot, user_inputs)
+        ]
+    
+    @staticmethod
+    def _choose_response(snapshot: ResponseSnapshot, best_category: Optional[str],
+                         best_confidence: float) -> Tuple[str, float]:
+        """Pick a response for a match result, falling back to the default category"""
+        index = snapshot.index
         
         # If no good match, use default response
-        if best_confidence < 0.3:
-            default_responses = self.responses_db.get("default", {}).get("responses", [])
+        if best_confidence < ResponseEngine._threshold(snapshot):
+            default_responses = index.get_responses("default")
             if default_responses:
                 return random.choice(default_responses), 0.1
         
-        return best_match or "I'm not sure how to respond to that.", best_confidence
+        if best_category is None:
+            return "I'm not sure how to respond to that.", best_confidence
+        
+        return random.choice(index.get_responses(best_category)), best_confidence
+    
+    @staticmethod
+    def _threshold(snapshot: ResponseSnapshot) -> float:
+        """Minimum confidence for the snapshot's scoring mode"""
+        if isinstance(snapshot.scorer, LSHIndex):
+            return LSH_THRESHOLD
+        return CONFIDENCE_THRESHOLD if snapshot.scorer else OVERLAP_THRESHOLD
     
-    def _calculate_similarity(self, user_text: str, pattern: str) -> float:
+    def match(self, user_input: str) -> Tuple[Optional[str], float]:
         """
-        Calculate similarity between user input and pattern
-        Simple substring and word matching
+        Find the best matching category for the user input
         
         Args:
-            user_text: User's input
-            pattern: Pattern to match against
-            
+            user_input: The recognized speech text
+        
         Returns:
-            Confidence score between 0 and 1
+            Tuple of (category name or None, confidence_score)
+        """
+        return self._match(self.snapshot, user_input)
+    
+    def match_batch(self, user_inputs: List[str]) -> List[Tuple[Optional[str], float]]:
         """
-        user_words = set(user_text.split())
-        pattern_words = set(pattern.split())
+        Find the best matching category for many inputs
         
-        # If pattern is a substring of user input
-        if pattern in user_text:
-            return 0.9
+        Args:
+            user_inputs: Recognized speech texts
         
-        # If any word from pattern is in user input
-        if pattern_words & user_words:
-            return 0.7
+        Returns:
+            List of (category name or None, confidence_score), in input order
+        """
+        return self._match_batch(self.snapshot, user_inputs)
+    
+    @staticmethod
+    def _match_batch(snapshot: ResponseSnapshot, user_inputs: List[str]) -> List[Tuple[Optional[str], float]]:
+        """
+        Match many inputs against one snapshot
         
-        # Check for partial matches
-        for word in pattern_words:
-            if word in user_text:
-                return 0.6
+        Each distinct input is normalized once and each distinct normalized
+        text is scored once (vectorized in BM25 mode). The match cache is
+        bypassed so a large batch does not evict interactive entries.
+        """
+        normalized_by_input = {}
+        normalized = []
+        for user_input in user_inputs:
+            user_text = normalized_by_input.get(user_input)
+            if user_text is None:
+                user_text = normalized_by_input[user_input] = normalize_text(user_input)
+            normalized.append(user_text)
+        
+        unique_texts = list(dict.fromkeys(normalized))
+        scorer = snapshot.scorer
+        if isinstance(scorer, BM25Scorer):
+            scored = scorer.match_batch(unique_texts)
+        elif scorer:
+            scored = [scorer.match(user_text) for user_text in unique_texts]
+        else:
+            scored = [snapshot.index.match(user_text) for user_text in unique_texts]
+        
+        result_by_text = dict(zip(unique_texts, scored))
+        return [result_by_text[user_text] for user_text in normalized]
+    
+    @staticmethod
+    def _match(snapshot: ResponseSnapshot, user_input: str) -> Tuple[Optional[str], float]:
+        """Match against one consistent snapshot, through its normalized-input cache"""
+        return ResponseEngine._match_normalized(snapshot, normalize_text(user_input))
+    
+    @staticmethod
+    def _match_normalized(snapshot: ResponseSnapshot, user_text: str) -> Tuple[Optional[str], float]:
+        """Match already-normalized text against one snapshot"""
+        cached = snapshot.cache.get(user_text)
+        if cached is not MISSING:
+            return cached
+        
+        if snapshot.scorer:
+            result = snapshot.scorer.match(user_text)
+        else:
+            result = snapshot.index.match(user_text)
         
-        return 0.0
+        snapshot.cache.put(user_text, result)
+        return result
+    
+    def _build_scorer(self, index: ResponseIndex) -> Optional[Union[BM25Scorer, TrigramIndex, LSHIndex]]:
+        """Build the graded scorer for the configured scoring mode"""
+        if self.scoring == "bm25":
+            return BM25Scorer(index)
+        if self.scoring == "fuzzy":
+            return TrigramIndex(index, max_edits=FUZZY_MAX_EDITS)
+        if self.scoring == "lsh":
+            return LSHIndex(index)
+        return None
     
     def add_category(self, category_name: str, patterns: list, responses: list):
         """
@@ -114,14 +362,63 @@ class ResponseEngine:
             patterns: List of patterns to match
             responses: List of responses for this category
         """
-        self.responses_db[category_name] = {
-            "patterns": patterns,
-            "responses": responses
-        }
+        if self.store:
+            self.store.put_category(category_name, patterns, responses)
+            return
+        
+        with self._update_lock:
+            snapshot = self.snapshot
+            responses_db = dict(snapshot.responses_db)
+            responses_db[category_name] = {
+                "patterns": patterns,
+                "responses": responses
+            }
+            index = snapshot.index.updated({category_name: responses_db[category_name]})
+            self.snapshot = ResponseSnapshot(responses_db, index, self._build_scorer(index), LRUCache(MATCH_CACHE_SIZE))
+    
+    def reload_responses(self) -> bool:
+        """
+        Reload responses from the JSON file (or its current compiled index)
+        
+        The new index is built while lookups keep using the current one, then
+        swapped in with a single assignment. Only changed categories are
+        re-indexed when the file's category order is otherwise unchanged.
+        If the file is missing or invalid the current responses are kept.
+        
+        Returns:
+            True if new responses were swapped in
+        """
+        if self.store:
+            # The store picks up every committed edit on its own
+            return False
+        
+        with self._update_lock:
+            try:
+                snapshot = self._load_index(previous=self.snapshot, strict=True)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"Error: Keeping current responses, reload of {self.responses_path} failed: {e}")
+                return False
+            self.snapshot = snapshot
+            return True
+    
+    def start_watching(self, poll_interval: float = RESPONSE_WATCH_POLL_INTERVAL):
+        """
+        Hot-reload the responses file whenever it is edited
+        
+        Args:
+            poll_interval: Seconds between checks when inotify is unavailable
+        """
+        if self.store:
+            return
+        
+        if self.watcher is None:
+            self.watcher = FileWatcher(self.responses_path, self.reload_responses, poll_interval=poll_interval)
+        self.watcher.start()
     
-    def reload_responses(self):
-        """Reload responses from the JSON file"""
-        self.responses_db = self._load_responses()
+    def stop_watching(self):
+        """Stop hot-reloading the responses file"""
+        if self.watcher:
+            self.watcher.stop()
 
 
 # Example usage
@@ -0,0 +1,199 @@
+"""
+Response Index - Inverted token index over response patterns
+Lets ResponseEngine score only the patterns that share a token or substring
+with the user input instead of every pattern in the database
+"""
+
+import copy
+from typing import Dict, List, Optional, Tuple
+
+from src.aho_corasick import AhoCorasick
+from src.text_normalizer import normalize_text
+
+
+class ResponseIndex:
+    """Inverted index from pattern tokens to (category, pattern) postings"""
+    
+    def __init__(self, responses_db: dict):
+        """
+        Build the index from a parsed responses database
+        
+        Args:
+            responses_db: Mapping of category name to {"patterns": [...], "responses": [...]}
+        """
+        self.categories: List[str] = []
+        self.category_ids: Dict[str, int] = {}
+        self.responses: Dict[str, list] = {}
+        
+        # Pattern table: pattern id -> (category id, position, pattern, pattern words)
+        self.patterns: List[Optional[Tuple[int, int, str, frozenset]]] = []
+        self.category_patterns: Dict[int, List[int]] = {}
+        
+        # Token -> pattern ids containing that token
+        self.postings: Dict[str, List[int]] = {}
+        
+        # Full pattern text -> pattern ids with exactly that text
+        self.pattern_ids: Dict[str, List[int]] = {}
+        
+        # One automaton over every pattern and pattern word
+        self.automaton = AhoCorasick()
+        
+        for category, data in responses_db.items():
+            self.add_category(category, data.get("patterns", []), data.get("responses", []), rebuild=False)
+        self.rebuild_automaton()
+    
+    def add_category(self, category: str, patterns: list, responses: list, rebuild: bool = True):
+        """
+        Index a category, replacing any existing category with the same name
+        
+        Args:
+            category: Name of the category
+            patterns: List of patterns to match
+            responses: List of responses for this category
+            rebuild: If True, rebuild the substring automaton afterwards
+        """
+        if category in self.category_ids:
+            category_id = self.category_ids[category]
+            self._remove_patterns(category_id)
+        else:
+            category_id = len(self.categories)
+            self.categories.append(category)
+            self.category_ids[category] = category_id
+        
+        self.responses[category] = list(responses)
+        self.category_patterns[category_id] = []
+        
+        # The default category and categories without responses never match
+        if category != "default" and responses:
+            for position, pattern in enumerate(patterns):
+                pattern = normalize_text(pattern)
+                pattern_id = len(self.patterns)
+                words = frozenset(pattern.split())
+                self.patterns.append((category_id, position, pattern, words))
+                self.category_patterns[category_id].append(pattern_id)
+                
+                self.pattern_ids.setdefault(pattern, []).append(pattern_id)
+                for word in words:
+                    self.postings.setdefault(word, []).append(pattern_id)
+        
+        if rebuild:
+            self.rebuild_automaton()
+    
+    def remove_category(self, category: str, rebuild: bool = True):
+        """
+        Remove a category from the index
+        
+        Args:
+            category: Name of the category
+            rebuild: If True, rebuild the substring automaton afterwards
+        """
+        category_id = self.category_ids.pop(category, None)
+        if category_id is None:
+            return
+        
+        self._remove_patterns(category_id)
+        del self.category_patterns[category_id]
+        del self.responses[category]
+        
+        if rebuild:
+            self.rebuild_automaton()
+    
+    def get_responses(self, category: str) -> list:
+        """Responses of a category ([] if it does not exist)"""
+        return self.responses.get(category, [])
+    
+    def updated(self, changes: Dict[str, Optional[dict]]) -> 'ResponseIndex':
+        """
+        Return a new index with only the changed categories re-indexed
+        
+        This index is left untouched, so lookups running against it stay
+        consistent while the new one is built.
+        
+        Args:
+            changes: Category name -> new {"patterns", "responses"} data, or None to remove
+            
+        Returns:
+            The updated index
+        """
+        new_index = copy.copy(self)
+        new_index.categories = list(self.categories)
+        new_index.category_ids = dict(self.category_ids)
+        new_index.responses = dict(self.responses)
+        new_index.patterns = list(self.patterns)
+        new_index.category_patterns = dict(self.category_patterns)
+        new_index.postings = {key: list(ids) for key, ids in self.postings.items()}
+        new_index.pattern_ids = {key: list(ids) for key, ids in self.pattern_ids.items()}
+        
+        for category, data in changes.items():
+            if data is None:
+                new_index.remove_category(category, rebuild=False)
+            else:
+                new_index.add_category(category, data.get("patterns", []), data.get("responses", []), rebuild=False)
+        
+        new_index.rebuild_automaton()
+        return new_index
+    
+    def _remove_patterns(self, category_id: int):
+        """Drop every pattern of a category from the postings"""
+        for pattern_id in self.category_patterns.get(category_id, []):
+            _, _, pattern, words = self.patterns[pattern_id]
+            for key, table in [(pattern, self.pattern_ids)] + [(word, self.postings) for word in words]:
+                postings = table.get(key)
+                if postings is None:
+                    continue
+                postings.remove(pattern_id)
+                if not postings:
+                    del table[key]
+            self.patterns[pattern_id] = None
+        self.category_patterns[category_id] = []
+    
+    def rebuild_automaton(self):
+        """Rebuild the Aho-Corasick automaton over all patterns and pattern words"""
+        self.automaton = AhoCorasick(set(self.pattern_ids) | set(self.postings))
+    
+    def match(self, user_text: str) -> Tuple[Optional[str], float]:
+        """
+        Find the best matching category for the input
+        
+        One automaton scan finds every pattern (0.9) and pattern word (0.6)
+        occurring as a substring; whole-word overlap upgrades the latter to
+        0.7. Among equal scores the first category and pattern in database
+        order wins, exactly as a full scan would.
+        
+        Args:
+            user_text: Normalized user input (see normalize_text)
+        
+        Returns:
+            Tuple of (category name or None, confidence_score)
+        """
+        found = self.automaton.find_all(user_text)
+        if not found:
+            return None, 0.0
+        
+        # If pattern is a substring of user input
+        exact = [pattern_id for key in found for pattern_id in self.pattern_ids.get(key, ())]
+        if exact:
+            return self._best(exact), 0.9
+        
+        # If any word from pattern is in user input
+        overlap = [pattern_id for word in found & set(user_text.split())
+                   for pattern_id in self.postings.get(word, ())]
+        if overlap:
+            return self._best(overlap), 0.7
+        
+        # Partial matches: a pattern word occurs inside an input word
+        partial = [pattern_id for key in found for pattern_id in self.postings.get(key, ())]
+        if partial:
+            return self._best(partial), 0.6
+        
+        return None, 0.0
+    
+    def _best(self, pattern_ids: List[int]) -> str:
+        """Return the category of the earliest pattern in database order"""
+        category_id, _, _, _ = self.patterns[min(pattern_ids, key=self._sort_key)]
+        return self.categories[category_id]
+    
+    def _sort_key(self, pattern_id: int) -> Tuple[int, int]:
+        """Order pattern ids by category then pattern position"""
+        category_id, position, _, _ = self.patterns[pattern_id]
+        return category_id, position
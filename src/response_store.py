@@ -0,0 +1,378 @@
+"""
+Response Store - SQLite-backed response database with lazy category loading
+Keeps categories, patterns and responses on disk with a word index, so a
+process only holds the categories it actually uses. WAL mode lets many
+readers keep matching while an editor process updates the database.
+"""
+
+import os
+import sys
+import json
+import sqlite3
+import argparse
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.lru_cache import LRUCache, MISSING
+from src.text_normalizer import normalize_text
+from config.settings import MATCH_CACHE_SIZE, RESPONSE_STORE_WORKING_SET
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('generation', 0);
+
+CREATE TABLE IF NOT EXISTS categories (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    position INTEGER NOT NULL,
+    matchable INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS patterns (
+    id INTEGER PRIMARY KEY,
+    category_id INTEGER NOT NULL REFERENCES categories(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    pattern TEXT NOT NULL,
+    normalized TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS patterns_by_category ON patterns(category_id, position);
+CREATE INDEX IF NOT EXISTS patterns_empty ON patterns(category_id) WHERE normalized = '';
+
+CREATE TABLE IF NOT EXISTS pattern_words (
+    word TEXT NOT NULL,
+    pattern_id INTEGER NOT NULL REFERENCES patterns(id) ON DELETE CASCADE,
+    PRIMARY KEY (word, pattern_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS pattern_words_by_pattern ON pattern_words(pattern_id);
+
+CREATE TABLE IF NOT EXISTS responses (
+    id INTEGER PRIMARY KEY,
+    category_id INTEGER NOT NULL REFERENCES categories(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    response TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_by_category ON responses(category_id, position);
+"""
+
+CANDIDATES_SQL = """
+SELECT p.id, c.position, p.position, p.normalized, c.name
+FROM pattern_words w
+JOIN patterns p ON p.id = w.pattern_id
+JOIN categories c ON c.id = p.category_id
+WHERE w.word IN ({placeholders}) AND c.matchable
+"""
+
+EMPTY_PATTERNS_SQL = """
+SELECT p.id, c.position, p.position, p.normalized, c.name
+FROM patterns p
+JOIN categories c ON c.id = p.category_id
+WHERE p.normalized = '' AND c.matchable
+"""
+
+# Stay well below SQLite's host-parameter limit
+MAX_PARAMETERS = 500
+
+
+class ResponseStore:
+    """Response database in SQLite with an LRU working set of categories"""
+    
+    def __init__(self, db_path: str, working_set: int = RESPONSE_STORE_WORKING_SET,
+                 match_cache_size: int = MATCH_CACHE_SIZE):
+        """
+        Open (and create if needed) the store
+        
+        Args:
+            db_path: SQLite database file
+            working_set: Categories kept in memory at most
+            match_cache_size: Normalized inputs whose match result is remembered
+        """
+        self.db_path = Path(db_path)
+        self.categories_cache = LRUCache(working_set)
+        self.match_cache = LRUCache(match_cache_size)
+        
+        # Generation of the data the caches were filled from; editors bump
+        # the stored generation on every write, in any process
+        self._generation = None
+        self._max_word_length = 0
+        self._cache_lock = threading.Lock()
+        self._local = threading.local()
+        
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+    
+    def _connection(self) -> sqlite3.Connection:
+        """Per-thread connection (sqlite3 connections must not be shared across threads)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+    
+    def close(self):
+        """Close this thread's connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+    
+    def _sync(self, conn: sqlite3.Connection) -> int:
+        """Drop cached categories and matches if the database changed since they were loaded"""
+        generation = conn.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()[0]
+        if generation != self._generation:
+            with self._cache_lock:
+                if generation != self._generation:
+                    self.categories_cache.clear()
+                    self.match_cache.clear()
+                    row = conn.execute("SELECT max(length(word)) FROM pattern_words").fetchone()
+                    self._max_word_length = row[0] or 0
+                    self._generation = generation
+        return generation
+    
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT count(*) FROM categories").fetchone()[0]
+    
+    def category_names(self) -> List[str]:
+        """All category names in database order"""
+        rows = self._connection().execute("SELECT name FROM categories ORDER BY position")
+        return [name for name, in rows]
+    
+    def get_category(self, category: str) -> Optional[dict]:
+        """
+        Load a category through the working set
+        
+        Args:
+            category: Name of the category
+        
+        Returns:
+            {"patterns": [...], "responses": [...]}, or None if it does not exist
+        """
+        conn = self._connection()
+        generation = self._sync(conn)
+        
+        data = self.categories_cache.get(category)
+        if data is not MISSING:
+            return data
+        
+        row = conn.execute("SELECT id FROM categories WHERE name = ?", (category,)).fetchone()
+        if row is None:
+            data = None
+        else:
+            category_id = row[0]
+            data = {
+                "patterns": [pattern for pattern, in conn.execute(
+                    "SELECT pattern FROM patterns WHERE category_id = ? ORDER BY position", (category_id,))],
+                "responses": [response for response, in conn.execute(
+                    "SELECT response FROM responses WHERE category_id = ? ORDER BY position", (category_id,))],
+            }
+        
+        if generation == self._generation:
+            self.categories_cache.put(category, data)
+        return data
+    
+    def preload(self, categories: List[str]):
+        """
+        Fill the working set ahead of the first lookups
+        
+        Args:
+            categories: Category names, most important first; only as many as
+                the working set holds are loaded
+        """
+        for category in reversed(categories[:self.categories_cache.maxsize]):
+            self.get_category(category)
+    
+    def get_responses(self, category: str) -> list:
+        """Responses of a category ([] if it does not exist)"""
+        data = self.get_category(category)
+        return data["responses"] if data else []
+    
+    def match(self, user_text: str) -> Tuple[Optional[str], float]:
+        """
+        Find the best matching category for the input
+        
+        Same rules and tie order as ResponseIndex.match: a pattern occurring
+        as a substring scores 0.9, a pattern word equal to an input word 0.7,
+        and a pattern word inside an input word 0.6. Only patterns with a word
+        that is a substring of some input word are read from the database.
+        
+        Args:
+            user_text: Normalized user input (see normalize_text)
+        
+        Returns:
+            Tuple of (category name or None, confidence_score)
+        """
+        conn = self._connection()
+        generation = self._sync(conn)
+        
+        cached = self.match_cache.get(user_text)
+        if cached is not MISSING:
+            return cached
+        
+        result = self._match_uncached(conn, user_text)
+        if generation == self._generation:
+            self.match_cache.put(user_text, result)
+        return result
+    
+    def _match_uncached(self, conn: sqlite3.Connection, user_text: str) -> Tuple[Optional[str], float]:
+        """Fetch candidate patterns and apply the overlap rules"""
+        input_words = set(user_text.split())
+        
+        # Pattern words hold no spaces, so one occurring in the input lies
+        # inside a single input word
+        longest = self._max_word_length
+        fragments = {
+            word[start:end]
+            for word in input_words
+            for start in range(len(word))
+            for end in range(start + 1, min(len(word), start + longest) + 1)
+        }
+        
+        candidates = {}
+        fragments = list(fragments)
+        for start in range(0, len(fragments), MAX_PARAMETERS):
+            chunk = fragments[start:start + MAX_PARAMETERS]
+            sql = CANDIDATES_SQL.format(placeholders=", ".join("?" * len(chunk)))
+            for row in conn.execute(sql, chunk):
+                candidates[row[0]] = row
+        for row in conn.execute(EMPTY_PATTERNS_SQL):
+            candidates[row[0]] = row
+        
+        if not candidates:
+            return None, 0.0
+        
+        # (category position, pattern position) orders patterns as the JSON file does
+        exact = [row for row in candidates.values() if row[3] in user_text]
+        if exact:
+            return min(exact, key=self._sort_key)[4], 0.9
+        
+        overlap = [row for row in candidates.values() if input_words.intersection(row[3].split())]
+        if overlap:
+            return min(overlap, key=self._sort_key)[4], 0.7
+        
+        return min(candidates.values(), key=self._sort_key)[4], 0.6
+    
+    @staticmethod
+    def _sort_key(row: tuple) -> Tuple[int, int]:
+        return row[1], row[2]
+    
+    def put_category(self, category: str, patterns: list, responses: list):
+        """
+        Add a category, replacing any existing category with the same name
+        
+        A replaced category keeps its position in the database order.
+        
+        Args:
+            category: Name of the category
+            patterns: List of patterns to match
+            responses: List of responses for this category
+        """
+        with self._write() as conn:
+            self._put_category(conn, category, patterns, responses)
+    
+    def delete_category(self, category: str):
+        """Remove a category and its patterns and responses"""
+        with self._write() as conn:
+            conn.execute("DELETE FROM categories WHERE name = ?", (category,))
+    
+    def import_json(self, responses_db: dict):
+        """
+        Replace the whole store with a parsed responses database
+        
+        Args:
+            responses_db: Mapping of category name to {"patterns": [...], "responses": [...]}
+        """
+        with self._write() as conn:
+            conn.execute("DELETE FROM categories")
+            for category, data in responses_db.items():
+                self._put_category(conn, category, data.get("patterns", []), data.get("responses", []))
+    
+    def export_json(self) -> Dict[str, dict]:
+        """Read the whole store back into the JSON layout"""
+        return {category: self.get_category(category) for category in self.category_names()}
+    
+    def _write(self) -> '_WriteTransaction':
+        """Context manager for one write transaction that bumps the generation"""
+        return _WriteTransaction(self)
+    
+    @staticmethod
+    def _put_category(conn: sqlite3.Connection, category: str, patterns: list, responses: list):
+        """Write one category inside an open transaction"""
+        # The default category and categories without responses never match
+        matchable = int(category != "default" and bool(responses))
+        
+        row = conn.execute("SELECT id, position FROM categories WHERE name = ?", (category,)).fetchone()
+        if row is None:
+            position = conn.execute("SELECT coalesce(max(position) + 1, 0) FROM categories").fetchone()[0]
+        else:
+            position = row[1]
+            conn.execute("DELETE FROM categories WHERE id = ?", (row[0],))
+        
+        category_id = conn.execute(
+            "INSERT INTO categories (name, position, matchable) VALUES (?, ?, ?)",
+            (category, position, matchable)
+        ).lastrowid
+        
+        for pattern_position, pattern in enumerate(patterns):
+            normalized = normalize_text(pattern)
+            pattern_id = conn.execute(
+                "INSERT INTO patterns (category_id, position, pattern, normalized) VALUES (?, ?, ?, ?)",
+                (category_id, pattern_position, pattern, normalized)
+            ).lastrowid
+            conn.executemany(
+                "INSERT OR IGNORE INTO pattern_words (word, pattern_id) VALUES (?, ?)",
+                [(word, pattern_id) for word in set(normalized.split())]
+            )
+        
+        conn.executemany(
+            "INSERT INTO responses (category_id, position, response) VALUES (?, ?, ?)",
+            [(category_id, response_position, response) for response_position, response in enumerate(responses)]
+        )
+
+
+class _WriteTransaction:
+    """Immediate write transaction; readers see all of it or none of it"""
+    
+    def __init__(self, store: ResponseStore):
+        self.store = store
+        self.conn = None
+    
+    def __enter__(self) -> sqlite3.Connection:
+        self.conn = self.store._connection()
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+    
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is not None:
+            self.conn.rollback()
+            return False
+        
+        self.conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'generation'")
+        self.conn.commit()
+        return False
+
+
+def main(argv: Optional[list] = None):
+    """Command-line import of a responses JSON file"""
+    parser = argparse.ArgumentParser(description="Import responses.json into a SQLite response store")
+    parser.add_argument('source', nargs='?', default="data/responses.json", help="Responses JSON file")
+    parser.add_argument('--output', default="data/responses.db", help="SQLite database path")
+    args = parser.parse_args(argv)
+    
+    with open(args.source, 'r') as f:
+        responses_db = json.load(f)
+    
+    store = ResponseStore(args.output)
+    store.import_json(responses_db)
+    print(f"[SYSTEM] Imported {len(responses_db)} categories from {args.source} -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
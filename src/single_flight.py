@@ -0,0 +1,62 @@
+"""
+Single Flight - Coalesces identical concurrent calls into one
+The first caller for a key runs the call; callers arriving while it is in
+flight wait for it and receive the same result, or the same exception,
+instead of repeating the work (a network request or a subprocess)
+"""
+
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """At most one in-flight call per key; later callers share its outcome"""
+    
+    def __init__(self):
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+    
+    def do(self, key: Hashable, function: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Call function(*args, **kwargs), unless a call for key is already running
+        
+        Args:
+            key: Identifies calls that are interchangeable
+            function: The work to run
+        
+        Returns:
+            The result of the call this caller ran or joined
+        
+        Raises:
+            Whatever the shared call raised
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+        
+        if not leader:
+            return future.result()
+        
+        try:
+            result = function(*args, **kwargs)
+        except BaseException as e:
+            self._finish(key)
+            future.set_exception(e)
+            raise
+        
+        self._finish(key)
+        future.set_result(result)
+        return result
+    
+    def _finish(self, key: Hashable):
+        """Stop sharing a call: callers from now on start a new one"""
+        with self._lock:
+            self._calls.pop(key, None)
+    
+    def in_flight(self, key: Hashable) -> bool:
+        """True while a call for key is running"""
+        with self._lock:
+            return key in self._calls
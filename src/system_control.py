@@ -12,50 +12,91 @@ Provides capabilities to:
 
 import subprocess
 import os
-import json
+import sys
 import re
-from typing import Dict, Any, Optional, List
+from typing import Callable, Dict, Any, Optional, List
 from datetime import datetime, timedelta
 import socket
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.command_helper import create_backend
+from src.http_client import HTTPClient, shared_client
+from src.linux_system import LinuxSystem
+from src.single_flight import SingleFlight
+from src.telemetry import TelemetrySampler
+from src.ttl_cache import TTLCache
+from config.settings import LOCATION_CACHE_TTL, WEATHER_CACHE_TTL, STATUS_CACHE_TTL, LOCATION_API_URL, WEATHER_API_URL
+from config.settings import TELEMETRY_ENABLED
+
 
 class SystemControl:
     """Handles system-level operations for voice bot"""
     
-    def __init__(self):
-        """Initialize system control"""
+    def __init__(self, command_backend=None, http: Optional[HTTPClient] = None,
+                 telemetry: bool = TELEMETRY_ENABLED):
+        """
+        Initialize system control
+        
+        Args:
+            command_backend: Runs external commands (see command_helper); by
+                default the one named by COMMAND_HELPER_BACKEND
+            http: Client for the location and weather APIs (default: the shared pool)
+            telemetry: Sample the system status in the background (see telemetry)
+        """
         self.is_macos = os.uname().sysname == 'Darwin'
-        if not self.is_macos:
+        
+        # On Linux, queries are answered in-process from /proc and /sys
+        self.linux = LinuxSystem() if os.uname().sysname == 'Linux' else None
+        if not self.is_macos and not self.linux:
             print("[WARNING] System control module optimized for macOS")
         
-        # Cache for frequently accessed data
-        self.location_cache = None
-        self.weather_cache = None
-        self.cache_time = {}
+        # Query results by resource; expired ones are served while they refresh,
+        # and concurrent lookups of the same resource share one fetch
+        self.cache = TTLCache()
+        self.flights = SingleFlight()
+        
+        # Persistent helper shells avoid starting a process per command
+        self.command_backend = command_backend or create_backend()
+        self.http = http or shared_client()
+        
+        # Keeps battery, disk and network readings fresh in the cache and records trends
+        self.telemetry = TelemetrySampler(self) if telemetry else None
+        if self.telemetry:
+            self.telemetry.start()
+    
+    def _run(self, args: List[str], timeout: float, check: bool = False) -> subprocess.CompletedProcess:
+        """
+        Run an external command through the command backend (text output captured)
+        
+        Raises:
+            FileNotFoundError: if the program is missing (whichever backend runs it)
+            subprocess.CalledProcessError: if check is set and the command failed
+        """
+        return self.command_backend.run(args, timeout, check)
+    
+    def _cached(self, key: str, loader: Callable[[], Dict[str, Any]], ttl: float) -> Dict[str, Any]:
+        """Serve a query result through the cache, tagged with its age in seconds (cache_age)"""
+        if self.telemetry:
+            self.telemetry.note_query()
+        cached = self.cache.get(key, loader, ttl, cacheable=lambda result: 'error' not in result)
+        return dict(cached.value, cache_age=round(cached.age, 1))
     
     # ==================== LOCATION & MAPS ====================
     
     def get_location(self) -> Dict[str, Any]:
         """
-        Get device location using macOS location services
-        Returns: {latitude, longitude, accuracy, address}
+        Get device location (cached for LOCATION_CACHE_TTL seconds)
+        Returns: {latitude, longitude, city, region, country, accuracy, cache_age}
         """
+        return self._cached('location', self._fetch_location, LOCATION_CACHE_TTL)
+    
+    def _fetch_location(self) -> Dict[str, Any]:
+        """Look up the location from the public IP address"""
         try:
-            # Use CoreLocation framework via Python
-            # Falls back to public IP geolocation if CoreLocation unavailable
-            
-            # Try method 1: macOS CoreLocation (more accurate)
-            result = subprocess.run(
-                ['open', '-g', 'get://'],  # Opens Maps in background
-                capture_output=True
-            )
-            
-            # Method 2: Use public IP geolocation (works without CoreLocation)
             location = self._get_location_from_ip()
             
             if location:
-                self.location_cache = location
-                self.cache_time['location'] = datetime.now()
                 return location
             
             return {"error": "Could not determine location"}
@@ -66,12 +107,8 @@ class SystemControl:
     def _get_location_from_ip(self) -> Optional[Dict]:
         """Get approximate location from public IP address"""
         try:
-            import urllib.request
-            import json
-            
             # Use free geolocation API
-            response = urllib.request.urlopen('https://ipapi.co/json/', timeout=5)
-            data = json.loads(response.read().decode())
+            data = self.http.get_json(LOCATION_API_URL)
             
             return {
                 'latitude': data.get('latitude'),
@@ -103,7 +140,7 @@ class SystemControl:
             
             # Open in Maps app with search
             search_url = f"maps://search?q={query}&center={location['latitude']},{location['longitude']}"
-            subprocess.run(['open', search_url])
+            self._run(['open', search_url], timeout=3, check=True)
             
             return [{
                 "action": "opened",
@@ -126,26 +163,27 @@ class SystemControl:
     
     def get_weather(self) -> Dict[str, Any]:
         """
-        Get current weather using online API
+        Get current weather (cached for WEATHER_CACHE_TTL seconds)
         Requires internet connection
         """
+        return self._cached('weather', self._fetch_weather, WEATHER_CACHE_TTL)
+    
+    def _fetch_weather(self) -> Dict[str, Any]:
+        """Fetch current weather for the current location from Open-Meteo"""
         try:
+            # Connect to the weather API while the location is looked up
+            self.http.executor.submit(self.http.preconnect, WEATHER_API_URL)
             location = self.get_location()
             
             if 'error' in location:
                 return {"error": "Cannot fetch weather without location"}
             
             # Use Open-Meteo free weather API (no API key needed)
-            import urllib.request
-            import json
-            
-            lat = location['latitude']
-            lon = location['longitude']
-            
-            url = f"https://api.open-meteo.com/v1/forecast?latitude={lat}&longitude={lon}&current=temperature_2m,weather_code,wind_speed_10m,relative_humidity_2m"
-            
-            response = urllib.request.urlopen(url, timeout=5)
-            data = json.loads(response.read().decode())
+            data = self.http.get_json(WEATHER_API_URL, {
+                'latitude': location['latitude'],
+                'longitude': location['longitude'],
+                'current': 'temperature_2m,weather_code,wind_speed_10m,relative_humidity_2m'
+            })
             
             current = data.get('current', {})
             
@@ -158,8 +196,6 @@ class SystemControl:
                 'timestamp': datetime.now().isoformat()
             }
             
-            self.weather_cache = weather
-            self.cache_time['weather'] = datetime.now()
             return weather
         
         except Exception as e:
@@ -199,6 +235,9 @@ class SystemControl:
     
     def get_system_info(self) -> Dict[str, str]:
         """Get comprehensive system information"""
+        if self.linux:
+            return self.linux.system_info()
+        
         try:
             import platform
             
@@ -213,7 +252,7 @@ class SystemControl:
             
             # Get additional macOS info
             if self.is_macos:
-                result = subprocess.run(['sw_vers'], capture_output=True, text=True)
+                result = self._run(['sw_vers'], timeout=5)
                 info['macos_version'] = result.stdout.strip()
             
             return info
@@ -222,12 +261,18 @@ class SystemControl:
             return {'error': f"System info error: {e}"}
     
     def get_battery_status(self) -> Dict[str, Any]:
-        """Get battery information"""
+        """Get battery information (cached for STATUS_CACHE_TTL seconds)"""
+        return self._cached('battery', self._read_battery_status, STATUS_CACHE_TTL)
+    
+    def _read_battery_status(self) -> Dict[str, Any]:
+        """Get battery information from the system"""
+        if self.linux:
+            return self.linux.battery_status()
+        
         try:
-            result = subprocess.run(
+            result = self._run(
                 ['pmset', '-g', 'batt'],
-                capture_output=True,
-                text=True
+                timeout=5
             )
             
             output = result.stdout
@@ -245,12 +290,18 @@ class SystemControl:
             return {'error': f"Battery error: {e}"}
     
     def get_disk_usage(self) -> Dict[str, Any]:
-        """Get disk space usage"""
+        """Get disk space usage (cached for STATUS_CACHE_TTL seconds)"""
+        return self._cached('disk', self._read_disk_usage, STATUS_CACHE_TTL)
+    
+    def _read_disk_usage(self) -> Dict[str, Any]:
+        """Get disk space usage from the system"""
+        if self.linux:
+            return self.linux.disk_usage('/')
+        
         try:
-            result = subprocess.run(
+            result = self._run(
                 ['df', '-h', '/'],
-                capture_output=True,
-                text=True
+                timeout=5
             )
             
             lines = result.stdout.strip().split('\n')
@@ -268,13 +319,52 @@ class SystemControl:
         except Exception as e:
             return {'error': f"Disk error: {e}"}
     
+    def refresh_status(self) -> Dict[str, Dict[str, Any]]:
+        """Read battery, disk and network now and store the readings in the cache"""
+        status = {
+            'battery': self._read_battery_status(),
+            'disk': self._read_disk_usage(),
+            'network': self._read_network_status(),
+        }
+        for key, result in status.items():
+            if 'error' not in result:
+                self.cache.put(key, result)
+        return status
+    
+    def get_battery_trend(self) -> Dict[str, Any]:
+        """Describe how fast the battery is draining, from the telemetry samples"""
+        if not self.telemetry:
+            return {'error': "Battery trends need telemetry (TELEMETRY_ENABLED)"}
+        
+        trend = self.telemetry.battery_drain()
+        if 'error' in trend:
+            return trend
+        
+        percentage = int(trend['percentage'])
+        if trend['charging']:
+            message = f"Your battery is at {percentage}% and plugged in, so it isn't draining"
+        elif 'rate_per_hour' not in trend:
+            message = f"Your battery is at {percentage}%. Ask again in a few minutes for a drain rate"
+        elif trend['hours_left'] is None:
+            message = f"Your battery is holding steady at {percentage}%"
+        else:
+            message = (f"Your battery is draining about {trend['rate_per_hour']:g}% per hour "
+                       f"and should last around {trend['hours_left']:g} more hours")
+        return dict(trend, status='success', message=message)
+    
     def get_network_status(self) -> Dict[str, Any]:
-        """Get network connection status"""
+        """Get network connection status (cached for STATUS_CACHE_TTL seconds)"""
+        return self._cached('network', self._read_network_status, STATUS_CACHE_TTL)
+    
+    def _read_network_status(self) -> Dict[str, Any]:
+        """Get network connection status from the system"""
+        if self.linux:
+            return self.linux.network_status()
+        
         try:
-            result = subprocess.run(
+            result = self._run(
                 ['networksetup', '-getinfo', 'Wi-Fi'],
-                capture_output=True,
-                text=True
+                timeout=5
             )
             
             lines = result.stdout.strip().split('\n')
@@ -294,7 +384,7 @@ class SystemControl:
     def open_application(self, app_name: str) -> Dict[str, str]:
         """Open a macOS application by name"""
         try:
-            subprocess.run(['open', '-a', app_name], timeout=3)
+            self._run(['open', '-a', app_name], timeout=3, check=True)
             return {'status': 'success', 'message': f'Opening {app_name}'}
         except Exception as e:
             return {'status': 'error', 'message': f'Could not open {app_name}: {e}'}
@@ -304,7 +394,7 @@ class SystemControl:
         try:
             if not url.startswith('http'):
                 url = f'https://{url}'
-            subprocess.run(['open', url], timeout=3)
+            self._run(['open', url], timeout=3, check=True)
             return {'status': 'success', 'message': f'Opening {url}'}
         except Exception as e:
             return {'status': 'error', 'message': f'Could not open URL: {e}'}
@@ -312,7 +402,7 @@ class SystemControl:
     def open_file(self, file_path: str) -> Dict[str, str]:
         """Open a file with default application"""
         try:
-            subprocess.run(['open', file_path], timeout=3)
+            self._run(['open', file_path], timeout=3, check=True)
             return {'status': 'success', 'message': f'Opening {file_path}'}
         except Exception as e:
             return {'status': 'error', 'message': f'Could not open file: {e}'}
@@ -322,10 +412,9 @@ class SystemControl:
     def get_brightness(self) -> Optional[float]:
         """Get current screen brightness (0-1)"""
         try:
-            result = subprocess.run(
+            result = self._run(
                 ['osascript', '-e', 'tell application "System Events" to get brightness of display 1'],
-                capture_output=True,
-                text=True
+                timeout=5
             )
             if result.returncode == 0:
                 return float(result.stdout.strip()) / 100
@@ -339,10 +428,10 @@ class SystemControl:
             level = max(0, min(1, level))  # Clamp 0-1
             percent = int(level * 100)
             
-            subprocess.run([
+            self._run([
                 'osascript', '-e',
                 f'tell application "System Events" to set brightness of display 1 to {percent}'
-            ], timeout=3)
+            ], timeout=3, check=True)
             
             return {'status': 'success', 'message': f'Brightness set to {percent}%'}
         except Exception as e:
@@ -351,10 +440,9 @@ class SystemControl:
     def get_volume(self) -> Optional[int]:
         """Get current volume level (0-100)"""
         try:
-            result = subprocess.run(
+            result = self._run(
                 ['osascript', '-e', 'output volume of (get volume settings)'],
-                capture_output=True,
-                text=True
+                timeout=5
             )
             if result.returncode == 0:
                 return int(result.stdout.strip())
@@ -367,10 +455,10 @@ class SystemControl:
         try:
             level = max(0, min(100, level))  # Clamp 0-100
             
-            subprocess.run([
+            self._run([
                 'osascript', '-e',
                 f'set volume {level}'
-            ], timeout=3)
+            ], timeout=3, check=True)
             
             return {'status': 'success', 'message': f'Volume set to {level}%'}
         except Exception as e:
@@ -379,7 +467,7 @@ class SystemControl:
     def mute_volume(self) -> Dict[str, str]:
         """Mute system volume"""
         try:
-            subprocess.run(['osascript', '-e', 'set volume output muted true'], timeout=3)
+            self._run(['osascript', '-e', 'set volume output muted true'], timeout=3, check=True)
             return {'status': 'success', 'message': 'Volume muted'}
         except Exception as e:
             return {'status': 'error', 'message': f'Could not mute: {e}'}
@@ -387,7 +475,7 @@ class SystemControl:
     def unmute_volume(self) -> Dict[str, str]:
         """Unmute system volume"""
         try:
-            subprocess.run(['osascript', '-e', 'set volume output muted false'], timeout=3)
+            self._run(['osascript', '-e', 'set volume output muted false'], timeout=3, check=True)
             return {'status': 'success', 'message': 'Volume unmuted'}
         except Exception as e:
             return {'status': 'error', 'message': f'Could not unmute: {e}'}
@@ -398,7 +486,7 @@ class SystemControl:
         """Search the web"""
         try:
             search_url = f"https://www.google.com/search?q={query.replace(' ', '+')}"
-            subprocess.run(['open', search_url], timeout=3)
+            self._run(['open', search_url], timeout=3, check=True)
             return {'status': 'success', 'message': f'Searching for {query}'}
         except Exception as e:
             return {'status': 'error', 'message': f'Search failed: {e}'}
@@ -407,18 +495,25 @@ class SystemControl:
         """Show macOS notification"""
         try:
             script = f'display notification "{message}" with title "{title}"'
-            subprocess.run(['osascript', '-e', script], timeout=3)
+            self._run(['osascript', '-e', script], timeout=3, check=True)
             return {'status': 'success', 'message': 'Notification shown'}
         except Exception as e:
             return {'status': 'error', 'message': f'Notification error: {e}'}
     
     def list_open_applications(self) -> Dict[str, Any]:
-        """List all open applications"""
+        """List all open applications (on Linux, the current user's processes)"""
+        # Not cached (it changes with every app opened), but simultaneous requests share one listing
+        return self.flights.do('applications', self._list_open_applications)
+    
+    def _list_open_applications(self) -> Dict[str, Any]:
+        """List open applications from the system"""
+        if self.linux:
+            return self.linux.user_applications()
+        
         try:
-            result = subprocess.run(
+            result = self._run(
                 ['osascript', '-e', 'tell application "System Events" to get name of every application process where background only is false'],
-                capture_output=True,
-                text=True
+                timeout=5
             )
             
             if result.returncode == 0:
@@ -433,7 +528,7 @@ class SystemControl:
         """Close an application"""
         try:
             script = f'tell application "{app_name}" to quit'
-            subprocess.run(['osascript', '-e', script], timeout=3)
+            self._run(['osascript', '-e', script], timeout=3, check=True)
             return {'status': 'success', 'message': f'{app_name} closed'}
         except Exception as e:
             return {'status': 'error', 'message': f'Could not close {app_name}: {e}'}
@@ -441,7 +536,7 @@ class SystemControl:
     def sleep_mac(self) -> Dict[str, str]:
         """Put Mac to sleep"""
         try:
-            subprocess.run(['osascript', '-e', 'tell application "System Events" to sleep'], timeout=3)
+            self._run(['osascript', '-e', 'tell application "System Events" to sleep'], timeout=3, check=True)
             return {'status': 'success', 'message': 'Mac going to sleep'}
         except Exception as e:
             return {'status': 'error', 'message': f'Could not sleep: {e}'}
@@ -449,10 +544,10 @@ class SystemControl:
     def lock_screen(self) -> Dict[str, str]:
         """Lock the screen"""
         try:
-            subprocess.run([
+            self._run([
                 'osascript', '-e',
                 'tell application "System Events" to key code 12 using {control down, option down, cmd down}'
-            ], timeout=3)
+            ], timeout=3, check=True)
             return {'status': 'success', 'message': 'Screen locked'}
         except Exception as e:
             return {'status': 'error', 'message': f'Could not lock screen: {e}'}
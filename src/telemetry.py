@@ -0,0 +1,228 @@
+"""
+Telemetry - Background sampling of battery, disk, network, CPU and memory
+A sampler thread reads the system status every few seconds, stores the
+readings in SystemControl's query cache (so status questions are answered
+from memory) and appends their numeric values to a fixed-size ring buffer,
+from which trends such as the battery drain rate are estimated. Sampling is
+faster while questions are being asked and slower when idle or on battery
+"""
+
+import os
+import math
+import time
+import threading
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.settings import (
+    TELEMETRY_CAPACITY, TELEMETRY_INTERVAL, TELEMETRY_ACTIVE_INTERVAL, TELEMETRY_ACTIVE_WINDOW,
+    TELEMETRY_IDLE_AFTER, TELEMETRY_IDLE_INTERVAL, TELEMETRY_BATTERY_FACTOR, TELEMETRY_TREND_WINDOW
+)
+
+# Sampled values: battery percent, 1/0 on mains/battery, disk percent used,
+# 1/0 network up/down, CPU percent busy, memory percent used
+FIELDS = ('battery', 'charging', 'disk', 'network', 'cpu', 'memory')
+
+NAN = float('nan')
+
+
+class RingBuffer:
+    """Fixed-capacity time series: one array of doubles per field, NaN where unknown"""
+    
+    def __init__(self, fields: Tuple[str, ...], capacity: int):
+        """
+        Args:
+            fields: Field names
+            capacity: Samples kept; the oldest is overwritten when full
+        """
+        self.fields = tuple(fields)
+        self.capacity = capacity
+        self._times = array('d', [NAN]) * capacity
+        self._columns = {field: array('d', [NAN]) * capacity for field in self.fields}
+        self._next = 0
+        self._size = 0
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def append(self, timestamp: float, values: Dict[str, Optional[float]]):
+        """Add a sample (missing or None values are stored as NaN)"""
+        with self._lock:
+            slot = self._next
+            self._times[slot] = timestamp
+            for field, column in self._columns.items():
+                value = values.get(field)
+                column[slot] = NAN if value is None else value
+            self._next = (slot + 1) % self.capacity
+            self._size = min(self._size + 1, self.capacity)
+    
+    def _slots(self) -> range:
+        """Occupied slots, oldest first (as offsets from the oldest; take modulo capacity)"""
+        start = (self._next - self._size) % self.capacity
+        return range(start, start + self._size)
+    
+    def latest(self) -> Optional[Dict[str, float]]:
+        """Newest sample with its 'time', or None if empty"""
+        with self._lock:
+            if not self._size:
+                return None
+            slot = (self._next - 1) % self.capacity
+            sample = {field: column[slot] for field, column in self._columns.items()}
+            sample['time'] = self._times[slot]
+            return sample
+    
+    def series(self, field: str, since: float = -math.inf) -> List[Tuple[float, float]]:
+        """(time, value) pairs for one field, oldest first, skipping unknown values"""
+        with self._lock:
+            column = self._columns[field]
+            points = []
+            for offset in self._slots():
+                slot = offset % self.capacity
+                timestamp, value = self._times[slot], column[slot]
+                if timestamp >= since and not math.isnan(value):
+                    points.append((timestamp, value))
+            return points
+
+
+def _slope(points: List[Tuple[float, float]]) -> float:
+    """Least-squares slope of value over time"""
+    count = len(points)
+    mean_t = sum(t for t, _ in points) / count
+    mean_v = sum(v for _, v in points) / count
+    variance = sum((t - mean_t) ** 2 for t, _ in points)
+    covariance = sum((t - mean_t) * (v - mean_v) for t, v in points)
+    return covariance / variance if variance else 0.0
+
+
+class TelemetrySampler:
+    """Samples a SystemControl on a daemon thread at an adaptive interval"""
+    
+    def __init__(self, control, capacity: int = TELEMETRY_CAPACITY):
+        """
+        Args:
+            control: SystemControl whose status readers are sampled
+            capacity: Samples kept in the ring buffer
+        """
+        self.control = control
+        self.buffer = RingBuffer(FIELDS, capacity)
+        self._last_query = -math.inf
+        self._cpu_previous: Optional[Tuple[int, int]] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self):
+        """Start sampling (the first sample is taken straight away)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='telemetry', daemon=True)
+            self._thread.start()
+    
+    def stop(self):
+        """Stop sampling after the current sample"""
+        self._stop.set()
+    
+    def note_query(self):
+        """Record that a status question was asked (sampling speeds up for a while)"""
+        self._last_query = time.monotonic()
+    
+    def interval(self) -> float:
+        """Seconds until the next sample, from recent query activity and power state"""
+        quiet = time.monotonic() - self._last_query
+        if quiet < TELEMETRY_ACTIVE_WINDOW:
+            interval = TELEMETRY_ACTIVE_INTERVAL
+        elif quiet > TELEMETRY_IDLE_AFTER:
+            interval = TELEMETRY_IDLE_INTERVAL
+        else:
+            interval = TELEMETRY_INTERVAL
+        
+        latest = self.buffer.latest()
+        if latest is not None and latest['charging'] == 0:
+            interval *= TELEMETRY_BATTERY_FACTOR
+        return interval
+    
+    def _run(self):
+        while True:
+            try:
+                self.sample()
+            except Exception as e:
+                print(f"Warning: Telemetry sample failed: {e}")
+            if self._stop.wait(self.interval()):
+                return
+    
+    def sample(self) -> Dict[str, Optional[float]]:
+        """Take one sample now and append it to the buffer"""
+        status = self.control.refresh_status()
+        battery = status['battery']
+        disk = status['disk']
+        
+        values = {
+            'network': 0.0 if 'error' in status['network'] else 1.0,
+            'cpu': self._cpu_percent(),
+            'memory': self.control.linux.memory_usage() if self.control.linux else None,
+        }
+        if 'error' not in battery:
+            values['battery'] = battery.get('percentage')
+            # pmset reports "discharging" for a full battery on mains; its raw output names the source
+            on_mains = battery.get('status') in ('charging', 'charged') or "'AC Power'" in battery.get('raw', '')
+            values['charging'] = 1.0 if on_mains else 0.0
+        if 'error' not in disk:
+            values['disk'] = float(str(disk.get('percentage', 'nan')).rstrip('%'))
+        
+        self.buffer.append(time.monotonic(), values)
+        return values
+    
+    def _cpu_percent(self) -> Optional[float]:
+        """Percent CPU busy since the previous sample (load average per core without /proc/stat)"""
+        linux = self.control.linux
+        if not linux:
+            try:
+                return min(100.0, 100.0 * os.getloadavg()[0] / (os.cpu_count() or 1))
+            except OSError:
+                return None
+        
+        current = linux.cpu_times()
+        previous, self._cpu_previous = self._cpu_previous, current
+        if current is None or previous is None or current[1] == previous[1]:
+            return None
+        return 100.0 * (current[0] - previous[0]) / (current[1] - previous[1])
+    
+    def battery_drain(self, window: float = TELEMETRY_TREND_WINDOW) -> Dict[str, Any]:
+        """
+        Estimate how fast the battery is draining
+        
+        Fits a line to the battery percentage over the latest unbroken run
+        of on-battery samples within the window.
+        
+        Returns:
+            {percentage, charging} plus, once there are enough samples,
+            {rate_per_hour, hours_left, minutes_observed}; {error} without a battery
+        """
+        latest = self.buffer.latest()
+        if latest is None:
+            return {'error': "No battery readings yet"}
+        if math.isnan(latest['battery']):
+            return {'error': "No battery found"}
+        
+        result = {'percentage': latest['battery'], 'charging': latest['charging'] == 1}
+        if result['charging']:
+            return result
+        
+        since = latest['time'] - window
+        charging = dict(self.buffer.series('charging', since))
+        points = []
+        for timestamp, percentage in reversed(self.buffer.series('battery', since)):
+            if charging.get(timestamp) == 1:
+                break
+            points.append((timestamp, percentage))
+        points.reverse()
+        
+        # Percentages move in whole steps, so a couple of minutes of samples are needed
+        if len(points) < 3 or points[-1][0] - points[0][0] < 120:
+            return result
+        
+        rate_per_hour = -_slope(points) * 3600
+        result['rate_per_hour'] = round(rate_per_hour, 1)
+        result['hours_left'] = round(latest['battery'] / rate_per_hour, 1) if rate_per_hour > 0 else None
+        result['minutes_observed'] = round((points[-1][0] - points[0][0]) / 60)
+        return result
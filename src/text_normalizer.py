@@ -0,0 +1,67 @@
+"""
+Text Normalizer - Canonical form of user input for matching and caching
+Lowercases, drops sentence punctuation and collapses whitespace while keeping
+characters that carry meaning inside words (what's, google.com, wi-fi)
+"""
+
+import re
+from typing import List, Tuple
+
+# Punctuation that never changes what was asked
+_SENTENCE_PUNCTUATION = re.compile(r'[!?,;"“”‘’()\[\]{}…]+')
+
+# Dots and colons that end a word ("bye." / "note:") but not "google.com"
+_TRAILING_MARKS = re.compile(r'[.:]+(?=\s|$)')
+
+_WHITESPACE = re.compile(r'\s+')
+
+# Where an utterance may divide into separate clauses; normalization turns these into spaces
+_CLAUSE_SEPARATORS = re.compile(r'[,;]')
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize user input so equivalent phrasings compare equal
+    
+    Args:
+        text: Raw user input
+    
+    Returns:
+        Lowercased text with sentence punctuation removed and whitespace collapsed
+    """
+    text = _SENTENCE_PUNCTUATION.sub(' ', text.lower())
+    text = _TRAILING_MARKS.sub('', text)
+    return _WHITESPACE.sub(' ', text).strip()
+
+
+def split_clauses(text: str) -> List[Tuple[str, str]]:
+    """
+    Split user input into clauses, keeping each clause's original text
+    
+    Commas and semicolons separate clauses, and normalization would drop
+    them, so the input is split first.
+    
+    Args:
+        text: Raw user input
+    
+    Returns:
+        (raw clause, normalized clause) pairs in order (clauses that
+        normalize to nothing are dropped)
+    """
+    pairs = ((clause, normalize_text(clause)) for clause in _CLAUSE_SEPARATORS.split(text))
+    return [(raw.strip(), normalized) for raw, normalized in pairs if normalized]
+
+
+def normalize_clauses(text: str) -> List[str]:
+    """
+    Normalize user input clause by clause
+    
+    Joining the clauses with single spaces gives exactly normalize_text(text).
+    
+    Args:
+        text: Raw user input
+    
+    Returns:
+        Normalized clauses in order (empty ones dropped), see split_clauses
+    """
+    return [normalized for _, normalized in split_clauses(text)]
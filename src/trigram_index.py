@@ -0,0 +1,140 @@
+"""
+Trigram Index - Typo- and ASR-error-tolerant response matching
+Retrieves candidate patterns through a character-trigram index, then verifies
+each with a bounded approximate-substring edit distance that exits early
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from src.response_index import ResponseIndex
+
+
+def trigrams(text: str) -> set:
+    """Distinct character trigrams of a string"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def bounded_substring_distance(pattern: str, text: str, max_edits: int) -> Optional[int]:
+    """
+    Smallest edit distance between the pattern and any substring of the text
+    
+    Sellers' dynamic program with Ukkonen's cut-off: only rows that can still
+    stay within max_edits are computed, and the scan stops at an exact hit.
+    
+    Args:
+        pattern: String to find
+        text: String to search in
+        max_edits: Largest distance of interest
+    
+    Returns:
+        The distance if it is at most max_edits, otherwise None
+    """
+    length = len(pattern)
+    over = max_edits + 1
+    
+    # column[i] = distance of pattern[:i] against the best substring ending here
+    column = [min(i, over) for i in range(length + 1)]
+    last_active = min(max_edits, length)
+    best = column[length] if length <= max_edits else None
+    
+    for char in text:
+        top = min(last_active + 1, length)
+        new_column = [0] * (length + 1)
+        for i in range(1, top + 1):
+            cost = 0 if pattern[i - 1] == char else 1
+            new_column[i] = min(column[i - 1] + cost, column[i] + 1, new_column[i - 1] + 1, over)
+        for i in range(top + 1, length + 1):
+            new_column[i] = over
+        
+        last_active = top
+        while last_active > 0 and new_column[last_active] > max_edits:
+            last_active -= 1
+        
+        if top == length and new_column[length] <= max_edits:
+            if best is None or new_column[length] < best:
+                best = new_column[length]
+                if best == 0:
+                    return 0
+        
+        column = new_column
+    
+    return best
+
+
+class TrigramIndex:
+    """Character-trigram index over response patterns with edit-distance verification"""
+    
+    def __init__(self, index: ResponseIndex, max_edits: int = 2):
+        """
+        Build the trigram index from a response index
+        
+        Args:
+            index: Response index holding the (normalized) patterns
+            max_edits: Upper bound on edits tolerated for the longest patterns
+        """
+        self.categories: List[str] = list(index.categories)
+        
+        # Rows: (category id, position, padded pattern, allowed edits, trigram count)
+        self.rows: List[Tuple[int, int, str, int, int]] = []
+        self.postings: Dict[str, List[int]] = {}
+        
+        for entry in sorted(entry for entry in index.patterns if entry is not None):
+            category_id, position, pattern, _ = entry
+            if not pattern:
+                continue
+            
+            # Padding with spaces makes word boundaries part of the match, so
+            # "time" does not fuzzily match inside "sometimes"
+            padded = f" {pattern} "
+            grams = trigrams(padded)
+            
+            # Short patterns tolerate fewer edits; the q-gram filter below
+            # also needs at least one trigram to survive the allowed edits
+            allowed = min(max_edits, len(pattern) // 4, (len(grams) - 1) // 3)
+            
+            row = len(self.rows)
+            self.rows.append((category_id, position, padded, allowed, len(grams)))
+            for gram in grams:
+                self.postings.setdefault(gram, []).append(row)
+    
+    def match(self, user_text: str) -> Tuple[Optional[str], float]:
+        """
+        Find the best fuzzily matching category
+        
+        Confidence is 1 - distance / padded pattern length, so an exact
+        whole-word occurrence scores 1.0.
+        
+        Args:
+            user_text: Normalized user input (see normalize_text)
+        
+        Returns:
+            Tuple of (category name or None, confidence_score)
+        """
+        padded_text = f" {user_text} "
+        
+        shared: Dict[int, int] = {}
+        for gram in trigrams(padded_text):
+            for row in self.postings.get(gram, ()):
+                shared[row] = shared.get(row, 0) + 1
+        
+        best_row = None
+        best_confidence = 0.0
+        for row in sorted(shared):
+            _, _, padded, allowed, gram_count = self.rows[row]
+            
+            # q-gram lemma: k edits destroy at most 3k of the pattern's trigrams
+            if shared[row] < gram_count - 3 * allowed:
+                continue
+            
+            distance = bounded_substring_distance(padded, padded_text, allowed)
+            if distance is None:
+                continue
+            
+            confidence = 1.0 - distance / len(padded)
+            if confidence > best_confidence:
+                best_row, best_confidence = row, confidence
+        
+        if best_row is None:
+            return None, 0.0
+        
+        return self.categories[self.rows[best_row][0]], best_confidence
@@ -0,0 +1,125 @@
+"""
+TTL Cache - Time-limited cache that serves stale values while refreshing
+Each lookup names its own time-to-live. A fresh value is returned as is; an
+expired one is still returned straight away (for a while) and reloaded in the
+background, so slow sources such as network APIs only block the first caller;
+concurrent misses for the same key share a single load
+"""
+
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from src.single_flight import SingleFlight
+from config.settings import CACHE_STALE_TTL_FACTOR
+
+# A cached value, its age in seconds and whether it is past its TTL
+CachedValue = namedtuple('CachedValue', ['value', 'age', 'stale'])
+
+
+class _Entry:
+    """One cached value and its refresh state"""
+    
+    __slots__ = ('value', 'loaded_at', 'refreshing')
+    
+    def __init__(self, value: Any, loaded_at: float):
+        self.value = value
+        self.loaded_at = loaded_at
+        self.refreshing = False
+
+
+class TTLCache:
+    """Thread-safe cache with per-lookup TTLs and stale-while-revalidate"""
+    
+    def __init__(self, stale_factor: float = CACHE_STALE_TTL_FACTOR, refresh_workers: int = 2):
+        """
+        Initialize the cache
+        
+        Args:
+            stale_factor: An expired value is served (while a refresh runs) until
+                it is this many TTLs old; older values are reloaded synchronously
+            refresh_workers: Threads running background refreshes
+        """
+        self.stale_factor = stale_factor
+        self._entries: Dict[Hashable, _Entry] = {}
+        self._lock = threading.Lock()
+        self._loads = SingleFlight()
+        self._refresher = ThreadPoolExecutor(max_workers=refresh_workers, thread_name_prefix='cache-refresh')
+    
+    def get(self, key: Hashable, loader: Callable[[], Any], ttl: float,
+            cacheable: Optional[Callable[[Any], bool]] = None) -> CachedValue:
+        """
+        Look up a value, loading or refreshing it as needed
+        
+        Args:
+            key: Cache key
+            loader: Produces a new value (called without the lock held)
+            ttl: Seconds a value stays fresh
+            cacheable: Decides whether a loaded value is kept (e.g. not errors);
+                by default every value is kept
+        
+        Returns:
+            CachedValue; age is 0 for a value loaded by this call (or by the
+            concurrent call it waited for)
+        
+        Raises:
+            Whatever the loader raised (shared by every caller waiting on that load)
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = now - entry.loaded_at
+                if age < ttl:
+                    return CachedValue(entry.value, age, False)
+                
+                if age < ttl * self.stale_factor:
+                    if not entry.refreshing:
+                        entry.refreshing = True
+                        self._refresher.submit(self._refresh, key, entry, loader, cacheable)
+                    return CachedValue(entry.value, age, True)
+        
+        return CachedValue(self._loads.do(key, self._load, key, loader, cacheable), 0.0, False)
+    
+    def _load(self, key: Hashable, loader: Callable[[], Any], cacheable: Optional[Callable[[Any], bool]]) -> Any:
+        """Synchronous load of a missing or too-old entry"""
+        value = loader()
+        if cacheable is None or cacheable(value):
+            with self._lock:
+                self._entries[key] = _Entry(value, time.monotonic())
+        return value
+    
+    def _refresh(self, key: Hashable, entry: _Entry, loader: Callable[[], Any],
+                 cacheable: Optional[Callable[[Any], bool]]):
+        """Background reload of an expired entry; a failed reload keeps the old value"""
+        try:
+            value = loader()
+            keep = cacheable is None or cacheable(value)
+        except Exception:
+            value, keep = None, False
+        
+        with self._lock:
+            if keep:
+                self._entries[key] = _Entry(value, time.monotonic())
+            else:
+                entry.refreshing = False
+    
+    def put(self, key: Hashable, value: Any):
+        """Store a value loaded elsewhere (e.g. by a background sampler) as fresh"""
+        with self._lock:
+            self._entries[key] = _Entry(value, time.monotonic())
+    
+    def invalidate(self, key: Optional[Hashable] = None):
+        """
+        Drop one entry, or every entry
+        
+        Args:
+            key: Entry to drop (None drops all)
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Command executor tests - deadlines, back-pressure and ordered compound commands
+Handlers are small functions in this module; nothing touches the system
+"""
+
+import sys
+import os
+import json
+import time
+import tempfile
+import threading
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.advanced_command_interpreter import AdvancedCommandInterpreter
+from src.command_executor import CommandExecutor, CommandTimeout, ExecutorBusy
+from src.hit_stats import HitStats
+
+# Handlers for the compound-command tests append (name, event) here
+events = []
+events_lock = threading.Lock()
+
+
+def _record(name, seconds):
+    with events_lock:
+        events.append((name, 'start'))
+    time.sleep(seconds)
+    with events_lock:
+        events.append((name, 'end'))
+    return {'status': 'success', 'message': name}
+
+
+def slow_action():
+    return _record('slow_action', 0.4)
+
+
+def fast_action():
+    return _record('fast_action', 0.05)
+
+
+def read_status():
+    return _record('read_status', 0.05)
+
+
+# Handler paths name this module as it was loaded, so the handlers share events
+SPECS = {
+    'slow_action': {'patterns': ['^slow$'], 'handler': f'{__name__}:slow_action'},
+    'fast_action': {'patterns': ['^fast$'], 'handler': f'{__name__}:fast_action'},
+    'read_status': {'patterns': ['^status$'], 'handler': f'{__name__}:read_status', 'read_only': True},
+}
+
+
+def make_interpreter(response_wait):
+    """Interpreter over SPECS, with hit statistics kept in a temporary file"""
+    directory = tempfile.mkdtemp()
+    commands_path = os.path.join(directory, 'commands.json')
+    with open(commands_path, 'w') as f:
+        json.dump(SPECS, f)
+    return AdvancedCommandInterpreter(commands_path, executor=CommandExecutor(max_workers=4),
+                                      response_wait=response_wait,
+                                      hit_stats=HitStats(os.path.join(directory, 'hit_stats.json')))
+
+
+def test_deadline_fails_the_future():
+    executor = CommandExecutor(max_workers=1)
+    future = executor.submit(threading.Event().wait, {'timeout': 1.0}, timeout=0.1)
+    try:
+        future.result(timeout=2)
+    except CommandTimeout:
+        pass
+    else:
+        raise AssertionError("A command past its deadline must fail with CommandTimeout")
+    executor.shutdown()
+
+
+def test_hung_handlers_do_not_starve_later_commands():
+    """Workers stuck in abandoned handlers are replaced"""
+    executor = CommandExecutor(max_workers=2, max_pending=8)
+    release = threading.Event()
+    hung = [executor.submit(release.wait, timeout=0.1) for _ in range(2)]
+    for future in hung:
+        try:
+            future.result(timeout=2)
+        except CommandTimeout:
+            pass
+    
+    try:
+        assert executor.submit(lambda: 'done', timeout=1).result(timeout=2) == 'done'
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+def test_busy_executor_refuses_commands():
+    executor = CommandExecutor(max_workers=1, max_pending=2)
+    release = threading.Event()
+    futures = [executor.submit(release.wait, timeout=5) for _ in range(2)]
+    try:
+        executor.submit(release.wait, timeout=5)
+    except ExecutorBusy:
+        pass
+    else:
+        raise AssertionError("A third outstanding command must be refused")
+    finally:
+        release.set()
+    for future in futures:
+        future.result(timeout=2)
+    # Finished commands free their slots again
+    assert executor.submit(lambda: 'ok', timeout=1).result(timeout=2) == 'ok'
+    executor.shutdown()
+
+
+def test_compound_commands_keep_order_without_blocking_the_turn():
+    """Side effects run in spoken order; the turn returns after response_wait"""
+    del events[:]
+    interpreter = make_interpreter(response_wait=0.1)
+    
+    started = time.monotonic()
+    result = interpreter.execute_intents(interpreter.parse_intents("slow and status and fast"))
+    elapsed = time.monotonic() - started
+    assert result['status'] == 'pending', result
+    assert elapsed < 0.3, f"The turn blocked for {elapsed:.2f} s"
+    
+    for pending in result['results']:
+        if pending['status'] == 'pending':
+            assert interpreter.complete_command(pending)['status'] == 'success'
+    
+    # status and fast both wait for slow; fast also waits for status
+    assert events.index(('slow_action', 'end')) < events.index(('read_status', 'start'))
+    assert events.index(('read_status', 'end')) < events.index(('fast_action', 'start'))
+    interpreter.executor.shutdown()
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith('test_') and callable(test):
+            test()
+            print(f"[PASS] {name}")
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Command helper tests - missing programs and failed actions are reported as errors
+Runs without touching the system (StubBackend), except for the shell checks
+which start /bin/sh and run a program that does not exist
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.command_helper import ShellBackend, StubBackend, SubprocessBackend
+from src.system_control import SystemControl
+
+MISSING_PROGRAM = 'voicebot-no-such-program'
+
+
+def control_with(results):
+    """SystemControl running commands on a StubBackend (no background sampling)"""
+    backend = StubBackend(results)
+    return SystemControl(command_backend=backend, telemetry=False), backend
+
+
+def test_missing_program_is_an_error():
+    """An action whose program is not installed must not report success"""
+    control, backend = control_with({'osascript': (127, '')})
+    result = control.quit_application('chrome')
+    assert result['status'] == 'error', result
+    assert backend.calls == [['osascript', '-e', 'tell application "chrome" to quit']]
+
+
+def test_failed_action_is_an_error():
+    """A non-zero exit status from an action is reported"""
+    control, _ = control_with({'open': (1, '')})
+    assert control.open_application('Nonexistent')['status'] == 'error'
+
+
+def test_successful_action():
+    control, backend = control_with({})
+    assert control.set_volume(150)['message'] == 'Volume set to 100%'
+    assert backend.calls == [['osascript', '-e', 'set volume 100']]
+
+
+def test_backends_agree_on_missing_program():
+    """The helper shell raises FileNotFoundError like a process per command does"""
+    backend = ShellBackend(size=1)
+    try:
+        for runner in (backend, SubprocessBackend()):
+            try:
+                runner.run([MISSING_PROGRAM], timeout=5)
+            except FileNotFoundError:
+                continue
+            raise AssertionError(f"{type(runner).__name__} ran a missing program")
+        # The helper survives and keeps serving commands
+        assert backend.run(['echo', 'ok'], timeout=5).stdout == 'ok\n'
+    finally:
+        backend.close()
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith('test_') and callable(test):
+            test()
+            print(f"[PASS] {name}")
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Command parsing tests - matching on normalized text, parameters from the original
+Parses only; no command is executed
+"""
+
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.advanced_command_interpreter import AdvancedCommandInterpreter
+from src.hit_stats import HitStats
+
+# Private hit statistics, so pattern order does not depend on earlier runs
+interpreter = AdvancedCommandInterpreter(hit_stats=HitStats(os.path.join(tempfile.mkdtemp(), 'hit_stats.json')))
+
+
+def test_url_keeps_case_and_query():
+    assert interpreter.parse_command("open https://GitHub.com/Foo?x=1") == \
+        ('open_url', {'url': 'https://GitHub.com/Foo?x=1'})
+
+
+def test_cached_match_extracts_from_each_input():
+    """Inputs sharing a normalized form share the match but not the parameters"""
+    interpreter.parse_cache.clear()
+    first = interpreter.parse_command("Go to Example.com/Path.")
+    second = interpreter.parse_command("go to example.com/path")
+    assert first == ('open_url', {'url': 'Example.com/Path'}), first
+    assert second == ('open_url', {'url': 'example.com/path'}), second
+    assert interpreter.parse_commands(["Visit Example.com/A", "visit example.com/a"]) == [
+        ('open_url', {'url': 'Example.com/A'}), ('open_url', {'url': 'example.com/a'})
+    ]
+
+
+def test_compound_parameters_per_part():
+    assert interpreter.parse_intents("Set volume to 30, then set brightness to 80") == [
+        ('set_volume', {'level': 30}), ('set_brightness', {'level': 80})
+    ]
+
+
+
+def test_courtesy_words_around_bare_nouns():
+    assert interpreter.parse_intents("please battery and disk usage") == [('battery', {}), ('disk', {})]
+    assert interpreter.parse_command("could you network please") == ('network', {})
+    # Other words still keep a bare noun from matching
+    assert interpreter.parse_command("open disk utility") == ('open_app', {'app_name': 'disk'})
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith('test_') and callable(test):
+            test()
+            print(f"[PASS] {name}")
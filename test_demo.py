@@ -5,10 +5,12 @@ Quick demo test script - AUTONOMOUS DIALOGUE SYSTEM
 
 import sys
 import os
+import tempfile
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from src.hit_stats import HitStats
 from src.response_engine import ResponseEngine
 from src.speech_synthesis import SpeechSynthesizer
 from src.terminal_ui import TerminalUI
@@ -23,7 +25,8 @@ def test_demo():
     
     # Initialize components
     ui = TerminalUI()
-    response_engine = ResponseEngine()
+    # Private hit statistics, so the demo does not count towards real usage
+    response_engine = ResponseEngine(hit_stats=HitStats(os.path.join(tempfile.mkdtemp(), 'hit_stats.json')))
     speech_synthesizer = SpeechSynthesizer()
     
     ui.display_header()
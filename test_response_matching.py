@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Response matching tests - the indexed matchers against a plain linear scan
+The overlap index and the SQLite store must give exactly the scan's category
+and confidence; the graded scorers must find a category by its own pattern
+"""
+
+import sys
+import os
+import json
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.hit_stats import HitStats
+from src.response_engine import ResponseEngine
+from src.text_normalizer import normalize_text
+
+RESPONSES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'responses.json')
+
+# Overlapping patterns that exercise the tie order (earliest category and pattern wins)
+SYNTHETIC_DB = {
+    'greeting': {'patterns': ['hello', 'hi there', 'good morning'], 'responses': ['Hello!']},
+    'weather_talk': {'patterns': ['nice weather', 'good day'], 'responses': ['Lovely.']},
+    'farewell': {'patterns': ['good night', 'bye', 'see you'], 'responses': ['Bye!']},
+    'silent': {'patterns': ['never answered'], 'responses': []},
+    'thanks': {'patterns': ['thank you', 'thanks a lot', "that's nice"], 'responses': ['Welcome.']},
+    'default': {'patterns': [], 'responses': ['Hmm?']},
+}
+
+UNRELATED = ['', 'xyzzy', 'what is the capital of peru', 'play some jazz', 'ok', 'a']
+
+
+def baseline_match(responses_db, user_text):
+    """The original linear scan over every pattern: (category or None, confidence)"""
+    best_category, best_confidence = None, 0.0
+    user_words = set(user_text.split())
+    for category, data in responses_db.items():
+        if category == 'default' or not data.get('responses'):
+            continue
+        for pattern in data.get('patterns', []):
+            pattern = normalize_text(pattern)
+            pattern_words = set(pattern.split())
+            if pattern in user_text:
+                confidence = 0.9
+            elif pattern_words & user_words:
+                confidence = 0.7
+            elif any(word in user_text for word in pattern_words):
+                confidence = 0.6
+            else:
+                confidence = 0.0
+            if confidence > best_confidence:
+                best_category, best_confidence = category, confidence
+    return best_category, best_confidence
+
+
+def corpus_for(responses_db):
+    """Fixed inputs derived from the patterns: whole, padded, single words and word fragments"""
+    texts = list(UNRELATED)
+    for data in responses_db.values():
+        for pattern in data.get('patterns', []):
+            pattern = normalize_text(pattern)
+            texts += [pattern, f"well {pattern} then", f"{pattern}s"]
+            for word in pattern.split():
+                texts += [word, f"say {word}", word[:3], f"un{word}ly"]
+    return [normalize_text(text) for text in dict.fromkeys(texts)]
+
+
+def engine_for(responses_db, directory, **options):
+    """ResponseEngine over a database written to directory (no compiled artifacts, private hit stats)"""
+    responses_path = os.path.join(directory, 'responses.json')
+    if not os.path.exists(responses_path):
+        with open(responses_path, 'w') as f:
+            json.dump(responses_db, f)
+    return ResponseEngine(responses_path, use_cache=False,
+                          hit_stats=HitStats(os.path.join(directory, 'hit_stats.json')), **options)
+
+
+def databases():
+    with open(RESPONSES_PATH, 'r', encoding='utf-8') as f:
+        yield json.load(f)
+    yield SYNTHETIC_DB
+
+
+def test_overlap_index_matches_linear_scan():
+    for responses_db in databases():
+        engine = engine_for(responses_db, tempfile.mkdtemp(), scoring='overlap')
+        texts = corpus_for(responses_db)
+        for text in texts:
+            assert engine.match(text) == baseline_match(responses_db, text), text
+        assert engine.match_batch(texts) == [baseline_match(responses_db, text) for text in texts]
+
+
+def test_sqlite_store_matches_linear_scan():
+    for responses_db in databases():
+        directory = tempfile.mkdtemp()
+        engine = engine_for(responses_db, directory, scoring='overlap', backend='sqlite',
+                            store_path=os.path.join(directory, 'responses.db'))
+        for text in corpus_for(responses_db):
+            assert engine.match(text) == baseline_match(responses_db, text), text
+
+
+def test_graded_scorers_find_categories_by_their_patterns():
+    """An input equal to a pattern scores 1.0 for a category that has that pattern"""
+    for responses_db in databases():
+        owners = {}
+        for category, data in responses_db.items():
+            if category != 'default' and data.get('responses'):
+                for pattern in data.get('patterns', []):
+                    owners.setdefault(normalize_text(pattern), set()).add(category)
+        
+        for scoring in ('bm25', 'lsh', 'fuzzy'):
+            engine = engine_for(responses_db, tempfile.mkdtemp(), scoring=scoring)
+            for pattern, categories in owners.items():
+                category, confidence = engine.match(pattern)
+                assert abs(confidence - 1.0) < 1e-6, (scoring, pattern, confidence)
+                if scoring == 'fuzzy':
+                    # Any pattern occurring as whole words scores 1.0, so the winner may own a shorter one
+                    contained = {owner for other, others in owners.items()
+                                 if f" {other} " in f" {pattern} " for owner in others}
+                    assert category in contained, (scoring, pattern, category)
+                else:
+                    assert category in categories, (scoring, pattern, category)
+
+
+def test_bm25_batch_matches_single_lookups():
+    for responses_db in databases():
+        engine = engine_for(responses_db, tempfile.mkdtemp(), scoring='bm25')
+        texts = corpus_for(responses_db)
+        for (category, confidence), text in zip(engine.match_batch(texts), texts):
+            expected_category, expected_confidence = engine.match(text)
+            assert category == expected_category and abs(confidence - expected_confidence) < 1e-9, text
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith('test_') and callable(test):
+            test()
+            print(f"[PASS] {name}")
@@ -6,9 +6,11 @@ Try out your voice bot's new macOS system control capabilities!
 
 import sys
 import os
+import tempfile
 sys.path.insert(0, '/Users/meghvyas/Desktop/Offline-VoiceBot')
 
 from src.advanced_command_interpreter import AdvancedCommandInterpreter
+from src.hit_stats import HitStats
 
 
 def print_section(title):
@@ -34,7 +36,8 @@ def test_command(interpreter, command):
 
 def main():
     """Run interactive system control tests"""
-    interpreter = AdvancedCommandInterpreter()
+    # Private hit statistics, so the test run does not count towards real usage
+    interpreter = AdvancedCommandInterpreter(hit_stats=HitStats(os.path.join(tempfile.mkdtemp(), 'hit_stats.json')))
     
     print("\n" + "="*60)
     print("  SYSTEM CONTROL COMMAND TEST SUITE")